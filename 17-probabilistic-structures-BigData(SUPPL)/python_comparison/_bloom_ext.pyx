@@ -0,0 +1,64 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled kernels for bloom_filter.py and count_min_sketch.py
+Week 17: Probabilistic Data Structures for Big Data
+ATP Course - ASE-CSIE Bucharest
+
+Optional Cython build of the per-item hot loops, for environments where
+Numba (and its LLVM dependency) cannot be installed. The loops are the
+same as the Numba kernels and the C implementation in src/example1.c.
+
+Build in place (requires Cython and a C compiler):
+
+    cythonize -i _bloom_ext.pyx
+
+The Python modules pick this extension up automatically when it can be
+imported and otherwise fall back to Numba, then to plain Python.
+"""
+
+from libc.stdint cimport int64_t, uint32_t, uint64_t
+
+
+def bf_add(uint64_t[::1] bits, int64_t h1, int64_t h2, int k, int64_t m):
+    """Set the k Kirsch-Mitzenmacher bits of an item (h1, h2 reduced mod m)."""
+    cdef int i
+    cdef int64_t idx
+    for i in range(k):
+        idx = (h1 + i * h2) % m
+        bits[idx >> 6] |= (<uint64_t>1) << (idx & 63)
+
+
+def bf_query(const uint64_t[::1] bits, int64_t h1, int64_t h2, int k, int64_t m):
+    """Return True if all k bits of an item are set."""
+    cdef int i
+    cdef int64_t idx
+    for i in range(k):
+        idx = (h1 + i * h2) % m
+        if not (bits[idx >> 6] >> (idx & 63)) & 1:
+            return False
+    return True
+
+
+def cms_update(uint32_t[:, ::1] table, int64_t h1, int64_t h2, int64_t count):
+    """Add count to one counter per row (32-bit base hashes, fastrange columns)."""
+    cdef Py_ssize_t row
+    cdef Py_ssize_t depth = table.shape[0]
+    cdef int64_t width = table.shape[1]
+    cdef int64_t col
+    for row in range(depth):
+        col = (((h1 + row * h2) & 0xFFFFFFFF) * width) >> 32
+        table[row, col] += <uint32_t>count
+
+
+def cms_query(const uint32_t[:, ::1] table, int64_t h1, int64_t h2):
+    """Return the minimum counter of an item across all rows."""
+    cdef Py_ssize_t row
+    cdef Py_ssize_t depth = table.shape[0]
+    cdef int64_t width = table.shape[1]
+    cdef int64_t col
+    cdef uint32_t min_count = 0xFFFFFFFF
+    for row in range(depth):
+        col = (((h1 + row * h2) & 0xFFFFFFFF) * width) >> 32
+        if table[row, col] < min_count:
+            min_count = table[row, col]
+    return min_count
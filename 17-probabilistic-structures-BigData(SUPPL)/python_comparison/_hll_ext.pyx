@@ -0,0 +1,47 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled register update for hyperloglog.py
+Week 17: Probabilistic Data Structures for Big Data
+ATP Course - ASE-CSIE Bucharest
+
+Optional Cython build of the HyperLogLog insert loop. Items are hashed
+in Python; the register index and rho of every hash are then computed in
+a C loop using __builtin_clzll (a single LZCNT/BSR instruction), with
+the GIL released.
+
+Build in place (requires Cython and GCC or Clang):
+
+    cythonize -i _hll_ext.pyx
+
+hyperloglog.py picks this extension up automatically when it can be
+imported and otherwise uses its NumPy implementation.
+"""
+
+from libc.stdint cimport uint8_t, uint64_t
+
+
+cdef extern from *:
+    int __builtin_clzll(unsigned long long x) nogil
+
+
+def hll_add_bulk(const uint64_t[::1] hashes, uint8_t[::1] registers, int precision):
+    """Fold a batch of 64-bit hashes into the registers (max of rho per index)."""
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n = hashes.shape[0]
+    cdef int tail_bits = 64 - precision
+    cdef uint64_t mask = ((<uint64_t>1) << tail_bits) - 1
+    cdef uint64_t h, tail
+    cdef Py_ssize_t idx
+    cdef uint8_t rho
+    with nogil:
+        for i in range(n):
+            h = hashes[i]
+            idx = <Py_ssize_t>(h >> tail_bits)
+            tail = h & mask
+            if tail:
+                # clz counts the p index bits as well
+                rho = <uint8_t>(__builtin_clzll(tail) - precision + 1)
+            else:
+                rho = <uint8_t>(tail_bits + 1)
+            if rho > registers[idx]:
+                registers[idx] = rho
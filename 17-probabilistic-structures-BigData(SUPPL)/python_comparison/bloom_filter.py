@@ -12,13 +12,194 @@ in a higher-level language.
 Differences from C Implementation:
 - Python handles arbitrary-precision integers natively
 - No manual memory management required
-- Built-in bitarray module (or equivalent using bytearray)
-- hashlib provides cryptographic hash functions
+- Bit array stored in a NumPy array of 64-bit words (uint64_t[] in C)
+- hashlib provides cryptographic hash functions; mmh3 (MurmurHash3) is used
+  when installed, matching the MurmurHash family used by the C version
+- The per-item bit loops are compiled with the optional Cython extension
+  (_bloom_ext.pyx) or with Numba when either is available, which brings
+  them close to the speed of the C loops
 """
 
 import math
+import os
 import hashlib
-from typing import List, Optional
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import mmh3
+except ImportError:  # pragma: no cover - optional dependency
+    mmh3 = None
+
+try:
+    import _bloom_ext
+except ImportError:  # pragma: no cover - optional compiled extension
+    _bloom_ext = None
+
+try:
+    from numba import njit, prange, get_num_threads
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAVE_NUMBA = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """Fallback decorator: run the kernel as plain Python."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+def _as_bytes(item: Union[str, bytes]) -> bytes:
+    """Encode str items as UTF-8; bytes items are hashed as they are."""
+    return item.encode('utf-8') if isinstance(item, str) else item
+
+
+def _hash_pair(data: bytes) -> Tuple[int, int]:
+    """
+    Compute the two base hashes (h1, h2) for Kirsch-Mitzenmacher.
+    
+    MurmurHash3 x64-128 returns both 64-bit halves in a single call, which
+    is far cheaper than two cryptographic digests. Without mmh3 we fall
+    back to a single 128-bit BLAKE2b digest split into two halves, one
+    pass over the data instead of separate MD5 and SHA1 passes.
+    
+    Args:
+        data: The encoded item
+        
+    Returns:
+        Tuple (h1, h2) of non-negative 64-bit integers
+    """
+    if mmh3 is not None:
+        return mmh3.hash64(data, signed=False)
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little')
+
+
+# Set-bit count of every byte value, for NumPy without np.bitwise_count
+_BYTE_POPCOUNT = np.array([bin(b).count('1') for b in range(256)], dtype=np.uint8)
+_POPCOUNT_CHUNK_WORDS = 1 << 16
+
+
+def _popcount_words(words: np.ndarray) -> int:
+    """
+    Count the set bits of a uint64 array, one fixed-size slice at a time.
+    
+    Temporaries stay at a slice's size, so a memory-mapped filter is
+    paged through rather than copied into RAM.
+    
+    Args:
+        words: uint64 bit array (may be an np.memmap)
+        
+    Returns:
+        Number of set bits
+    """
+    total = 0
+    for start in range(0, words.size, _POPCOUNT_CHUNK_WORDS):
+        chunk = words[start:start + _POPCOUNT_CHUNK_WORDS]
+        if hasattr(np, 'bitwise_count'):
+            total += int(np.bitwise_count(chunk).sum(dtype=np.int64))
+        else:
+            total += int(_BYTE_POPCOUNT[chunk.view(np.uint8)].sum(dtype=np.int64))
+    return total
+
+
+@njit(parallel=True, cache=True)
+def _bf_set_sharded(bits, words, masks, offsets):
+    """
+    Set bits in parallel, one thread per shard of the bit array.
+    
+    words/masks are grouped by shard and shard t owns entries
+    offsets[t]:offsets[t + 1]. Shards cover disjoint word ranges, so no
+    two threads ever write the same word and no atomics are needed.
+    """
+    for t in prange(len(offsets) - 1):
+        for j in range(offsets[t], offsets[t + 1]):
+            bits[words[j]] |= masks[j]
+
+
+@njit(parallel=True, cache=True)
+def _bf_query_parallel(bits, indices, out):
+    """Test every row of an (N, k) index matrix; the bits are read-only."""
+    for i in prange(indices.shape[0]):
+        present = True
+        for j in range(indices.shape[1]):
+            idx = indices[i, j]
+            if not (bits[idx >> 6] >> np.uint64(idx & 63)) & np.uint64(1):
+                present = False
+                break
+        out[i] = present
+
+
+@njit(cache=True)
+def _blocked_add(blocks, block, a, b, k):
+    """Set k bits inside one 512-bit block: positions (a + i*b) mod 512."""
+    for i in range(k):
+        pos = (a + i * b) & 511
+        blocks[block, pos >> 6] |= np.uint64(1) << np.uint64(pos & 63)
+
+
+@njit(cache=True)
+def _blocked_query(blocks, block, a, b, k):
+    """Return True if all k bits of an item are set in its block."""
+    for i in range(k):
+        pos = (a + i * b) & 511
+        if not (blocks[block, pos >> 6] >> np.uint64(pos & 63)) & np.uint64(1):
+            return False
+    return True
+
+
+@lru_cache(maxsize=None)
+def _make_bloom_kernels(num_bits: int, num_hashes: int):
+    """
+    Build add/query kernels specialised for a fixed (m, k).
+    
+    m and k never change after construction, so they are closed over
+    instead of passed in: Numba compiles them as constants, which lets it
+    unroll the k-loop and, when m is a power of two, replace the modulo
+    with a single AND. Filters with the same shape share the kernels.
+    
+    If the Cython extension is built, its generic kernels are used
+    instead, so no LLVM is needed at runtime.
+    
+    Args:
+        num_bits: Size of the bit array (m)
+        num_hashes: Number of hash functions (k)
+        
+    Returns:
+        Tuple (add, query) of kernels taking (bits, h1, h2) reduced mod m
+    """
+    if _bloom_ext is not None:
+        def add(bits, h1, h2):
+            _bloom_ext.bf_add(bits, h1, h2, num_hashes, num_bits)
+        
+        def query(bits, h1, h2):
+            return _bloom_ext.bf_query(bits, h1, h2, num_hashes, num_bits)
+        
+        return add, query
+    
+    power_of_two = num_bits & (num_bits - 1) == 0
+    mask = num_bits - 1
+    
+    @njit
+    def add(bits, h1, h2):
+        for i in range(num_hashes):
+            idx = h1 + i * h2
+            idx = idx & mask if power_of_two else idx % num_bits
+            bits[idx >> 6] |= np.uint64(1) << np.uint64(idx & 63)
+    
+    @njit
+    def query(bits, h1, h2):
+        for i in range(num_hashes):
+            idx = h1 + i * h2
+            idx = idx & mask if power_of_two else idx % num_bits
+            if not (bits[idx >> 6] >> np.uint64(idx & 63)) & np.uint64(1):
+                return False
+        return True
+    
+    return add, query
 
 
 class BloomFilter:
@@ -35,25 +216,39 @@ class BloomFilter:
     Attributes:
         num_bits (int): Size of the bit array (m)
         num_hashes (int): Number of hash functions (k)
-        bits (bytearray): The bit array
+        bits (np.ndarray): The bit array (uint64, 64 bits per word), either
+            in memory or a np.memmap backed by a file
         num_items (int): Number of items added
     """
     
-    def __init__(self, num_bits: int, num_hashes: int):
+    def __init__(self, num_bits: int, num_hashes: int,
+                 path: Optional[str] = None, mode: str = 'w+'):
         """
         Initialise a Bloom filter with specified parameters.
         
         Args:
             num_bits: Size of the bit array (m)
             num_hashes: Number of hash functions to use (k)
+            path: Optional file to back the bit array with a memory map.
+                  Large filters then live in the OS page cache instead of
+                  the Python heap and can be shared between processes.
+            mode: np.memmap mode used with path: 'w+' creates an empty
+                  filter, 'r+' opens an existing one, 'r' opens read-only
         """
         self.num_bits = num_bits
         self.num_hashes = num_hashes
         self.num_items = 0
         
-        # Use bytearray for the bit array
-        # Each byte stores 8 bits
-        self.bits = bytearray((num_bits + 7) // 8)
+        # Use a uint64 array for the bit array
+        # Each word stores 64 bits, so one load covers a full machine word
+        num_words = (num_bits + 63) >> 6
+        if path is None:
+            self.bits = np.zeros(num_words, dtype=np.uint64)
+        else:
+            self.bits = np.memmap(path, dtype=np.uint64, mode=mode, shape=(num_words,))
+        
+        # Kernels compiled for this (m, k)
+        self._add_kernel, self._query_kernel = _make_bloom_kernels(num_bits, num_hashes)
     
     @classmethod
     def create_optimal(cls, expected_items: int, false_positive_rate: float) -> 'BloomFilter':
@@ -63,6 +258,10 @@ class BloomFilter:
         The optimal number of bits is: m = -n * ln(p) / (ln(2))^2
         The optimal number of hashes is: k = (m/n) * ln(2)
         
+        m is then rounded up to a power of two so the kernels can reduce
+        hashes with a mask instead of a division. The extra bits only
+        lower the false positive rate below the requested one.
+        
         Args:
             expected_items: Expected number of items to add (n)
             false_positive_rate: Desired false positive probability (p)
@@ -87,60 +286,118 @@ class BloomFilter:
         # k = (m/n) * ln(2)
         num_hashes = max(1, int((num_bits / expected_items) * math.log(2)))
         
+        # Round m up to the next power of two: h % m becomes h & (m - 1)
+        num_bits = 1 << max(num_bits - 1, 1).bit_length()
+        
         return cls(num_bits, num_hashes)
     
-    def _hash(self, item: str, seed: int) -> int:
+    @classmethod
+    def from_mmap(cls, path: str, num_bits: int, num_hashes: int,
+                  readonly: bool = True) -> 'BloomFilter':
         """
-        Generate a hash value for an item with a given seed.
+        Open a filter previously saved with to_mmap() without copying it.
         
-        Uses the Kirsch-Mitzenmacher technique: only two hash functions
-        are needed to generate k hash values: h_i(x) = h1(x) + i * h2(x)
+        The file holds only the bit array, so (m, k) must be supplied.
+        num_items is not stored either; it is estimated from the number
+        of set bits X as n ≈ -(m/k) * ln(1 - X/m).
         
         Args:
-            item: The item to hash
-            seed: The seed/index for this hash function
+            path: File written by to_mmap()
+            num_bits: Size of the bit array (m) used when saving
+            num_hashes: Number of hash functions (k) used when saving
+            readonly: Map the file read-only (for query-only workers)
             
         Returns:
-            Hash value in range [0, num_bits)
+            BloomFilter whose bit array is mapped from the file
+        """
+        bf = cls(num_bits, num_hashes, path=path, mode='r' if readonly else 'r+')
+        set_bits = _popcount_words(bf.bits)
+        if set_bits < num_bits:
+            bf.num_items = round(-(num_bits / num_hashes) * math.log(1 - set_bits / num_bits))
+        return bf
+    
+    def to_mmap(self, path: str) -> None:
         """
-        # Use MD5 for h1 and SHA1 for h2 (for demonstration)
-        # In production, use faster non-cryptographic hashes like MurmurHash
-        data = item.encode('utf-8')
+        Write the bit array to a file that from_mmap() can map back.
         
-        h1 = int(hashlib.md5(data).hexdigest(), 16)
-        h2 = int(hashlib.sha1(data).hexdigest(), 16)
+        Args:
+            path: Destination file
+        """
+        if isinstance(self.bits, np.memmap) and self.bits.filename == os.path.abspath(path):
+            self.bits.flush()
+        else:
+            self.bits.tofile(path)
+    
+    def _base_hashes(self, data: bytes) -> Tuple[int, int]:
+        """
+        Hash an encoded item once and reduce both base hashes modulo num_bits.
+        
+        Uses the Kirsch-Mitzenmacher technique: only two hash functions
+        are needed to generate k hash values: h_i(x) = h1(x) + i * h2(x).
+        Reducing h1 and h2 first keeps every intermediate value small
+        enough for the compiled kernels to use machine integers.
+        
+        Args:
+            data: The encoded item to hash
+            
+        Returns:
+            Tuple (h1 mod m, h2 mod m)
+        """
+        h1, h2 = _hash_pair(data)
+        return h1 % self.num_bits, h2 % self.num_bits
+    
+    def _hash_indices_many(self, items: Iterable[Union[str, bytes]]) -> np.ndarray:
+        """
+        Generate the k bit indices of every item in a batch.
         
-        # Kirsch-Mitzenmacher technique
-        combined = (h1 + seed * h2) % self.num_bits
-        return combined
+        Args:
+            items: The items to hash
+            
+        Returns:
+            Array of shape (N, k) with indices in range [0, num_bits)
+        """
+        m = self.num_bits
+        base = np.array([self._base_hashes(_as_bytes(item)) for item in items],
+                        dtype=np.int64).reshape(-1, 2)
+        steps = np.arange(self.num_hashes, dtype=np.int64)
+        return (base[:, :1] + steps * base[:, 1:]) % m
     
     def _set_bit(self, index: int) -> None:
         """Set the bit at the given index."""
-        byte_index = index // 8
-        bit_index = index % 8
-        self.bits[byte_index] |= (1 << bit_index)
+        word_index = index >> 6
+        bit_index = index & 63
+        self.bits[word_index] |= np.uint64(1) << np.uint64(bit_index)
     
     def _get_bit(self, index: int) -> bool:
         """Get the bit at the given index."""
-        byte_index = index // 8
-        bit_index = index % 8
-        return bool(self.bits[byte_index] & (1 << bit_index))
+        word_index = index >> 6
+        bit_index = index & 63
+        return bool((self.bits[word_index] >> np.uint64(bit_index)) & np.uint64(1))
     
-    def add(self, item: str) -> None:
+    def add(self, item: Union[str, bytes]) -> None:
         """
         Add an item to the Bloom filter.
         
         Sets k bits in the bit array, one for each hash function.
+        str items are encoded as UTF-8 once; bytes items are used as-is.
         
         Args:
             item: The item to add
         """
-        for i in range(self.num_hashes):
-            bit_index = self._hash(item, i)
-            self._set_bit(bit_index)
+        self.add_bytes(_as_bytes(item))
+    
+    def add_bytes(self, data: bytes) -> None:
+        """
+        Add an already encoded item (fast path for byte-oriented pipelines).
+        
+        Args:
+            data: The encoded item to add
+        """
+        h1, h2 = self._base_hashes(data)
+        self._add_kernel(self.bits, h1, h2)
         self.num_items += 1
     
-    def query(self, item: str) -> bool:
+    def query(self, item: Union[str, bytes]) -> bool:
         """
         Test if an item might be in the set.
         
@@ -153,13 +410,71 @@ class BloomFilter:
         Returns:
             True if item might be present, False if definitely absent
         """
-        for i in range(self.num_hashes):
-            bit_index = self._hash(item, i)
-            if not self._get_bit(bit_index):
-                return False
-        return True
+        return self.query_bytes(_as_bytes(item))
+    
+    def query_bytes(self, data: bytes) -> bool:
+        """
+        Test an already encoded item (fast path for byte-oriented pipelines).
+        
+        Args:
+            data: The encoded item to test
+            
+        Returns:
+            True if item might be present, False if definitely absent
+        """
+        h1, h2 = self._base_hashes(data)
+        return bool(self._query_kernel(self.bits, h1, h2))
+    
+    def add_many(self, items: Iterable[Union[str, bytes]]) -> None:
+        """
+        Add a batch of items to the Bloom filter.
+        
+        Equivalent to calling add() on each item, but all N*k bits are set
+        in one pass instead of N interpreter round trips. With Numba the
+        bit array is split into one contiguous shard per thread and each
+        thread sets only the bits of its own shard; otherwise a single
+        NumPy bitwise_or.at call is used.
+        
+        Args:
+            items: The items to add
+        """
+        indices = self._hash_indices_many(items)
+        num_new = len(indices)
+        indices = indices.ravel()
+        words = indices >> 6
+        masks = np.left_shift(np.uint64(1), (indices & 63).astype(np.uint64))
+        
+        if HAVE_NUMBA:
+            shards = get_num_threads()
+            owners = words * shards // len(self.bits)
+            order = np.argsort(owners, kind='stable')
+            offsets = np.searchsorted(owners[order], np.arange(shards + 1))
+            _bf_set_sharded(self.bits, words[order], masks[order], offsets)
+        else:
+            np.bitwise_or.at(self.bits, words, masks)
+        self.num_items += num_new
     
-    def __contains__(self, item: str) -> bool:
+    def query_many(self, items: Iterable[Union[str, bytes]]) -> np.ndarray:
+        """
+        Test a batch of items for membership.
+        
+        Args:
+            items: The items to test
+            
+        Returns:
+            Boolean array, True where the item might be present
+        """
+        indices = self._hash_indices_many(items)
+        if HAVE_NUMBA:
+            # Queries only read the bits, so items are simply split
+            # evenly across threads
+            present = np.empty(len(indices), dtype=np.bool_)
+            _bf_query_parallel(self.bits, indices, present)
+            return present
+        shifts = (indices & 63).astype(np.uint64)
+        return ((self.bits[indices >> 6] >> shifts) & np.uint64(1)).all(axis=1)
+    
+    def __contains__(self, item: Union[str, bytes]) -> bool:
         """Allow using 'in' operator."""
         return self.query(item)
     
@@ -185,7 +500,113 @@ class BloomFilter:
     
     def memory_usage_bytes(self) -> int:
         """Return the memory used by the bit array in bytes."""
-        return len(self.bits)
+        return self.bits.nbytes
+
+
+class BlockedBloomFilter:
+    """
+    A cache-friendly Bloom filter that keeps all k bits of an item in one block.
+    
+    The bit array is split into 512-bit blocks (one 64-byte cache line,
+    stored as 8 uint64 words). h1 selects the block and h2 generates the
+    k bit positions inside it, so an add or query touches one cache line
+    instead of k. The price is a slightly higher false positive rate than
+    a standard Bloom filter of the same size, because blocks fill unevenly.
+    
+    Attributes:
+        num_blocks (int): Number of 512-bit blocks
+        num_hashes (int): Number of bits set per item (k)
+        blocks (np.ndarray): Bit array of shape (num_blocks, 8), uint64
+        num_items (int): Number of items added
+    """
+    
+    BLOCK_BITS = 512
+    
+    def __init__(self, num_blocks: int, num_hashes: int):
+        """
+        Initialise a blocked Bloom filter.
+        
+        Args:
+            num_blocks: Number of 512-bit blocks
+            num_hashes: Number of bits set per item (k)
+        """
+        self.num_blocks = num_blocks
+        self.num_hashes = num_hashes
+        self.num_items = 0
+        self.blocks = np.zeros((num_blocks, self.BLOCK_BITS // 64), dtype=np.uint64)
+    
+    @classmethod
+    def create_optimal(cls, expected_items: int, false_positive_rate: float) -> 'BlockedBloomFilter':
+        """
+        Create a blocked Bloom filter sized like the equivalent standard one.
+        
+        Uses the same m and k formulas as BloomFilter.create_optimal and
+        rounds m up to whole blocks.
+        
+        Args:
+            expected_items: Expected number of items to add (n)
+            false_positive_rate: Desired false positive probability (p)
+            
+        Returns:
+            BlockedBloomFilter with near-optimal parameters
+            
+        Raises:
+            ValueError: If parameters are invalid
+        """
+        if expected_items <= 0:
+            raise ValueError("Expected items must be positive")
+        if not (0 < false_positive_rate < 1):
+            raise ValueError("False positive rate must be between 0 and 1")
+        
+        ln2_sq = math.log(2) ** 2
+        num_bits = int(-expected_items * math.log(false_positive_rate) / ln2_sq)
+        num_hashes = max(1, int((num_bits / expected_items) * math.log(2)))
+        num_blocks = max(1, -(-num_bits // cls.BLOCK_BITS))
+        
+        return cls(num_blocks, num_hashes)
+    
+    def _locate(self, item: Union[str, bytes]) -> Tuple[int, int, int]:
+        """
+        Hash an item once and return (block, a, b).
+        
+        The bit positions inside the block are (a + i * b) mod 512, with
+        a and b taken from the two 32-bit halves of h2 (b forced odd so
+        the k positions are distinct).
+        """
+        h1, h2 = _hash_pair(_as_bytes(item))
+        return h1 % self.num_blocks, h2 & 0xFFFFFFFF, ((h2 >> 32) & 0xFFFFFFFF) | 1
+    
+    def add(self, item: Union[str, bytes]) -> None:
+        """
+        Add an item to the filter.
+        
+        Args:
+            item: The item to add
+        """
+        block, a, b = self._locate(item)
+        _blocked_add(self.blocks, block, a, b, self.num_hashes)
+        self.num_items += 1
+    
+    def query(self, item: Union[str, bytes]) -> bool:
+        """
+        Test if an item might be in the set.
+        
+        Args:
+            item: The item to test
+            
+        Returns:
+            True if item might be present, False if definitely absent
+        """
+        block, a, b = self._locate(item)
+        return bool(_blocked_query(self.blocks, block, a, b, self.num_hashes))
+    
+    def __contains__(self, item: Union[str, bytes]) -> bool:
+        """Allow using 'in' operator."""
+        return self.query(item)
+    
+    def memory_usage_bytes(self) -> int:
+        """Return the memory used by the blocks in bytes."""
+        return self.blocks.nbytes
 
 
 class CountingBloomFilter:
@@ -196,6 +617,8 @@ class CountingBloomFilter:
     of a single bit. This allows decrementing when items are removed.
     
     The trade-off is increased memory usage (4x or more compared to basic Bloom).
+    Counters are stored one per byte in a NumPy uint8 array, so the
+    counter width is limited to 8 bits.
     """
     
     def __init__(self, num_counters: int, num_hashes: int, counter_bits: int = 4):
@@ -206,25 +629,29 @@ class CountingBloomFilter:
             num_counters: Number of counter positions (m)
             num_hashes: Number of hash functions (k)
             counter_bits: Bits per counter (default 4, max value 15)
+            
+        Raises:
+            ValueError: If counter_bits is outside the range [1, 8]
         """
+        if not (1 <= counter_bits <= 8):
+            raise ValueError("Counter bits must be between 1 and 8")
+        
         self.num_counters = num_counters
         self.num_hashes = num_hashes
         self.counter_bits = counter_bits
         self.max_count = (1 << counter_bits) - 1
         self.num_items = 0
         
-        # Store counters as a list for simplicity
-        # In production, pack counters more efficiently
-        self.counters = [0] * num_counters
+        # One byte per counter: 1 byte instead of a boxed Python int each
+        self.counters = np.zeros(num_counters, dtype=np.uint8)
     
-    def _hash(self, item: str, seed: int) -> int:
-        """Generate hash value using Kirsch-Mitzenmacher technique."""
-        data = item.encode('utf-8')
-        h1 = int(hashlib.md5(data).hexdigest(), 16)
-        h2 = int(hashlib.sha1(data).hexdigest(), 16)
-        return (h1 + seed * h2) % self.num_counters
+    def _hash_indices(self, item: Union[str, bytes]) -> List[int]:
+        """Generate all k counter indices using Kirsch-Mitzenmacher technique."""
+        h1, h2 = _hash_pair(_as_bytes(item))
+        m = self.num_counters
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
     
-    def add(self, item: str) -> bool:
+    def add(self, item: Union[str, bytes]) -> bool:
         """
         Add an item to the filter.
         
@@ -234,21 +661,21 @@ class CountingBloomFilter:
         Returns:
             True if successful, False if any counter would overflow
         """
-        indices = [self._hash(item, i) for i in range(self.num_hashes)]
+        indices = np.array(self._hash_indices(item), dtype=np.intp)
         
-        # Check for potential overflow
-        for idx in indices:
-            if self.counters[idx] >= self.max_count:
-                return False  # Would overflow
+        # Check for potential overflow; a repeated index is incremented
+        # once per repeat, so compare against the summed increment
+        unique, repeats = np.unique(indices, return_counts=True)
+        if (self.counters[unique].astype(np.intp) + repeats > self.max_count).any():
+            return False  # Would overflow
         
         # Increment all counters
-        for idx in indices:
-            self.counters[idx] += 1
+        self.counters[unique] += repeats.astype(np.uint8)
         
         self.num_items += 1
         return True
     
-    def remove(self, item: str) -> bool:
+    def remove(self, item: Union[str, bytes]) -> bool:
         """
         Remove an item from the filter.
         
@@ -258,25 +685,21 @@ class CountingBloomFilter:
         Returns:
             True if removed, False if item was not present
         """
-        if not self.query(item):
+        # Hash once and reuse the indices for both the check and the update
+        indices = np.array(self._hash_indices(item), dtype=np.intp)
+        if not self.counters[indices].all():
             return False
         
-        # Decrement all counters
-        for i in range(self.num_hashes):
-            idx = self._hash(item, i)
-            if self.counters[idx] > 0:
-                self.counters[idx] -= 1
+        # Decrement all counters, saturating at zero for repeated indices
+        unique, repeats = np.unique(indices, return_counts=True)
+        self.counters[unique] -= np.minimum(self.counters[unique], repeats).astype(np.uint8)
         
         self.num_items -= 1
         return True
     
-    def query(self, item: str) -> bool:
+    def query(self, item: Union[str, bytes]) -> bool:
         """Test if an item might be in the set."""
-        for i in range(self.num_hashes):
-            idx = self._hash(item, i)
-            if self.counters[idx] == 0:
-                return False
-        return True
+        return bool(self.counters[self._hash_indices(item)].all())
 
 
 def demo():
@@ -314,6 +737,22 @@ def demo():
     print(f"Theoretical FP rate: {bf.theoretical_fp_rate():.4%}")
     print()
     
+    # Demonstrate blocked bloom filter
+    print("-" * 60)
+    print("       BLOCKED BLOOM FILTER")
+    print("-" * 60)
+    print()
+    
+    bbf = BlockedBloomFilter.create_optimal(1000, 0.01)
+    for word in words:
+        bbf.add(word)
+    print(f"Blocks: {bbf.num_blocks} x 512 bits, hash functions: {bbf.num_hashes}")
+    print(f"  Memory: {bbf.memory_usage_bytes()} bytes")
+    for word in test_words:
+        present = "possibly present" if word in bbf else "definitely absent"
+        print(f"  '{word}': {present}")
+    print()
+    
     # Demonstrate counting bloom filter
     print("-" * 60)
     print("       COUNTING BLOOM FILTER")
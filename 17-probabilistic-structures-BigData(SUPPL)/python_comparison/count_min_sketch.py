@@ -19,13 +19,107 @@ Key Properties:
 - Query time: O(log(δ⁻¹))
 - Error guarantee: With probability 1-δ, estimate ≤ true count + ε×N
   where N is the total count of all elements
+
+The counter table is a contiguous NumPy uint32 array (the equivalent of the
+C uint32_t table), and the per-item row loop is compiled with the optional
+Cython extension (_bloom_ext.pyx) or with Numba when either is available.
 """
 
 import math
 import hashlib
-from typing import List, Dict, Optional, Tuple
+from functools import lru_cache
+from typing import Iterable, List, Dict, Optional, Tuple, Union
 from collections import Counter
 
+import numpy as np
+
+try:
+    import mmh3
+except ImportError:  # pragma: no cover - optional dependency
+    mmh3 = None
+
+try:
+    import _bloom_ext
+except ImportError:  # pragma: no cover - optional compiled extension
+    _bloom_ext = None
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - optional dependency
+    def njit(*args, **kwargs):
+        """Fallback decorator: run the kernel as plain Python."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+def _as_bytes(item: Union[str, bytes]) -> bytes:
+    """Encode str items as UTF-8; bytes items are hashed as they are."""
+    return item.encode('utf-8') if isinstance(item, str) else item
+
+
+def _hash_pair(data: bytes) -> Tuple[int, int]:
+    """
+    Compute the two base hashes (h1, h2) used to derive every row hash.
+    
+    MurmurHash3 x64-128 yields both 64-bit halves in one call. Without
+    mmh3 the two halves of a single 128-bit BLAKE2b digest are used
+    instead, which is faster than SHA-256 and produces exactly 128 bits.
+    
+    Args:
+        data: The encoded item
+        
+    Returns:
+        Tuple (h1, h2) of non-negative 64-bit integers
+    """
+    if mmh3 is not None:
+        return mmh3.hash64(data, signed=False)
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little')
+
+
+@lru_cache(maxsize=None)
+def _make_cms_kernels(width: int, depth: int):
+    """
+    Build the update/query kernels specialised for a fixed (width, depth).
+    
+    The dimensions are closed over so Numba compiles them as constants and
+    can unroll the row loop. Columns are chosen with Lemire's fastrange,
+    (h * w) >> 32 on a 32-bit row hash, which maps uniformly onto [0, w)
+    with a multiply and a shift instead of a division.
+    
+    If the Cython extension is built, its generic kernels are used
+    instead, so no LLVM is needed at runtime.
+    
+    Args:
+        width: Number of columns (w)
+        depth: Number of rows (d)
+        
+    Returns:
+        Tuple (update, query) of kernels taking (table, h1, h2[, count])
+        with 32-bit base hashes
+    """
+    if _bloom_ext is not None:
+        return _bloom_ext.cms_update, _bloom_ext.cms_query
+    
+    @njit
+    def update(table, h1, h2, count):
+        for row in range(depth):
+            col = (((h1 + row * h2) & 0xFFFFFFFF) * width) >> 32
+            table[row, col] += count
+    
+    @njit
+    def query(table, h1, h2):
+        # Integer minimum with a uint32 sentinel: no float conversion
+        min_count = np.uint32(0xFFFFFFFF)
+        for row in range(depth):
+            col = (((h1 + row * h2) & 0xFFFFFFFF) * width) >> 32
+            if table[row, col] < min_count:
+                min_count = table[row, col]
+        return min_count
+    
+    return update, query
+
 
 class CountMinSketch:
     """
@@ -40,7 +134,7 @@ class CountMinSketch:
     Attributes:
         width (int): Number of columns (w)
         depth (int): Number of rows/hash functions (d)
-        table (List[List[int]]): The 2D counter array
+        table (np.ndarray): The 2D counter array, shape (depth, width), uint32
         total_count (int): Total number of updates
     """
     
@@ -51,10 +145,17 @@ class CountMinSketch:
         Args:
             width: Number of columns (w), determines accuracy (ε ≈ e/w)
             depth: Number of rows (d), determines confidence (δ ≈ e^(-d))
+            
+        Raises:
+            ValueError: If width is outside the range [1, 2^31)
         """
+        if not (0 < width < (1 << 31)):
+            raise ValueError("Width must be between 1 and 2^31 - 1")
+        
         self.width = width
         self.depth = depth
-        self.table = [[0] * width for _ in range(depth)]
+        self.table = np.zeros((depth, width), dtype=np.uint32)
+        self._update_kernel, self._query_kernel = _make_cms_kernels(width, depth)
         self.total_count = 0
     
     @classmethod
@@ -89,43 +190,50 @@ class CountMinSketch:
         
         return cls(width, depth)
     
-    def _hash(self, item: str, row: int) -> int:
+    def _base_hashes(self, data: bytes) -> Tuple[int, int]:
         """
-        Generate a hash value for an item in a specific row.
+        Hash an encoded item once and keep 32 bits of each base hash.
         
-        Uses SHA-256 with row-specific salt for pseudo-independence.
+        The row hash is (h1 + row * h2) mod 2^32 and the column is
+        (row_hash * width) >> 32, so every intermediate value fits in a
+        64-bit machine integer.
         
         Args:
-            item: The item to hash
-            row: The row index (determines which hash function)
+            data: The encoded item to hash
             
         Returns:
-            Hash value in range [0, width)
+            Tuple (h1 mod 2^32, h2 mod 2^32)
         """
-        # Combine item with row-specific salt
-        salted = f"{row}:{item}".encode('utf-8')
-        hash_bytes = hashlib.sha256(salted).digest()
-        
-        # Convert first 8 bytes to integer and map to width
-        hash_int = int.from_bytes(hash_bytes[:8], 'big')
-        return hash_int % self.width
+        h1, h2 = _hash_pair(data)
+        return h1 & 0xFFFFFFFF, h2 & 0xFFFFFFFF
     
-    def update(self, item: str, count: int = 1) -> None:
+    def update(self, item: Union[str, bytes], count: int = 1) -> None:
         """
         Add a count for an item (increment all corresponding counters).
         
+        str items are encoded as UTF-8 once; bytes items are used as-is.
+        
         Time complexity: O(depth)
         
         Args:
             item: The item to update
             count: The count to add (default 1)
         """
-        for row in range(self.depth):
-            col = self._hash(item, row)
-            self.table[row][col] += count
+        self.update_bytes(_as_bytes(item), count)
+    
+    def update_bytes(self, data: bytes, count: int = 1) -> None:
+        """
+        Update an already encoded item (fast path for byte-oriented pipelines).
+        
+        Args:
+            data: The encoded item to update
+            count: The count to add (default 1)
+        """
+        h1, h2 = self._base_hashes(data)
+        self._update_kernel(self.table, h1, h2, count)
         self.total_count += count
     
-    def query(self, item: str) -> int:
+    def query(self, item: Union[str, bytes]) -> int:
         """
         Estimate the frequency of an item.
         
@@ -140,19 +248,73 @@ class CountMinSketch:
         Returns:
             Estimated frequency (upper bound)
         """
-        min_count = float('inf')
-        for row in range(self.depth):
-            col = self._hash(item, row)
-            min_count = min(min_count, self.table[row][col])
-        return int(min_count)
+        return self.query_bytes(_as_bytes(item))
+    
+    def query_bytes(self, data: bytes) -> int:
+        """
+        Query an already encoded item (fast path for byte-oriented pipelines).
+        
+        Args:
+            data: The encoded item to query
+            
+        Returns:
+            Estimated frequency (upper bound)
+        """
+        h1, h2 = self._base_hashes(data)
+        return int(self._query_kernel(self.table, h1, h2))
+    
+    def _hash_columns_many(self, items: Iterable[Union[str, bytes]]) -> np.ndarray:
+        """
+        Generate the column index of every item in every row.
+        
+        Args:
+            items: The items to hash
+            
+        Returns:
+            Array of shape (N, depth) with indices in range [0, width)
+        """
+        base = np.array([self._base_hashes(_as_bytes(item)) for item in items],
+                        dtype=np.int64).reshape(-1, 2)
+        rows = np.arange(self.depth, dtype=np.int64)
+        row_hashes = (base[:, :1] + rows * base[:, 1:]) & 0xFFFFFFFF
+        return (row_hashes * self.width) >> 32
+    
+    def update_many(self, items: Iterable[Union[str, bytes]], count: int = 1) -> None:
+        """
+        Add a count for each item of a batch.
+        
+        Equivalent to calling update() on each item; the N*depth counter
+        increments are done by one np.add.at call.
+        
+        Args:
+            items: The items to update
+            count: The count to add for each item (default 1)
+        """
+        cols = self._hash_columns_many(items)
+        rows = np.broadcast_to(np.arange(self.depth), cols.shape)
+        np.add.at(self.table, (rows, cols), count)
+        self.total_count += count * len(cols)
+    
+    def query_many(self, items: Iterable[Union[str, bytes]]) -> np.ndarray:
+        """
+        Estimate the frequency of each item of a batch.
+        
+        Args:
+            items: The items to query
+            
+        Returns:
+            Array of estimated frequencies (upper bounds)
+        """
+        cols = self._hash_columns_many(items)
+        return self.table[np.arange(self.depth), cols].min(axis=1)
     
     def memory_usage_bytes(self) -> int:
         """
-        Return approximate memory usage in bytes.
+        Return memory usage of the counter table in bytes.
         
-        Assumes 4 bytes per counter (32-bit integers).
+        Each counter is a 32-bit unsigned integer.
         """
-        return self.width * self.depth * 4
+        return self.table.nbytes
     
     def merge(self, other: 'CountMinSketch') -> 'CountMinSketch':
         """
@@ -173,9 +335,7 @@ class CountMinSketch:
             raise ValueError("Sketches must have the same dimensions")
         
         merged = CountMinSketch(self.width, self.depth)
-        for row in range(self.depth):
-            for col in range(self.width):
-                merged.table[row][col] = self.table[row][col] + other.table[row][col]
+        np.add(self.table, other.table, out=merged.table)
         merged.total_count = self.total_count + other.total_count
         
         return merged
@@ -211,7 +371,7 @@ class ExactCounter:
         """Add a count for an item."""
         self.counts[item] += count
     
-    def query(self, item: str) -> int:
+    def query(self, item: Union[str, bytes]) -> int:
         """Get the exact count for an item."""
         return self.counts[item]
     
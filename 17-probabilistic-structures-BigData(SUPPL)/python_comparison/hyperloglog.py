@@ -27,7 +27,159 @@ hash values of its elements.
 
 import math
 import hashlib
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, Optional
+
+import numpy as np
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - optional dependency
+    xxhash = None
+
+try:
+    import _hll_ext
+except ImportError:  # pragma: no cover - optional compiled extension
+    _hll_ext = None
+
+
+def _hash64(data: bytes) -> int:
+    """
+    Compute a uniform 64-bit hash of the encoded item.
+    
+    HyperLogLog only needs uniformly distributed bits, not a cryptographic
+    hash. XXH3 is used when the xxhash package is installed; otherwise an
+    8-byte BLAKE2b digest, which is still much cheaper than SHA-256.
+    
+    Args:
+        data: The encoded item
+        
+    Returns:
+        64-bit hash value
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+
+def _sigma(x: float) -> float:
+    """Ertl's sigma(x) = x + Σ_{k>=1} x^(2^k) * 2^(k-1), for 0 <= x <= 1."""
+    if x == 1.0:
+        return math.inf
+    y = 1.0
+    z = x
+    while True:
+        x *= x
+        z_old = z
+        z += x * y
+        y += y
+        if z == z_old:
+            return z
+
+
+def _tau(x: float) -> float:
+    """Ertl's tau(x) = (1 - x - Σ_{k>=1} (1 - x^(2^-k))² * 2^-k) / 3."""
+    if x == 0.0 or x == 1.0:
+        return 0.0
+    y = 1.0
+    z = 1.0 - x
+    while True:
+        x = math.sqrt(x)
+        z_old = z
+        y *= 0.5
+        z -= (1.0 - x) ** 2 * y
+        if z == z_old:
+            return z / 3.0
+
+
+def _bit_length_u64(values: np.ndarray) -> np.ndarray:
+    """
+    Vectorised int.bit_length() for a uint64 array.
+    
+    A six-step binary search on shifts keeps the result exact; going
+    through np.log2 would round values close to 2^k up once they exceed
+    the 53-bit float64 mantissa.
+    
+    Args:
+        values: Array of uint64 values
+        
+    Returns:
+        int64 array of bit lengths (0 for a zero value)
+    """
+    x = values.astype(np.uint64, copy=True)
+    length = np.zeros(x.shape, dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = x >= np.uint64(1 << shift)
+        length += shift * high
+        x[high] >>= np.uint64(shift)
+    length += x > 0
+    return length
+
+
+_SWAR_HIGH = np.uint64(0x8080808080808080)
+
+
+def _swar_max_u8(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Byte-wise maximum of two register arrays using 64-bit SWAR.
+    
+    Eight registers are handled per 64-bit word, for targets where only
+    word-sized integer arithmetic is available (this is the loop to port
+    to C without SIMD intrinsics; NumPy's np.maximum is already vectorised
+    and is what merge_into uses). Relies on every register being < 128:
+    setting the top bit of each byte of a and subtracting b then cannot
+    borrow across bytes, and the top bit survives exactly where a >= b.
+    
+    Args:
+        a: uint8 registers, length a multiple of 8
+        b: uint8 registers of the same length
+        
+    Returns:
+        New uint8 array with max(a[i], b[i]) in every position
+    """
+    a64 = np.ascontiguousarray(a).view(np.uint64)
+    b64 = np.ascontiguousarray(b).view(np.uint64)
+    
+    ge = ((a64 | _SWAR_HIGH) - b64) & _SWAR_HIGH
+    select_a = (ge >> np.uint64(7)) * np.uint64(0xFF)
+    return ((a64 & select_a) | (b64 & ~select_a)).view(np.uint8)
+
+
+_ADD_TEMPLATE = '''
+def add(self, item):
+    h = _hash(item.encode('utf-8'))
+    rho = {tail_bits_plus_one} - (h & {tail_mask}).bit_length()
+    registers = self.registers
+    idx = h >> {tail_bits}
+    if rho > registers[idx]:
+        registers[idx] = rho
+'''
+
+
+@lru_cache(maxsize=None)
+def _make_add(precision: int):
+    """
+    Generate an add() specialised for one precision.
+    
+    The shift amount, tail mask and rho offset are written into the
+    source as literals, so the generated function does no attribute
+    lookups or arithmetic on the precision per item. The result is
+    cached, so each precision is compiled once.
+    
+    Args:
+        precision: Number of register index bits (p)
+        
+    Returns:
+        Function add(self, item) equivalent to HyperLogLog.add
+    """
+    tail_bits = 64 - precision
+    source = _ADD_TEMPLATE.format(tail_bits=tail_bits,
+                                  tail_mask=(1 << tail_bits) - 1,
+                                  tail_bits_plus_one=tail_bits + 1)
+    hash_func = xxhash.xxh3_64_intdigest if xxhash is not None else _hash64
+    namespace = {'_hash': hash_func}
+    exec(compile(source, f'<hll_add_p{precision}>', 'exec'), namespace)
+    return namespace['add']
 
 
 class HyperLogLog:
@@ -41,7 +193,7 @@ class HyperLogLog:
     Attributes:
         precision (int): The precision parameter (p), determines m = 2^p registers
         num_registers (int): Number of registers (m)
-        registers (list): Array of register values
+        registers (np.ndarray): Array of register values (uint8)
         alpha (float): Bias correction constant
     """
     
@@ -52,6 +204,9 @@ class HyperLogLog:
         6: 0.709,
     }
     
+    # 2^-r for every possible register value (r <= 64 - 4 + 1 = 61)
+    _POW2_NEG = np.array([math.ldexp(1.0, -r) for r in range(64)], dtype=np.float64)
+    
     def __init__(self, precision: int = 14):
         """
         Initialise a HyperLogLog with specified precision.
@@ -69,7 +224,7 @@ class HyperLogLog:
         
         self.precision = precision
         self.num_registers = 1 << precision  # m = 2^p
-        self.registers = [0] * self.num_registers
+        self.registers = np.zeros(self.num_registers, dtype=np.uint8)
         
         # Calculate alpha (bias correction factor)
         if precision in self.ALPHA_MAP:
@@ -77,6 +232,9 @@ class HyperLogLog:
         else:
             # General formula for p >= 7
             self.alpha = 0.7213 / (1 + 1.079 / self.num_registers)
+        
+        # Per-item insert specialised for this precision (see _make_add)
+        self.add = _make_add(precision).__get__(self)
     
     def _hash(self, item: str) -> int:
         """
@@ -88,10 +246,7 @@ class HyperLogLog:
         Returns:
             64-bit hash value
         """
-        data = item.encode('utf-8')
-        # Use SHA-256 and take first 8 bytes for 64-bit hash
-        hash_bytes = hashlib.sha256(data).digest()[:8]
-        return int.from_bytes(hash_bytes, 'big')
+        return _hash64(item.encode('utf-8'))
     
     def _count_leading_zeros(self, value: int, max_bits: int = 64) -> int:
         """
@@ -104,21 +259,17 @@ class HyperLogLog:
         Returns:
             Number of leading zeros (including the first 1)
         """
-        if value == 0:
-            return max_bits + 1
-        
-        # Count leading zeros and add 1 for the first '1' bit
-        zeros = 0
-        for i in range(max_bits - 1, -1, -1):
-            if value & (1 << i):
-                return zeros + 1
-            zeros += 1
-        return zeros + 1
+        # int.bit_length() is a single C call (BSR/LZCNT), so there is no
+        # bit-by-bit loop. For value == 0 this gives max_bits + 1.
+        return max_bits - value.bit_length() + 1
     
     def add(self, item: str) -> None:
         """
         Add an item to the HyperLogLog.
         
+        This is the reference version; instances use an equivalent copy
+        generated with the precision folded in as constants.
+        
         Time complexity: O(1)
         
         Args:
@@ -130,17 +281,81 @@ class HyperLogLog:
         register_index = hash_value >> (64 - self.precision)
         
         # Use remaining bits for leading zero count
-        remaining_bits = hash_value & ((1 << (64 - self.precision)) - 1)
-        rho = self._count_leading_zeros(remaining_bits, 64 - self.precision)
+        tail_bits = 64 - self.precision
+        remaining_bits = hash_value & ((1 << tail_bits) - 1)
+        rho = self._count_leading_zeros(remaining_bits, tail_bits)
         
         # Update register with maximum value seen
-        self.registers[register_index] = max(self.registers[register_index], rho)
+        if rho > self.registers[register_index]:
+            self.registers[register_index] = rho
+    
+    def add_many(self, items: Iterable[str]) -> None:
+        """
+        Add a batch of items to the HyperLogLog.
+        
+        Items are hashed into one uint64 array; register indices and rho
+        values are then computed with vectorised shifts and merged with
+        np.maximum.at, so the per-item interpreter work is only the hash.
+        When the optional Cython extension (_hll_ext.pyx) is built, the
+        register update runs as one C loop using __builtin_clzll.
+        
+        Args:
+            items: Iterable of items to add
+        """
+        hashes = np.fromiter((_hash64(item.encode('utf-8')) for item in items),
+                             dtype=np.uint64)
+        if hashes.size == 0:
+            return
+        
+        if _hll_ext is not None:
+            _hll_ext.hll_add_bulk(hashes, self.registers, self.precision)
+            return
+        
+        tail_bits = 64 - self.precision
+        register_index = (hashes >> np.uint64(tail_bits)).astype(np.intp)
+        remaining_bits = hashes & np.uint64((1 << tail_bits) - 1)
+        rho = (tail_bits - _bit_length_u64(remaining_bits) + 1).astype(np.uint8)
+        
+        np.maximum.at(self.registers, register_index, rho)
     
     def count(self) -> int:
         """
         Estimate the cardinality (number of distinct elements).
         
-        Uses the harmonic mean of register values with bias correction.
+        Uses Ertl's improved estimator ("New cardinality estimation
+        algorithms for HyperLogLog sketches", 2017). It works on the
+        histogram of register values and folds the empty (0) and saturated
+        (64 - p + 1) registers in through sigma() and tau(), so it needs
+        neither the linear counting switch nor the large range correction
+        of the original estimator, and has no bias jump between them.
+        
+        Time complexity: O(m) for the histogram, O(64 - p) afterwards
+        
+        Returns:
+            Estimated cardinality
+        """
+        m = self.num_registers
+        q = 64 - self.precision
+        histogram = np.bincount(self.registers, minlength=q + 2).tolist()
+        
+        z = m * _tau(1.0 - histogram[q + 1] / m)
+        for k in range(q, 0, -1):
+            z = 0.5 * (z + histogram[k])
+        z += m * _sigma(histogram[0] / m)
+        
+        if z == 0.0:
+            # Every register saturated: beyond what a 64-bit hash can count
+            return 1 << 64
+        
+        # alpha_inf = 1 / (2 ln 2)
+        return int(round(m * m / (2.0 * math.log(2.0) * z)))
+    
+    def count_flajolet(self) -> int:
+        """
+        Estimate the cardinality with the original 2007 estimator.
+        
+        Uses the harmonic mean of register values with bias correction,
+        exactly as the C implementation does.
         
         Time complexity: O(m)
         
@@ -148,7 +363,8 @@ class HyperLogLog:
             Estimated cardinality
         """
         # Calculate harmonic mean: Z = 1 / Σ(2^(-M[j]))
-        harmonic_sum = sum(2.0 ** (-r) for r in self.registers)
+        # (table lookup instead of evaluating 2^-r per register)
+        harmonic_sum = float(self._POW2_NEG[self.registers].sum())
         
         if harmonic_sum == 0:
             return 0
@@ -160,7 +376,7 @@ class HyperLogLog:
         if raw_estimate <= 2.5 * self.num_registers:
             # Small range correction
             # Count registers with value 0
-            zero_registers = self.registers.count(0)
+            zero_registers = int(np.count_nonzero(self.registers == 0))
             if zero_registers > 0:
                 # Use linear counting estimate
                 return int(self.num_registers * math.log(self.num_registers / zero_registers))
@@ -185,16 +401,56 @@ class HyperLogLog:
         Returns:
             New merged HyperLogLog
             
+        Raises:
+            ValueError: If precisions don't match
+        """
+        merged = HyperLogLog(self.precision)
+        merged.registers[:] = self.registers
+        merged.merge_into(other)
+        
+        return merged
+    
+    def merge_into(self, other: 'HyperLogLog') -> None:
+        """
+        Merge another HyperLogLog into this one in place.
+        
+        Avoids allocating a new structure when folding many sketches
+        together (e.g. one per node) into an accumulator.
+        
+        Args:
+            other: Another HyperLogLog to merge with
+            
         Raises:
             ValueError: If precisions don't match
         """
         if self.precision != other.precision:
             raise ValueError("HyperLogLogs must have the same precision")
         
-        merged = HyperLogLog(self.precision)
-        for i in range(self.num_registers):
-            merged.registers[i] = max(self.registers[i], other.registers[i])
+        np.maximum(self.registers, other.registers, out=self.registers)
+    
+    @classmethod
+    def merge_all(cls, sketches: Iterable['HyperLogLog']) -> 'HyperLogLog':
+        """
+        Merge any number of HyperLogLogs into a new one.
         
+        Args:
+            sketches: HyperLogLogs with the same precision (at least one)
+            
+        Returns:
+            New merged HyperLogLog
+            
+        Raises:
+            ValueError: If no sketches are given or precisions don't match
+        """
+        sketches = list(sketches)
+        if not sketches:
+            raise ValueError("At least one HyperLogLog is required")
+        precision = sketches[0].precision
+        if any(h.precision != precision for h in sketches):
+            raise ValueError("HyperLogLogs must have the same precision")
+        
+        merged = cls(precision)
+        np.maximum.reduce([h.registers for h in sketches], out=merged.registers)
         return merged
     
     def memory_usage_bytes(self) -> int:
@@ -203,7 +459,47 @@ class HyperLogLog:
         
         Each register uses 1 byte (stores values 0-64).
         """
-        return self.num_registers
+        return self.registers.nbytes
+    
+    def to_packed(self) -> np.ndarray:
+        """
+        Pack the registers into 6-bit fields for compact storage.
+        
+        A register never exceeds 64 - p + 1 <= 61, so 6 bits suffice:
+        6m bits instead of 8m (12 KB rather than 16 KB at p = 14). The
+        working registers stay one byte each so add() and count() can
+        index them directly; packing is meant for storage and transfer.
+        
+        Returns:
+            uint8 array of (6m + 7) // 8 bytes, most significant bit first
+        """
+        fields = np.unpackbits(self.registers[:, None], axis=1)[:, 2:]
+        return np.packbits(fields.ravel())
+    
+    @classmethod
+    def from_packed(cls, packed: np.ndarray, precision: int) -> 'HyperLogLog':
+        """
+        Rebuild a HyperLogLog from registers produced by to_packed().
+        
+        Args:
+            packed: 6-bit packed register array
+            precision: Precision the registers were created with
+            
+        Returns:
+            New HyperLogLog with the unpacked registers
+            
+        Raises:
+            ValueError: If the packed array has the wrong length
+        """
+        hll = cls(precision)
+        m = hll.num_registers
+        packed = np.asarray(packed, dtype=np.uint8)
+        if packed.size != (6 * m + 7) // 8:
+            raise ValueError("Packed register array has the wrong length")
+        
+        fields = np.unpackbits(packed)[:6 * m].reshape(m, 6)
+        hll.registers[:] = fields @ np.array([32, 16, 8, 4, 2, 1], dtype=np.uint8)
+        return hll
     
     def relative_error(self) -> float:
         """
@@ -229,6 +525,10 @@ class ExactCounter:
         """Add an item."""
         self.items.add(item)
     
+    def add_many(self, items: Iterable[str]) -> None:
+        """Add a batch of items."""
+        self.items.update(items)
+    
     def count(self) -> int:
         """Return the exact count."""
         return len(self.items)
@@ -270,18 +570,20 @@ def demo():
         hll = HyperLogLog(precision)
         exact = ExactCounter()
         
-        # Add items
-        for i in range(target_size):
-            item = f"item_{i}"
-            hll.add(item)
+        # Add items (batched for the HyperLogLog)
+        items = [f"item_{i}" for i in range(target_size)]
+        hll.add_many(items)
+        for item in items:
             exact.add(item)
         
         hll_estimate = hll.count()
+        flajolet_estimate = hll.count_flajolet()
         exact_count = exact.count()
         error = abs(hll_estimate - exact_count) / exact_count * 100
         
         print(f"  n={target_size:>6}: HLL={hll_estimate:>6}, "
-              f"Exact={exact_count:>6}, Error={error:>5.2f}%")
+              f"Exact={exact_count:>6}, Error={error:>5.2f}% "
+              f"(2007 estimator: {flajolet_estimate})")
     
     print()
     
@@ -330,6 +632,9 @@ def demo():
     merged = hll1.merge(hll2)
     print(f"Merged: unique items 0-7499, estimate = {merged.count()}")
     print(f"Expected: 7500 unique items")
+    swar_ok = np.array_equal(_swar_max_u8(hll1.registers, hll2.registers),
+                             merged.registers)
+    print(f"SWAR (8 registers per uint64) merge matches: {swar_ok}")
     print()
     
     # Memory comparison
@@ -345,6 +650,8 @@ def demo():
     print(f"  HyperLogLog (p=14): {hll_memory:,} bytes ({hll_memory/1024:.1f} KB)")
     print(f"  Exact set estimate: {exact_memory:,} bytes ({exact_memory/1024/1024:.1f} MB)")
     print(f"  Compression ratio: {exact_memory/hll_memory:.0f}:1")
+    packed_memory = HyperLogLog(14).to_packed().nbytes
+    print(f"  6-bit packed registers: {packed_memory:,} bytes ({packed_memory/1024:.1f} KB)")
     print()
     
     print("=" * 60)
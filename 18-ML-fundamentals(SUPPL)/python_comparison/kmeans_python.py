@@ -19,14 +19,173 @@ Usage (for validation only):
 
 Requirements:
     pip install numpy scikit-learn matplotlib
+    pip install numba   (optional: compiles the assignment/update loops)
 
 =============================================================================
 """
 
 import numpy as np
 from typing import List, Tuple, Optional
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import io
+import multiprocessing
+import os
 import time
 
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAVE_NUMBA = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """Fallback decorator: run the kernel as plain Python."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# =============================================================================
+# COMPILED KERNELS (Numba; plain Python loops when Numba is missing)
+# =============================================================================
+#
+# These are the C loops written out literally so that Numba can lower them
+# to machine code: the feature loop vectorises, the sample loop runs in
+# parallel, and squared distances are compared directly (no sqrt needed to
+# find the nearest centroid).
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _assign_kernel(X, centroids, labels):
+    """Write the index of the nearest centroid of each sample into labels."""
+    n_samples, n_features = X.shape
+    k = centroids.shape[0]
+    for i in prange(n_samples):
+        best = 0
+        best_dist = np.inf
+        for c in range(k):
+            d = 0.0
+            for j in range(n_features):
+                diff = X[i, j] - centroids[c, j]
+                d += diff * diff
+            if d < best_dist:
+                best_dist = d
+                best = c
+        labels[i] = best
+
+
+@njit(cache=True)
+def _centroid_sums_kernel(X, labels, sums, counts):
+    """Accumulate per-cluster feature sums and sample counts in one pass."""
+    n_samples, n_features = X.shape
+    for i in range(n_samples):
+        c = labels[i]
+        counts[c] += 1
+        for j in range(n_features):
+            sums[c, j] += X[i, j]
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _inertia_kernel(X, centroids, labels):
+    """Return the sum of squared distances of samples to their centroid."""
+    n_samples, n_features = X.shape
+    total = 0.0
+    for i in prange(n_samples):
+        c = labels[i]
+        d = 0.0
+        for j in range(n_features):
+            diff = X[i, j] - centroids[c, j]
+            d += diff * diff
+        total += d
+    return total
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _update_min_dist_kernel(X, centroid, min_dist_sq):
+    """Lower min_dist_sq[i] to the squared distance of X[i] to centroid."""
+    n_samples, n_features = X.shape
+    for i in prange(n_samples):
+        d = 0.0
+        for j in range(n_features):
+            diff = X[i, j] - centroid[j]
+            d += diff * diff
+        if d < min_dist_sq[i]:
+            min_dist_sq[i] = d
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _hamerly_assign_kernel(X, centroids, half_separation, labels, upper, lower, full):
+    """
+    Hamerly assignment: skip samples whose bounds prove the label is unchanged.
+    
+    upper[i] bounds the distance to the assigned centroid from above and
+    lower[i] the distance to every other centroid from below. Only the
+    samples that fail the test pay for a full scan over all k centroids.
+    """
+    n_samples, n_features = X.shape
+    k = centroids.shape[0]
+    for i in prange(n_samples):
+        if not full:
+            a = labels[i]
+            bound = max(half_separation[a], lower[i])
+            if upper[i] <= bound:
+                continue
+            # Tighten the upper bound to the exact distance and retest
+            d = 0.0
+            for j in range(n_features):
+                diff = X[i, j] - centroids[a, j]
+                d += diff * diff
+            upper[i] = np.sqrt(d)
+            if upper[i] <= bound:
+                continue
+        
+        best = 0
+        best_dist = np.inf
+        second_dist = np.inf
+        for c in range(k):
+            d = 0.0
+            for j in range(n_features):
+                diff = X[i, j] - centroids[c, j]
+                d += diff * diff
+            if d < best_dist:
+                second_dist = best_dist
+                best_dist = d
+                best = c
+            elif d < second_dist:
+                second_dist = d
+        labels[i] = best
+        upper[i] = np.sqrt(best_dist)
+        lower[i] = np.sqrt(second_dist)
+
+
+def _squared_distances(X: np.ndarray, centroids: np.ndarray,
+                       x_sq: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    All sample-to-centroid squared distances as one matrix product.
+    
+    Uses ||x - c||² = ||x||² - 2·x·c + ||c||², so the O(n·k·d) work is a
+    single X @ Cᵀ call that NumPy hands to BLAS (dgemm). Used when Numba
+    is not available.
+    
+    Args:
+        X: Samples (n × d)
+        centroids: Centroids (k × d)
+        x_sq: Precomputed row norms ||x||² of X, if already known
+    
+    Returns:
+        n × k matrix of squared distances (clipped at 0 against rounding)
+    """
+    if x_sq is None:
+        x_sq = np.einsum('ij,ij->i', X, X)
+    c_sq = np.einsum('ij,ij->i', centroids, centroids)
+    D = X @ centroids.T
+    D *= -2.0
+    D += x_sq[:, None]
+    D += c_sq[None, :]
+    np.maximum(D, 0.0, out=D)
+    return D
+
 
 # =============================================================================
 # PART 1: MANUAL K-MEANS IMPLEMENTATION (matches C logic)
@@ -46,10 +205,13 @@ class KMeansManual:
         centroids: Final cluster centroids (k × d array)
         labels: Cluster assignment for each sample
         inertia: Within-cluster sum of squares (WCSS)
+        dtype: Floating-point type used for samples and centroids
+        algorithm: Assignment strategy ('hamerly' or 'lloyd')
     """
     
     def __init__(self, k: int = 3, max_iterations: int = 100, 
-                 tolerance: float = 1e-4, random_state: Optional[int] = None):
+                 tolerance: float = 1e-4, random_state: Optional[int] = None,
+                 dtype: type = np.float64, algorithm: str = 'hamerly'):
         """
         Initialise K-Means parameters.
         
@@ -58,31 +220,54 @@ class KMeansManual:
             max_iterations: Maximum iterations for convergence
             tolerance: Minimum centroid movement to continue
             random_state: Seed for reproducibility
+            dtype: np.float64 (default, matches the C doubles) or np.float32,
+                   which halves the memory traffic of every pass over X;
+                   sums and inertia are still accumulated in float64
+            algorithm: 'hamerly' (default) skips samples whose distance
+                       bounds prove their cluster cannot change; 'lloyd'
+                       rescans all k centroids for every sample each
+                       iteration, like the C version. Both give the same
+                       clustering.
+        
+        Raises:
+            ValueError: If algorithm is not 'hamerly' or 'lloyd'
         """
+        if algorithm not in ('hamerly', 'lloyd'):
+            raise ValueError("algorithm must be 'hamerly' or 'lloyd'")
         self.k = k
         self.max_iterations = max_iterations
         self.tolerance = tolerance
         self.random_state = random_state
+        self.dtype = np.dtype(dtype)
+        self.algorithm = algorithm
         self.centroids = None
         self.labels = None
         self.inertia = None
         self.n_iterations = 0
+        # Private generator (PCG64), created once; the global np.random
+        # state is never touched, so instances can be fitted concurrently
+        self._rng = np.random.default_rng(random_state)
     
-    def _euclidean_distance(self, a: np.ndarray, b: np.ndarray) -> float:
+    def _euclidean_sq(self, a: np.ndarray, b: np.ndarray) -> float:
         """
-        Compute Euclidean distance between two points.
+        Compute the squared Euclidean distance between two points.
+        
+        sqrt is monotone, so finding the nearest centroid, weighting
+        k-means++ by D² and summing the inertia all work on squared
+        distances; the root is only taken where a true distance is needed.
         
         Equivalent C function:
-            double euclidean_distance(double *a, double *b, int dim) {
+            double euclidean_sq(double *a, double *b, int dim) {
                 double sum = 0.0;
                 for (int i = 0; i < dim; i++) {
                     double diff = a[i] - b[i];
                     sum += diff * diff;
                 }
-                return sqrt(sum);
+                return sum;
             }
         """
-        return np.sqrt(np.sum((a - b) ** 2))
+        diff = a - b
+        return float(np.dot(diff, diff))
     
     def _init_random(self, X: np.ndarray) -> np.ndarray:
         """
@@ -94,11 +279,11 @@ class KMeansManual:
                 memcpy(centroids[i], data[idx], dim * sizeof(double));
             }
         """
-        np.random.seed(self.random_state)
-        indices = np.random.choice(X.shape[0], self.k, replace=False)
+        indices = self._rng.choice(X.shape[0], self.k, replace=False)
         return X[indices].copy()
     
-    def _init_kmeans_plusplus(self, X: np.ndarray) -> np.ndarray:
+    def _init_kmeans_plusplus(self, X: np.ndarray,
+                              n_local_trials: int = 1) -> np.ndarray:
         """
         K-Means++ initialisation for better convergence.
         
@@ -111,6 +296,11 @@ class KMeansManual:
         
         This dramatically improves convergence speed and quality.
         
+        With n_local_trials > 1 this is the greedy variant used by
+        scikit-learn: each step draws several candidates from the D²
+        distribution and keeps the one that leaves the smallest total
+        D², which usually means fewer Lloyd iterations afterwards.
+        
         Equivalent C (simplified):
             // First centroid: random
             int idx = rand() % n;
@@ -144,36 +334,65 @@ class KMeansManual:
                 free(distances);
             }
         """
-        np.random.seed(self.random_state)
         n_samples, n_features = X.shape
-        centroids = np.zeros((self.k, n_features))
+        centroids = np.zeros((self.k, n_features), dtype=self.dtype)
         
         # First centroid: random sample
-        idx = np.random.randint(n_samples)
+        idx = self._rng.integers(n_samples)
         centroids[0] = X[idx].copy()
         
         # Subsequent centroids: proportional to D²
+        # D² only changes by the centroid placed last, so it is updated
+        # incrementally instead of re-scanning all c centroids.
+        X = np.ascontiguousarray(X, dtype=self.dtype)
+        # Differences are taken directly rather than through the BLAS
+        # identity so that samples already chosen get exactly D² = 0 and
+        # cannot be drawn twice.
+        def fold_in(distances_sq, centroid):
+            """Lower D² in place by the distances to one new centroid."""
+            if HAVE_NUMBA:
+                _update_min_dist_kernel(X, centroid, distances_sq)
+            else:
+                diff = X - centroid
+                np.minimum(distances_sq, np.einsum('ij,ij->i', diff, diff),
+                           out=distances_sq)
+        
+        # Squared distance to nearest centroid
+        distances_sq = np.full(n_samples, np.inf)
+        fold_in(distances_sq, centroids[0])
+        
         for c in range(1, self.k):
-            # Compute squared distances to nearest centroid
-            distances_sq = np.zeros(n_samples)
-            for i in range(n_samples):
-                min_dist = float('inf')
-                for j in range(c):
-                    dist = self._euclidean_distance(X[i], centroids[j])
-                    if dist < min_dist:
-                        min_dist = dist
-                distances_sq[i] = min_dist ** 2
+            # Roulette wheel selection, as in the C version: uniform
+            # draws located in the running sum of D² by binary search
+            # (side='right' never lands on a sample with D² = 0)
+            cumulative = np.cumsum(distances_sq)
+            if n_local_trials == 1:
+                r = self._rng.random() * cumulative[-1]
+            else:
+                r = self._rng.random(n_local_trials) * cumulative[-1]
+            candidates = np.minimum(np.searchsorted(cumulative, r, side='right'),
+                                    n_samples - 1)
             
-            # Normalise to probabilities
-            probabilities = distances_sq / distances_sq.sum()
+            if n_local_trials == 1:
+                idx = int(candidates)
+                fold_in(distances_sq, X[idx])
+            else:
+                # Greedy step: keep the candidate with the smallest total D²
+                best_total = np.inf
+                for cand in candidates:
+                    trial_sq = distances_sq.copy()
+                    fold_in(trial_sq, X[cand])
+                    total = trial_sq.sum()
+                    if total < best_total:
+                        best_total, idx, best_sq = total, int(cand), trial_sq
+                distances_sq = best_sq
             
-            # Sample new centroid
-            idx = np.random.choice(n_samples, p=probabilities)
             centroids[c] = X[idx].copy()
         
         return centroids
     
-    def _assign_clusters(self, X: np.ndarray) -> np.ndarray:
+    def _assign_clusters(self, X: np.ndarray,
+                         x_sq: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Assign each sample to nearest centroid.
         
@@ -191,23 +410,74 @@ class KMeansManual:
                 }
                 assignments[i] = best_cluster;
             }
-        """
-        labels = np.zeros(X.shape[0], dtype=int)
         
-        for i in range(X.shape[0]):
-            min_dist = float('inf')
-            best_cluster = 0
-            
-            for c in range(self.k):
-                dist = self._euclidean_distance(X[i], self.centroids[c])
-                if dist < min_dist:
-                    min_dist = dist
-                    best_cluster = c
-            
-            labels[i] = best_cluster
+        Without Numba the whole double loop is one BLAS matrix product
+        (see _squared_distances); x_sq lets fit() reuse ||x||² across
+        iterations.
+        """
+        X = np.ascontiguousarray(X, dtype=self.dtype)
+        centroids = np.ascontiguousarray(self.centroids, dtype=self.dtype)
+        if not HAVE_NUMBA:
+            D = _squared_distances(X, centroids, x_sq)
+            return np.argmin(D, axis=1)
         
+        labels = np.zeros(X.shape[0], dtype=np.int64)
+        _assign_kernel(X, centroids, labels)
         return labels
     
+    def _assign_clusters_bounded(self, X: np.ndarray, labels: np.ndarray,
+                                 upper: np.ndarray, lower: np.ndarray,
+                                 full: bool = False,
+                                 x_sq: Optional[np.ndarray] = None) -> None:
+        """
+        Assignment step with Hamerly's triangle-inequality bounds.
+        
+        Gives the same labels as _assign_clusters, but a sample whose
+        upper bound to its own centroid is below both half the distance
+        from that centroid to its nearest other centroid and the lower
+        bound to every other centroid cannot change cluster, so no
+        distances are evaluated for it. Once the clusters settle, most
+        samples are skipped in each iteration.
+        
+        Args:
+            X: Training data (n_samples × n_features)
+            labels: Current assignments, updated in place
+            upper: Upper bound on distance to the assigned centroid (in place)
+            lower: Lower bound on distance to any other centroid (in place)
+            full: Ignore the bounds and rescan every sample (first iteration)
+            x_sq: Precomputed ||x||² for the BLAS path
+        """
+        centroids = np.ascontiguousarray(self.centroids, dtype=self.dtype)
+        diff = centroids[:, None, :] - centroids[None, :, :]
+        separation = np.sqrt(np.einsum('ijk,ijk->ij', diff, diff, dtype=np.float64))
+        np.fill_diagonal(separation, np.inf)
+        half_separation = 0.5 * separation.min(axis=1)
+        
+        if HAVE_NUMBA:
+            _hamerly_assign_kernel(X, centroids, half_separation,
+                                   labels, upper, lower, full)
+            return
+        
+        if full:
+            rescan = np.arange(X.shape[0])
+        else:
+            bound = np.maximum(half_separation[labels], lower)
+            rescan = np.flatnonzero(upper > bound)
+            diff = X[rescan] - centroids[labels[rescan]]
+            upper[rescan] = np.sqrt(np.einsum('ij,ij->i', diff, diff, dtype=np.float64))
+            rescan = rescan[upper[rescan] > bound[rescan]]
+            if rescan.size == 0:
+                return
+        
+        D = _squared_distances(X[rescan], centroids,
+                               None if x_sq is None else x_sq[rescan])
+        best = np.argmin(D, axis=1)
+        rows = np.arange(rescan.size)
+        labels[rescan] = best
+        upper[rescan] = np.sqrt(D[rows, best])
+        D[rows, best] = np.inf
+        lower[rescan] = np.sqrt(D.min(axis=1))
+    
     def _update_centroids(self, X: np.ndarray, labels: np.ndarray) -> np.ndarray:
         """
         Update centroids as mean of assigned samples.
@@ -240,18 +510,32 @@ class KMeansManual:
                 }
             }
         """
-        new_centroids = np.zeros_like(self.centroids)
+        new_centroids = np.zeros_like(self.centroids, dtype=np.float64)
+        if HAVE_NUMBA:
+            counts = np.zeros(self.k, dtype=np.int64)
+            _centroid_sums_kernel(np.ascontiguousarray(X, dtype=self.dtype),
+                                  labels, new_centroids, counts)
+        else:
+            # Weighted bincount per feature: one pass each, much cheaper
+            # than np.add.at's unbuffered scatter
+            for j in range(X.shape[1]):
+                new_centroids[:, j] = np.bincount(labels, weights=X[:, j],
+                                                  minlength=self.k)
+            counts = np.bincount(labels, minlength=self.k)
         
-        for c in range(self.k):
-            cluster_mask = labels == c
-            if np.sum(cluster_mask) > 0:
-                new_centroids[c] = X[cluster_mask].mean(axis=0)
-            else:
-                # Reinitialise empty cluster with random sample
-                idx = np.random.randint(X.shape[0])
-                new_centroids[c] = X[idx].copy()
+        nonempty = counts > 0
+        new_centroids[nonempty] /= counts[nonempty, None]
         
-        return new_centroids
+        empty = np.flatnonzero(~nonempty)
+        if empty.size:
+            # Reinitialise empty clusters with the samples farthest from
+            # their current centroid (the worst-fitted points), one each
+            diff = X - self.centroids[labels]
+            spread = np.einsum('ij,ij->i', diff, diff)
+            farthest = np.argsort(spread)[::-1][:empty.size]
+            new_centroids[empty] = X[farthest]
+        
+        return new_centroids.astype(self.dtype, copy=False)
     
     def _compute_inertia(self, X: np.ndarray, labels: np.ndarray) -> float:
         """
@@ -270,14 +554,15 @@ class KMeansManual:
             }
             return inertia;
         """
-        inertia = 0.0
-        for i in range(X.shape[0]):
-            c = labels[i]
-            dist = self._euclidean_distance(X[i], self.centroids[c])
-            inertia += dist ** 2
-        return inertia
-    
-    def fit(self, X: np.ndarray, init: str = 'kmeans++') -> 'KMeansManual':
+        if not HAVE_NUMBA:
+            diff = X - self.centroids[labels]
+            return float(np.einsum('ij,ij->', diff, diff, dtype=np.float64))
+        return float(_inertia_kernel(np.ascontiguousarray(X, dtype=self.dtype),
+                                     np.ascontiguousarray(self.centroids, dtype=self.dtype),
+                                     labels))
+    
+    def fit(self, X: np.ndarray, init: str = 'kmeans++',
+            x_sq: Optional[np.ndarray] = None) -> 'KMeansManual':
         """
         Fit K-Means to data using Lloyd's algorithm.
         
@@ -290,33 +575,58 @@ class KMeansManual:
         
         Args:
             X: Training data (n_samples × n_features)
-            init: Initialisation method ('random' or 'kmeans++')
+            init: Initialisation method ('random', 'kmeans++', or
+                  'greedy-kmeans++' with 2 + ln(k) candidates per step)
+            x_sq: Precomputed row norms ||x||² of X, so that repeated
+                  fits on the same data (e.g. elbow_analysis) skip that
+                  pass; only used by the BLAS path
         
         Returns:
             self: Fitted model
         """
+        X = np.ascontiguousarray(X, dtype=self.dtype)
+        
         # Initialisation
         if init == 'kmeans++':
             self.centroids = self._init_kmeans_plusplus(X)
+        elif init == 'greedy-kmeans++':
+            n_local_trials = 2 + int(np.log(self.k))
+            self.centroids = self._init_kmeans_plusplus(X, n_local_trials)
         else:
             self.centroids = self._init_random(X)
         
         print(f"K-Means Training (k={self.k}, init={init})")
         print("=" * 50)
         
+        # ||x||² does not change between iterations
+        if HAVE_NUMBA:
+            x_sq = None
+        elif x_sq is None:
+            x_sq = np.einsum('ij,ij->i', X, X)
+        
+        # Hamerly bounds, carried across iterations
+        self.labels = np.zeros(X.shape[0], dtype=np.int64)
+        upper = np.full(X.shape[0], np.inf)
+        lower = np.zeros(X.shape[0])
+        
         # Lloyd's iterations
         for iteration in range(self.max_iterations):
             # Assignment step
-            self.labels = self._assign_clusters(X)
+            full = iteration == 0 or self.algorithm == 'lloyd'
+            self._assign_clusters_bounded(X, self.labels, upper, lower,
+                                          full=full, x_sq=x_sq)
             
             # Update step
             new_centroids = self._update_centroids(X, self.labels)
             
-            # Check convergence
-            centroid_shift = 0.0
-            for c in range(self.k):
-                shift = self._euclidean_distance(self.centroids[c], new_centroids[c])
-                centroid_shift = max(centroid_shift, shift)
+            # Check convergence (largest centroid movement; one sqrt at the end)
+            moves = self.centroids - new_centroids
+            move_dist = np.sqrt(np.einsum('ij,ij->i', moves, moves, dtype=np.float64))
+            centroid_shift = float(move_dist.max())
+            
+            # Centroids moved: loosen the bounds by the distance travelled
+            upper += move_dist[self.labels]
+            lower -= centroid_shift
             
             self.centroids = new_centroids
             self.inertia = self._compute_inertia(X, self.labels)
@@ -352,8 +662,24 @@ class KMeansManual:
 # PART 2: ELBOW METHOD FOR K SELECTION
 # =============================================================================
 
+def _elbow_fit(X: np.ndarray, k: int, random_state: int,
+               x_sq: Optional[np.ndarray]) -> Tuple[float, str]:
+    """
+    Fit one k of the elbow sweep in a worker process.
+    
+    The training log is captured and returned rather than printed, so
+    the parent can print the logs of concurrent fits in k order.
+    """
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        kmeans = KMeansManual(k=k, max_iterations=100, random_state=random_state)
+        kmeans.fit(X, init='kmeans++', x_sq=x_sq)
+    return kmeans.inertia, log.getvalue()
+
+
 def elbow_analysis(X: np.ndarray, k_range: range = range(1, 11),
-                   random_state: int = 42) -> Tuple[List[int], List[float]]:
+                   random_state: int = 42,
+                   n_jobs: Optional[int] = None) -> Tuple[List[int], List[float]]:
     """
     Perform elbow analysis to select optimal k.
     
@@ -371,6 +697,9 @@ def elbow_analysis(X: np.ndarray, k_range: range = range(1, 11),
         X: Training data
         k_range: Range of k values to test
         random_state: Random seed for reproducibility
+        n_jobs: Worker processes for the independent fits (-1 = one per
+                CPU, None or 1 = sequential). Results and output are the
+                same either way.
     
     Returns:
         k_values: List of k values tested
@@ -383,9 +712,32 @@ def elbow_analysis(X: np.ndarray, k_range: range = range(1, 11),
     k_values = list(k_range)
     inertias = []
     
+    # Same data for every k: convert it and take ||x||² only once
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    x_sq = None if HAVE_NUMBA else np.einsum('ij,ij->i', X, X)
+    
+    if n_jobs is not None and n_jobs < 0:
+        n_jobs = os.cpu_count() or 1
+    n_workers = min(n_jobs or 1, len(k_values))
+    
+    if n_workers > 1:
+        # Each k is an independent fit: run them side by side. Workers
+        # are spawned, not forked, as forking after Numba's thread pool
+        # has started can deadlock.
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=n_workers, mp_context=context) as pool:
+            results = list(pool.map(_elbow_fit, [X] * len(k_values), k_values,
+                                    [random_state] * len(k_values),
+                                    [x_sq] * len(k_values)))
+        for k, (inertia, log) in zip(k_values, results):
+            print(log, end='')
+            inertias.append(inertia)
+            print(f"k={k}: Inertia = {inertia:.4f}")
+        return k_values, inertias
+    
     for k in k_values:
         kmeans = KMeansManual(k=k, max_iterations=100, random_state=random_state)
-        kmeans.fit(X, init='kmeans++')
+        kmeans.fit(X, init='kmeans++', x_sq=x_sq)
         inertias.append(kmeans.inertia)
         print(f"k={k}: Inertia = {kmeans.inertia:.4f}")
     
@@ -473,42 +825,55 @@ def silhouette_coefficient(X: np.ndarray, labels: np.ndarray) -> float:
     if len(unique_labels) <= 1:
         return 0.0  # Need at least 2 clusters
     
-    silhouettes = []
-    
-    for i in range(n):
-        own_cluster = labels[i]
+    # Pairwise distances are formed one block of rows at a time via
+    # ||x||² - 2·x·y + ||y||² (a BLAS matrix product), then reduced per
+    # cluster with a product against the one-hot label matrix, so memory
+    # stays at block_size × n instead of n × n.
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    cluster_index = np.searchsorted(unique_labels, labels)
+    n_clusters = len(unique_labels)
+    onehot = np.zeros((n, n_clusters))
+    onehot[np.arange(n), cluster_index] = 1.0
+    cluster_sizes = onehot.sum(axis=0)
+    x_sq = np.einsum('ij,ij->i', X, X)
+    
+    silhouettes = np.empty(n)
+    block_size = 1024
+    
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        rows = np.arange(start, stop)
+        own = cluster_index[start:stop]
         
-        # a(i): mean distance to samples in same cluster
-        same_cluster_mask = labels == own_cluster
-        same_cluster_mask[i] = False  # Exclude self
+        D = X[start:stop] @ X.T
+        D *= -2.0
+        D += x_sq[start:stop, None]
+        D += x_sq[None, :]
+        np.maximum(D, 0.0, out=D)
+        np.sqrt(D, out=D)
+        D[rows - start, rows] = 0.0  # exact zero distance to self
         
-        if np.sum(same_cluster_mask) == 0:
-            a_i = 0.0
-        else:
-            a_i = np.mean([np.sqrt(np.sum((X[i] - X[j])**2)) 
-                          for j in range(n) if same_cluster_mask[j]])
+        # Sum of distances from each sample to every cluster
+        cluster_dist = D @ onehot
+        
+        # a(i): mean distance to samples in same cluster (self excluded)
+        own_size = cluster_sizes[own] - 1
+        own_sum = cluster_dist[rows - start, own]
+        a = np.divide(own_sum, own_size, out=np.zeros_like(own_sum),
+                      where=own_size > 0)
         
         # b(i): minimum mean distance to other clusters
-        b_i = float('inf')
-        for cluster in unique_labels:
-            if cluster == own_cluster:
-                continue
-            
-            other_mask = labels == cluster
-            if np.sum(other_mask) > 0:
-                mean_dist = np.mean([np.sqrt(np.sum((X[i] - X[j])**2))
-                                    for j in range(n) if other_mask[j]])
-                b_i = min(b_i, mean_dist)
-        
-        # Silhouette for sample i
-        if max(a_i, b_i) == 0:
-            s_i = 0.0
-        else:
-            s_i = (b_i - a_i) / max(a_i, b_i)
+        mean_dist = cluster_dist / cluster_sizes
+        mean_dist[rows - start, own] = np.inf
+        b = mean_dist.min(axis=1)
         
-        silhouettes.append(s_i)
+        # Silhouette for each sample in the block
+        denom = np.maximum(a, b)
+        silhouettes[start:stop] = np.divide(b - a, denom,
+                                            out=np.zeros_like(denom),
+                                            where=denom > 0)
     
-    return np.mean(silhouettes)
+    return float(np.mean(silhouettes))
 
 
 # =============================================================================
@@ -589,24 +954,21 @@ def generate_clustered_data(n_samples: int = 300, n_features: int = 2,
             }
         }
     """
-    np.random.seed(random_state)
-    
-    samples_per_cluster = n_samples // n_clusters
-    X = np.zeros((n_samples, n_features))
-    y = np.zeros(n_samples, dtype=int)
+    rng = np.random.default_rng(random_state)
     
     # Generate cluster centres
-    centres = np.random.uniform(-10, 10, (n_clusters, n_features))
+    centres = rng.uniform(-10, 10, (n_clusters, n_features))
     
-    idx = 0
-    for c in range(n_clusters):
-        n = samples_per_cluster if c < n_clusters - 1 else n_samples - idx
-        X[idx:idx+n] = centres[c] + np.random.normal(0, cluster_std, (n, n_features))
-        y[idx:idx+n] = c
-        idx += n
+    # Cluster of every sample (the last cluster takes the remainder)
+    samples_per_cluster = n_samples // n_clusters
+    y = np.minimum(np.arange(n_samples) // max(samples_per_cluster, 1),
+                   n_clusters - 1)
+    
+    # All Gaussian noise in one draw, added to each sample's centre
+    X = centres[y] + cluster_std * rng.standard_normal((n_samples, n_features))
     
     # Shuffle
-    perm = np.random.permutation(n_samples)
+    perm = rng.permutation(n_samples)
     return X[perm], y[perm]
 
 
@@ -708,11 +1070,23 @@ def main():
     km_pp = KMeansManual(k=3, max_iterations=100, random_state=42)
     km_pp.fit(X_iris, init='kmeans++')
     
+    print("\nGreedy K-Means++ Initialisation:")
+    km_greedy = KMeansManual(k=3, max_iterations=100, random_state=42)
+    km_greedy.fit(X_iris, init='greedy-kmeans++')
+    
+    print("\nK-Means++ Initialisation (float32):")
+    km_f32 = KMeansManual(k=3, max_iterations=100, random_state=42, dtype=np.float32)
+    km_f32.fit(X_iris, init='kmeans++')
+    
     print(f"\nComparison:")
     print(f"  Random:    Inertia = {km_random.inertia:.4f}, "
           f"Iterations = {km_random.n_iterations}")
     print(f"  K-Means++: Inertia = {km_pp.inertia:.4f}, "
           f"Iterations = {km_pp.n_iterations}")
+    print(f"  Greedy:    Inertia = {km_greedy.inertia:.4f}, "
+          f"Iterations = {km_greedy.n_iterations}")
+    print(f"  float32:   Inertia = {km_f32.inertia:.4f}, "
+          f"Iterations = {km_f32.n_iterations}")
     
     print("\n╔" + "═" * 62 + "╗")
     print("║                 DEMONSTRATION COMPLETE                       ║")
@@ -16,8 +16,9 @@ Usage:
 
 Dependencies:
     - numpy
-    - pandas (optional, for CSV loading)
+    - pandas (optional, faster CSV loading)
     - scikit-learn (optional, for comparison)
+    - numba (optional, compiles the gradient descent step)
 
 ==============================================================================
 """
@@ -25,15 +26,73 @@ Dependencies:
 import numpy as np
 import sys
 
+try:
+    import pandas as pd
+    HAVE_PANDAS = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAVE_PANDAS = False
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAVE_NUMBA = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """Fallback decorator: run the kernel as plain Python."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _gd_step(X, y, w, b, lr, residual):
+    """
+    One fused gradient descent step; updates w in place.
+    
+    Prediction, residual, loss and the bias gradient come from a single
+    pass over the samples, the weight gradient from one more, with no
+    temporaries besides the residual buffer.
+    
+    Returns:
+        (loss before the update, updated bias)
+    """
+    n_samples, n_features = X.shape
+    loss = 0.0
+    db = 0.0
+    for i in prange(n_samples):
+        r = b - y[i]
+        for j in range(n_features):
+            r += X[i, j] * w[j]
+        residual[i] = r
+        loss += r * r
+        db += r
+    
+    scale = 2.0 / n_samples
+    for j in range(n_features):
+        g = 0.0
+        for i in prange(n_samples):
+            g += X[i, j] * residual[i]
+        w[j] -= lr * scale * g
+    
+    return loss / n_samples, b - lr * scale * db
+
 
 def load_housing_data(filename='data/housing.csv'):
     """
     Load housing data from CSV file.
     
     Expected format: square_feet,bedrooms,age,price
+    
+    Parsing is done in C by pandas when it is installed, otherwise by
+    np.loadtxt.
     """
     try:
-        data = np.genfromtxt(filename, delimiter=',', skip_header=1)
+        if HAVE_PANDAS:
+            data = pd.read_csv(filename).to_numpy(dtype=np.float64)
+        else:
+            data = np.loadtxt(filename, delimiter=',', skiprows=1, ndmin=2)
         X = data[:, :-1]  # Features
         y = data[:, -1]   # Target (price)
         return X, y
@@ -45,19 +104,19 @@ def load_housing_data(filename='data/housing.csv'):
 
 def generate_synthetic_data(n_samples=100):
     """Generate synthetic housing data."""
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     
     # Features: square_feet, bedrooms, age
-    square_feet = np.random.uniform(800, 3000, n_samples)
-    bedrooms = np.random.randint(1, 6, n_samples)
-    age = np.random.randint(0, 50, n_samples)
+    square_feet = rng.uniform(800, 3000, n_samples)
+    bedrooms = rng.integers(1, 6, n_samples)
+    age = rng.integers(0, 50, n_samples)
     
     # Target: price = 50*sqft + 10000*bedrooms - 1000*age + 100000 + noise
     price = (50 * square_feet + 
              10000 * bedrooms - 
              1000 * age + 
              100000 + 
-             np.random.normal(0, 15000, n_samples))
+             rng.normal(0, 15000, n_samples))
     
     X = np.column_stack([square_feet, bedrooms, age])
     return X, price
@@ -91,13 +150,18 @@ class LinearRegressionScratch:
     """
     Linear Regression implemented from scratch using NumPy.
     
-    This implementation uses gradient descent optimisation.
+    This implementation uses gradient descent optimisation by default;
+    method='normal' solves the least-squares problem in closed form.
     """
     
-    def __init__(self, learning_rate=0.01, n_iterations=1000, verbose=False):
+    def __init__(self, learning_rate=0.01, n_iterations=1000, verbose=False,
+                 method='gd'):
+        if method not in ('gd', 'normal'):
+            raise ValueError("method must be 'gd' or 'normal'")
         self.learning_rate = learning_rate
         self.n_iterations = n_iterations
         self.verbose = verbose
+        self.method = method
         self.weights = None
         self.bias = None
         self.loss_history = []
@@ -115,29 +179,54 @@ class LinearRegressionScratch:
                   ∂L/∂b = (2/n) × Σ(y_pred - y)
                c. Update: w = w - lr × ∂L/∂w
                          b = b - lr × ∂L/∂b
+        
+        With method='normal' the minimiser of the MSE is computed
+        directly, w = (XᵀX)⁻¹Xᵀy on X augmented with a column of ones,
+        using one LAPACK least-squares call (np.linalg.lstsq, SVD based,
+        so it also copes with collinear features). loss_history then
+        holds only the final loss.
         """
         n_samples, n_features = X.shape
         
+        if self.method == 'normal':
+            X_aug = np.hstack([X, np.ones((n_samples, 1))])
+            w_full, *_ = np.linalg.lstsq(X_aug, y, rcond=None)
+            self.weights = w_full[:-1]
+            self.bias = float(w_full[-1])
+            self.loss_history = [float(np.mean((X_aug @ w_full - y) ** 2))]
+            return self
+        
         # Initialise parameters
         self.weights = np.zeros(n_features)
         self.bias = 0.0
         self.loss_history = []
         
+        if HAVE_NUMBA:
+            X = np.ascontiguousarray(X, dtype=np.float64)
+            y = np.ascontiguousarray(y, dtype=np.float64)
+            residual = np.empty(n_samples)
+        
         for i in range(self.n_iterations):
-            # Forward pass
-            y_pred = np.dot(X, self.weights) + self.bias
-            
-            # Compute loss (MSE)
-            loss = np.mean((y_pred - y) ** 2)
-            self.loss_history.append(loss)
-            
-            # Compute gradients
-            dw = (2 / n_samples) * np.dot(X.T, (y_pred - y))
-            db = (2 / n_samples) * np.sum(y_pred - y)
-            
-            # Update parameters
-            self.weights -= self.learning_rate * dw
-            self.bias -= self.learning_rate * db
+            if HAVE_NUMBA:
+                # Forward pass, loss, gradients and update in one kernel
+                loss, self.bias = _gd_step(X, y, self.weights, self.bias,
+                                           self.learning_rate, residual)
+                self.loss_history.append(loss)
+            else:
+                # Forward pass
+                y_pred = np.dot(X, self.weights) + self.bias
+                
+                # Compute loss (MSE)
+                loss = np.mean((y_pred - y) ** 2)
+                self.loss_history.append(loss)
+                
+                # Compute gradients
+                dw = (2 / n_samples) * np.dot(X.T, (y_pred - y))
+                db = (2 / n_samples) * np.sum(y_pred - y)
+                
+                # Update parameters
+                self.weights -= self.learning_rate * dw
+                self.bias -= self.learning_rate * db
             
             if self.verbose and i % 100 == 0:
                 print(f"Iteration {i}: Loss = {loss:.4f}")
@@ -175,11 +264,11 @@ def rmse(y_true, y_pred):
 
 def train_test_split(X, y, test_ratio=0.2, random_state=42):
     """Split data into training and testing sets."""
-    np.random.seed(random_state)
+    rng = np.random.default_rng(random_state)
     n_samples = len(y)
     n_test = int(n_samples * test_ratio)
     
-    indices = np.random.permutation(n_samples)
+    indices = rng.permutation(n_samples)
     test_idx = indices[:n_test]
     train_idx = indices[n_test:]
     
@@ -246,6 +335,16 @@ def main():
     print(f"R² Score:      {model.score(X_test_norm, y_test):.4f}")
     print()
     
+    # Closed-form solution (no iterations)
+    closed = LinearRegressionScratch(method='normal').fit(X_train_norm, y_train)
+    print("Closed-form (normal equation / lstsq):")
+    print("-" * 50)
+    print(f"  Weights: {closed.weights}")
+    print(f"  Bias:    {closed.bias:.2f}")
+    print(f"Test MSE:      {mse(y_test, closed.predict(X_test_norm)):,.2f}")
+    print(f"R² Score:      {closed.score(X_test_norm, y_test):.4f}")
+    print()
+    
     # Compare with scikit-learn (if available)
     try:
         from sklearn.linear_model import LinearRegression as SklearnLR
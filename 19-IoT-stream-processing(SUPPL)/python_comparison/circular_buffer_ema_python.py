@@ -12,26 +12,41 @@ Author: ATP Course - ASE-CSIE Bucharest
 =============================================================================
 """
 
-from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Sequence
 import numpy as np
 
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAVE_NUMBA = False
+    
+    def njit(*args, **kwargs):
+        """Fallback decorator: run the kernel as plain Python."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
 # =============================================================================
 # PART 1: CIRCULAR BUFFER
 # =============================================================================
 
 class CircularBuffer:
     """
-    Circular buffer (ring buffer) implementation using collections.deque.
+    Circular buffer (ring buffer) backed by a fixed-size NumPy array.
     
-    Python's deque with maxlen handles wraparound automatically,
-    unlike C where we must manually compute (head + 1) % capacity.
+    As in C, values live in one contiguous block of doubles and the
+    write position wraps with (head + 1) % capacity; count tracks how
+    many slots are filled. Unlike a deque of boxed Python floats this
+    costs 8 bytes per value and any O(n) statistic is a single pass
+    over contiguous memory.
     
     Time Complexity:
         - push: O(1)
         - mean: O(1) with cached sum, O(n) without
-        - variance: O(n)
+        - variance: O(1) with Welford's running M2, O(n) without
     
     Space Complexity: O(n) where n = capacity
     """
@@ -42,22 +57,51 @@ class CircularBuffer:
         
         Args:
             capacity: Maximum number of elements
+            
+        Raises:
+            ValueError: If capacity is not positive
         """
-        self.data = deque(maxlen=capacity)
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        
+        self.data = np.empty(capacity, dtype=np.float64)
+        self.head = 0          # Next slot to write (oldest value once full)
+        self._count = 0
         self.cached_sum = 0.0  # Maintain running sum for O(1) mean
+        # Welford state for O(1) variance: running mean and sum of
+        # squared deviations (M2) of the values in the window
+        self._w_mean = 0.0
+        self._m2 = 0.0
     
     def push(self, value: float) -> None:
         """
-        Add value to buffer. If full, oldest value is removed automatically.
+        Add value to buffer. If full, oldest value is overwritten.
         
         Args:
             value: Value to add
         """
-        if len(self.data) == self.data.maxlen:
-            # Buffer is full - subtract the value that will be removed
-            self.cached_sum -= self.data[0]
+        value = float(value)
+        n = self._count
+        if n == self.capacity:
+            # Buffer is full - subtract the value about to be overwritten
+            old = float(self.data[self.head])
+            self.cached_sum -= old
+            
+            # Sliding Welford: replace old by value, window size unchanged
+            old_mean = self._w_mean
+            self._w_mean += (value - old) / n
+            self._m2 += (value - old) * (value - self._w_mean + old - old_mean)
+            if self._m2 < 0.0:
+                self._m2 = 0.0  # guard against round-off
+        else:
+            # Welford's incremental update for a growing window
+            delta = value - self._w_mean
+            self._w_mean += delta / (n + 1)
+            self._m2 += delta * (value - self._w_mean)
+            self._count = n + 1
         
-        self.data.append(value)
+        self.data[self.head] = value
+        self.head = (self.head + 1) % self.capacity
         self.cached_sum += value
     
     def mean(self) -> float:
@@ -69,9 +113,9 @@ class CircularBuffer:
         
         Time Complexity: O(1) due to cached sum
         """
-        if not self.data:
+        if self._count == 0:
             return 0.0
-        return self.cached_sum / len(self.data)
+        return self.cached_sum / self._count
     
     def variance(self) -> float:
         """
@@ -80,14 +124,12 @@ class CircularBuffer:
         Returns:
             Sample variance (using Bessel's correction), or 0.0 if < 2 values
         
-        Time Complexity: O(n)
+        Time Complexity: O(1) due to the running M2 maintained by push()
         """
-        if len(self.data) < 2:
+        if self._count < 2:
             return 0.0
         
-        mean = self.mean()
-        sum_sq_diff = sum((x - mean) ** 2 for x in self.data)
-        return sum_sq_diff / (len(self.data) - 1)
+        return self._m2 / (self._count - 1)
     
     def stddev(self) -> float:
         """Calculate standard deviation."""
@@ -96,23 +138,41 @@ class CircularBuffer:
     @property
     def count(self) -> int:
         """Number of elements currently in buffer."""
-        return len(self.data)
+        return self._count
     
     @property
     def capacity(self) -> int:
         """Maximum capacity of buffer."""
-        return self.data.maxlen
+        return self.data.shape[0]
+    
+    def view(self) -> np.ndarray:
+        """
+        Return the values oldest first.
+        
+        A zero-copy slice until the buffer wraps; after that the two
+        halves are concatenated into a new array.
+        """
+        if self._count < self.capacity:
+            return self.data[:self._count]
+        if self.head == 0:
+            return self.data
+        return np.concatenate((self.data[self.head:], self.data[:self.head]))
     
     def oldest(self) -> Optional[float]:
         """Return oldest value without removing it."""
-        return self.data[0] if self.data else None
+        if self._count == 0:
+            return None
+        index = self.head if self._count == self.capacity else 0
+        return float(self.data[index])
     
     def newest(self) -> Optional[float]:
         """Return newest value without removing it."""
-        return self.data[-1] if self.data else None
+        if self._count == 0:
+            return None
+        return float(self.data[self.head - 1])
     
     def __repr__(self) -> str:
-        return f"CircularBuffer({list(self.data)}, capacity={self.capacity})"
+        return f"CircularBuffer({self.view().tolist()}, capacity={self.capacity})"
 
 
 # =============================================================================
@@ -154,12 +214,56 @@ class SimpleMovingAverage:
     def value(self) -> float:
         """Current SMA value."""
         return self.buffer.mean()
+    
+    @classmethod
+    def batch(cls, values, window_size: int) -> np.ndarray:
+        """
+        SMA of a whole recorded series at once (offline / backtest use).
+        
+        Returns the same values as calling update() for each element in
+        turn, including the shorter averages while the window fills, but
+        from one prefix sum instead of a Python call per sample: each
+        window sum is the difference of two cumulative sums.
+        
+        Args:
+            values: Series of observations
+            window_size: Number of values to include in average
+            
+        Returns:
+            Array of SMA values, one per input value
+        
+        Raises:
+            ValueError: If window_size is not positive
+        """
+        if window_size <= 0:
+            raise ValueError("window_size must be positive")
+        
+        values = np.asarray(values, dtype=np.float64)
+        prefix = np.concatenate(([0.0], np.cumsum(values)))
+        end = np.arange(1, values.size + 1)
+        start = np.maximum(end - window_size, 0)
+        return (prefix[end] - prefix[start]) / (end - start)
 
 
 # =============================================================================
 # PART 3: EXPONENTIAL MOVING AVERAGE
 # =============================================================================
 
+@njit(nogil=True, cache=True)
+def _ema_kernel(values, alpha, out):
+    """
+    EMA recurrence over a 1-D array, written to out.
+    
+    Compiled without the GIL, so threads can run it on separate series
+    at the same time. Same arithmetic as ExponentialMovingAverage.update.
+    """
+    ema = values[0]
+    out[0] = ema
+    for i in range(1, values.shape[0]):
+        ema += alpha * (values[i] - ema)
+        out[i] = ema
+
+
 class ExponentialMovingAverage:
     """
     Exponential Moving Average implementation.
@@ -203,8 +307,10 @@ class ExponentialMovingAverage:
             self.value = new_value
             self.initialised = True
         else:
-            # EMA formula: alpha * new + (1 - alpha) * old
-            self.value = self.alpha * new_value + (1 - self.alpha) * self.value
+            # EMA formula: alpha * new + (1 - alpha) * old, rearranged
+            # as old + alpha * (new - old): one multiply (an FMA once
+            # compiled) and less rounding error when alpha is near 1
+            self.value = self.value + self.alpha * (new_value - self.value)
         
         return self.value
     
@@ -213,6 +319,67 @@ class ExponentialMovingAverage:
         self.value = None
         self.initialised = False
     
+    @classmethod
+    def batch(cls, values, alpha: float) -> np.ndarray:
+        """
+        EMA of a whole recorded series at once (offline / backtest use).
+        
+        Returns the same values as calling update() for each element in
+        turn (the first value seeds the average). With Numba the loop is
+        compiled (_ema_kernel, which releases the GIL; see ema_many).
+        The recurrence is also a first-order IIR filter, so without
+        Numba it runs as scipy.signal.lfilter when SciPy is installed.
+        Otherwise the closed form
+        
+            EMA_t = d^(t+1) * EMA_-1 + alpha * sum_k d^(t-k) * x_k,  d = 1 - alpha
+        
+        is evaluated with a cumulative sum, in blocks short enough that
+        d^t cannot underflow, carrying the last EMA into the next block.
+        
+        Args:
+            values: Series of observations
+            alpha: Smoothing factor (0 < alpha <= 1)
+            
+        Returns:
+            Array of EMA values, one per input value
+        
+        Raises:
+            ValueError: If alpha is out of range
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be between 0 (exclusive) and 1 (inclusive)")
+        
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        if values.size == 0 or alpha == 1:
+            return values.copy()
+        
+        if HAVE_NUMBA:
+            ema = np.empty_like(values)
+            _ema_kernel(values, alpha, ema)
+            return ema
+        decay = 1.0 - alpha
+        
+        try:
+            from scipy.signal import lfilter
+        except ImportError:
+            lfilter = None
+        if lfilter is not None:
+            # Initial state decay * x_0 makes EMA_0 = x_0, as in update()
+            ema, _ = lfilter([alpha], [1.0, -decay], values, zi=[decay * values[0]])
+            return ema
+        
+        # Longest block whose weights d^1..d^block stay above 1e-100
+        block = max(1, int(-100 * np.log(10) / np.log(decay)))
+        weights = decay ** np.arange(1, min(block, values.size) + 1)
+        ema = np.empty_like(values)
+        previous = values[0]
+        for start in range(0, values.size, block):
+            chunk = values[start:start + block]
+            w = weights[:chunk.size]
+            ema[start:start + chunk.size] = w * (previous + alpha * np.cumsum(chunk / w))
+            previous = ema[start + chunk.size - 1]
+        return ema
+    
     def __repr__(self) -> str:
         return f"EMA(alpha={self.alpha}, value={self.value})"
 
@@ -223,10 +390,12 @@ class ExponentialMovingAverage:
 
 def pandas_sma(data: List[float], window: int) -> List[float]:
     """
-    Calculate SMA using pandas (vectorised).
+    Calculate SMA vectorised, as pandas' rolling(window).mean().
     
     This is more efficient for batch processing but requires
-    all data to be available upfront.
+    all data to be available upfront. Each full window's sum is the
+    difference of two prefix sums, so the cost is O(n) whatever the
+    window size, and no pandas Series is built.
     
     Args:
         data: List of values
@@ -235,14 +404,22 @@ def pandas_sma(data: List[float], window: int) -> List[float]:
     Returns:
         List of SMA values (NaN for first window-1 values)
     """
-    import pandas as pd
-    series = pd.Series(data)
-    return series.rolling(window=window).mean().tolist()
+    values = np.asarray(data, dtype=np.float64)
+    prefix = np.zeros(values.size + 1)
+    np.cumsum(values, out=prefix[1:])
+    
+    sma = np.full(values.size, np.nan)
+    if window <= values.size:
+        sma[window - 1:] = (prefix[window:] - prefix[:-window]) / window
+    return sma.tolist()
 
 
 def pandas_ema(data: List[float], alpha: float) -> List[float]:
     """
-    Calculate EMA using pandas (vectorised).
+    Calculate EMA vectorised, as pandas' ewm(alpha, adjust=False).mean().
+    
+    Delegates to ExponentialMovingAverage.batch, which needs no pandas
+    Series and runs the recurrence in C.
     
     Args:
         data: List of values
@@ -251,9 +428,29 @@ def pandas_ema(data: List[float], alpha: float) -> List[float]:
     Returns:
         List of EMA values
     """
-    import pandas as pd
-    series = pd.Series(data)
-    return series.ewm(alpha=alpha, adjust=False).mean().tolist()
+    return ExponentialMovingAverage.batch(data, alpha).tolist()
+
+
+def ema_many(series: Sequence, alpha: float,
+             max_workers: Optional[int] = None) -> List[np.ndarray]:
+    """
+    EMA of several independent series (e.g. one per sensor).
+    
+    Each series goes through ExponentialMovingAverage.batch on a thread
+    pool. With Numba the kernel runs without the GIL, so the series are
+    processed in parallel across cores; otherwise this is no faster
+    than a loop.
+    
+    Args:
+        series: Sequence of 1-D series
+        alpha: Smoothing factor
+        max_workers: Thread count (None = executor default)
+        
+    Returns:
+        List of EMA arrays, in the order of series
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(lambda x: ExponentialMovingAverage.batch(x, alpha), series))
 
 
 # =============================================================================
@@ -304,6 +501,9 @@ def demo_moving_averages():
         
         print(f"{val:>8.1f} {sma_val:>10.2f} {ema_slow_val:>10.2f} {ema_fast_val:>10.2f}")
     
+    batch = SimpleMovingAverage.batch(data, window_size=3)
+    print(f"\nSimpleMovingAverage.batch(data, 3) = {np.round(batch, 2).tolist()}")
+    
     print("\nNote: Spike at value 45.0")
     print("- SMA responds but recovers after 3 values (window size)")
     print("- EMA(0.1) responds slowly, takes many values to recover")
@@ -311,28 +511,22 @@ def demo_moving_averages():
 
 
 def demo_pandas_comparison():
-    """Show pandas vectorised alternatives."""
+    """Show the vectorised equivalents of pandas' rolling() and ewm()."""
     print("\n" + "=" * 60)
-    print("PANDAS VECTORISED ALTERNATIVES")
+    print("VECTORISED ALTERNATIVES (pandas-equivalent, NumPy only)")
     print("=" * 60)
     
-    try:
-        import pandas as pd
-        
-        data = [10, 12, 11, 15, 13, 14, 16, 12, 11, 13]
-        
-        sma_values = pandas_sma(data, window=3)
-        ema_values = pandas_ema(data, alpha=0.3)
-        
-        print(f"\n{'Index':>6} {'Value':>8} {'SMA(3)':>10} {'EMA(0.3)':>10}")
-        print("-" * 38)
-        
-        for i, (val, sma, ema) in enumerate(zip(data, sma_values, ema_values)):
-            sma_str = f"{sma:.2f}" if not np.isnan(sma) else "NaN"
-            print(f"{i:>6} {val:>8} {sma_str:>10} {ema:.2f}")
-        
-    except ImportError:
-        print("pandas not installed - skipping vectorised demo")
+    data = [10, 12, 11, 15, 13, 14, 16, 12, 11, 13]
+    
+    sma_values = pandas_sma(data, window=3)
+    ema_values = pandas_ema(data, alpha=0.3)
+    
+    print(f"\n{'Index':>6} {'Value':>8} {'SMA(3)':>10} {'EMA(0.3)':>10}")
+    print("-" * 38)
+    
+    for i, (val, sma, ema) in enumerate(zip(data, sma_values, ema_values)):
+        sma_str = f"{sma:.2f}" if not np.isnan(sma) else "NaN"
+        print(f"{i:>6} {val:>8} {sma_str:>10} {ema:.2f}")
 
 
 if __name__ == "__main__":
@@ -23,14 +23,45 @@ Key differences from C:
 """
 
 from dataclasses import dataclass, field
-from typing import Callable, Optional, List, Dict, Any, Generator
-from collections import deque
+from typing import Callable, Optional, List, Dict, Any, Generator, Sequence, Tuple, Union
 from enum import Enum, auto
 import time
 import random
 import math
+import sys
 import re
 import heapq
+import array
+import functools
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAVE_NUMPY = False
+
+try:
+    import bottleneck as bn
+    HAVE_BOTTLENECK = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAVE_BOTTLENECK = False
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAVE_NUMBA = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """Fallback decorator: run the kernel as plain Python."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Slotted dataclasses (no per-instance __dict__) where supported: a
+# Message drops from ~350 to ~70 bytes. Python < 3.10 keeps plain ones.
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
 
 # =============================================================================
@@ -53,10 +84,42 @@ class TopicMatcher:
     """
     
     @staticmethod
-    def matches(filter_pattern: str, topic: str) -> bool:
-        """Check if topic matches the filter pattern with wildcards."""
-        filter_parts = filter_pattern.split('/')
-        topic_parts = topic.split('/')
+    @functools.lru_cache(maxsize=1024)
+    def compile(filter_pattern: str) -> 're.Pattern[str]':
+        """
+        Translate a filter into a regex for re.fullmatch on topic strings.
+        
+        '+' becomes one level ([^/]*) and '#' the rest of the topic,
+        including the parent level itself ("a/#" matches "a"), so the
+        regex accepts exactly the topics matches() does. Compiled
+        patterns are cached per filter.
+        """
+        levels = filter_pattern.split('/')
+        parts = []
+        for level in levels:
+            if level == '#':
+                if not parts:
+                    return re.compile(r'.*', re.DOTALL)
+                return re.compile('/'.join(parts) + r'(?:/.*)?', re.DOTALL)
+            parts.append('[^/]*' if level == '+' else re.escape(level))
+        return re.compile('/'.join(parts), re.DOTALL)
+    
+    @staticmethod
+    def matches(filter_pattern: Union[str, Sequence[str]],
+                topic: Union[str, Sequence[str]]) -> bool:
+        """
+        Check if topic matches the filter pattern with wildcards.
+        
+        Either argument may be given already split into levels, so a
+        caller testing one filter against many topics (or the reverse)
+        splits each string only once. Two strings are matched with the
+        cached compiled regex from compile().
+        """
+        if isinstance(filter_pattern, str) and isinstance(topic, str):
+            return TopicMatcher.compile(filter_pattern).fullmatch(topic) is not None
+        
+        filter_parts = filter_pattern.split('/') if isinstance(filter_pattern, str) else filter_pattern
+        topic_parts = topic.split('/') if isinstance(topic, str) else topic
         
         fi = 0  # Filter index
         ti = 0  # Topic index
@@ -84,12 +147,24 @@ class TopicMatcher:
         return fi == len(filter_parts) and ti == len(topic_parts)
 
 
-@dataclass
+class _TopicNode:
+    """One topic level of the broker's subscription trie."""
+    
+    __slots__ = ('children', 'filters')
+    
+    def __init__(self):
+        # Next level, keyed by segment ('+' and '#' are ordinary keys)
+        self.children: Dict[str, '_TopicNode'] = {}
+        # Subscription filters that end at this level
+        self.filters: List[str] = []
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class Message:
     """MQTT-style message."""
     topic: str
     payload: Any
-    timestamp: float = field(default_factory=time.time)
+    timestamp: int = field(default_factory=time.monotonic_ns)  # Nanoseconds
     qos: int = 0
     retain: bool = False
 
@@ -105,14 +180,38 @@ class MessageBroker:
     
     In production, use paho-mqtt client with a real broker like Mosquitto.
     
+    Filters without wildcards (the common case) are found with one
+    lookup of the whole topic string. Wildcard filters are indexed in a
+    trie of topic levels, so a publish splits its topic once and walks
+    the levels (following exact, '+' and '#' children) instead of
+    testing every filter; with no wildcard subscriptions the topic is
+    not even split.
+    
     Time Complexity:
-      - Publish: O(s × t) where s = subscribers, t = topic length
-      - Subscribe: O(1)
+      - Publish: O(1) for exact filters, plus O(t × w) for wildcard ones
+                 (t = topic levels, w = '+' branches taken); independent
+                 of the number of subscriptions
+      - Subscribe: O(t)
     """
     
     def __init__(self, max_retained: int = 1000):
         self._subscriptions: Dict[str, List[Callable[[Message], None]]] = {}
+        # Exact filters, a trie over the levels of wildcard filters, and
+        # the order filters were added in (deliveries follow subscription
+        # order, as with a flat scan)
+        self._exact_filters: set = set()
+        self._trie = _TopicNode()
+        self._filter_order: Dict[str, int] = {}
+        self._next_order = 0
         self._retained: Dict[str, Message] = {}
+        # Min-heap of (sequence, topic) for evicting the oldest retained
+        # message; timestamps come from a monotonic clock, so the retain
+        # sequence orders them the same and compares as a plain int.
+        # Replaced entries stay in the heap and are skipped when popped:
+        # only the sequence in _retained_seq is live.
+        self._retained_heap: List[Tuple[int, str]] = []
+        self._retained_seq: Dict[str, int] = {}
+        self._retain_counter = 0
         self._max_retained = max_retained
         self._message_count = 0
     
@@ -127,11 +226,14 @@ class MessageBroker:
         """
         if topic_filter not in self._subscriptions:
             self._subscriptions[topic_filter] = []
+            self._index_filter(topic_filter)
         self._subscriptions[topic_filter].append(callback)
         
-        # Deliver retained messages matching this filter
+        # Deliver retained messages matching this filter: one compiled
+        # regex, matched in C against each retained topic string
+        pattern = TopicMatcher.compile(topic_filter)
         for topic, msg in self._retained.items():
-            if TopicMatcher.matches(topic_filter, topic):
+            if pattern.fullmatch(topic):
                 callback(msg)
     
     def unsubscribe(self, topic_filter: str, 
@@ -142,6 +244,92 @@ class MessageBroker:
                 self._subscriptions[topic_filter].remove(callback)
             else:
                 del self._subscriptions[topic_filter]
+                self._unindex_filter(topic_filter)
+    
+    def _index_filter(self, topic_filter: str) -> None:
+        """Record a new filter in the exact set or the wildcard trie."""
+        levels = topic_filter.split('/')
+        if '+' in levels or '#' in levels:
+            self._trie_insert(topic_filter)
+        else:
+            self._exact_filters.add(topic_filter)
+        self._filter_order[topic_filter] = self._next_order
+        self._next_order += 1
+    
+    def _unindex_filter(self, topic_filter: str) -> None:
+        """Remove a filter recorded by _index_filter."""
+        if topic_filter in self._exact_filters:
+            self._exact_filters.remove(topic_filter)
+        else:
+            self._trie_remove(topic_filter)
+        del self._filter_order[topic_filter]
+    
+    @staticmethod
+    def _trie_levels(topic_filter: str) -> List[str]:
+        """Filter levels as stored in the trie (nothing after a '#')."""
+        levels = topic_filter.split('/')
+        if '#' in levels:
+            # '#' matches everything remaining, whatever follows it
+            levels = levels[:levels.index('#') + 1]
+        return levels
+    
+    def _trie_insert(self, topic_filter: str) -> None:
+        """Add a filter to the subscription trie."""
+        node = self._trie
+        for level in self._trie_levels(topic_filter):
+            child = node.children.get(level)
+            if child is None:
+                child = node.children[level] = _TopicNode()
+            node = child
+        node.filters.append(topic_filter)
+    
+    def _trie_remove(self, topic_filter: str) -> None:
+        """Remove a filter from the trie, pruning emptied nodes."""
+        path = [self._trie]
+        levels = self._trie_levels(topic_filter)
+        for level in levels:
+            path.append(path[-1].children[level])
+        path[-1].filters.remove(topic_filter)
+        
+        for depth in range(len(levels), 0, -1):
+            node = path[depth]
+            if node.filters or node.children:
+                break
+            del path[depth - 1].children[levels[depth - 1]]
+    
+    def _matching_filters(self, topic: str) -> List[str]:
+        """
+        Filters matching a topic, in subscription order.
+        
+        Same rules as TopicMatcher.matches: '+' stands for one level,
+        '#' for all remaining levels (including none).
+        """
+        matched: List[str] = [topic] if topic in self._exact_filters else []
+        if not self._trie.children:
+            return matched
+        
+        parts = topic.split('/')
+        n_parts = len(parts)
+        stack = [(self._trie, 0)]
+        while stack:
+            node, depth = stack.pop()
+            children = node.children
+            rest = children.get('#')
+            if rest is not None:
+                matched.extend(rest.filters)
+            if depth == n_parts:
+                matched.extend(node.filters)
+                continue
+            exact = children.get(parts[depth])
+            if exact is not None:
+                stack.append((exact, depth + 1))
+            single = children.get('+')
+            if single is not None:
+                stack.append((single, depth + 1))
+        
+        if len(matched) > 1:
+            matched.sort(key=self._filter_order.__getitem__)
+        return matched
     
     def publish(self, topic: str, payload: Any, 
                 qos: int = 0, retain: bool = False) -> None:
@@ -159,18 +347,85 @@ class MessageBroker:
         
         # Store retained message
         if retain:
-            self._retained[topic] = msg
-            # Limit retained messages
-            if len(self._retained) > self._max_retained:
-                oldest_topic = min(self._retained, 
-                                   key=lambda t: self._retained[t].timestamp)
-                del self._retained[oldest_topic]
+            self._store_retained(msg)
         
         # Deliver to matching subscribers
-        for filter_pattern, callbacks in self._subscriptions.items():
-            if TopicMatcher.matches(filter_pattern, topic):
-                for callback in callbacks:
-                    callback(msg)
+        for filter_pattern in self._matching_filters(topic):
+            for callback in self._subscriptions[filter_pattern]:
+                callback(msg)
+    
+    def publish_many(self, messages: Sequence[Tuple[str, Any]],
+                     qos: int = 0, retain: bool = False) -> None:
+        """
+        Publish a sequence of (topic, payload) pairs.
+        
+        Same deliveries, in the same order, as calling publish() on each
+        pair, but the subscribers of each distinct topic are resolved
+        once per call rather than once per message. Subscription changes
+        made by callbacks during the call apply from the next call.
+        
+        Args:
+            messages: (topic, payload) pairs, in publish order
+            qos: Quality of Service (0, 1, or 2)
+            retain: Whether to retain the messages
+        """
+        resolved: Dict[str, List[Callable[[Message], None]]] = {}
+        for topic, payload in messages:
+            msg = Message(topic=topic, payload=payload, qos=qos, retain=retain)
+            self._message_count += 1
+            if retain:
+                self._store_retained(msg)
+            
+            callbacks = resolved.get(topic)
+            if callbacks is None:
+                callbacks = resolved[topic] = [
+                    callback
+                    for filter_pattern in self._matching_filters(topic)
+                    for callback in self._subscriptions[filter_pattern]]
+            for callback in callbacks:
+                callback(msg)
+    
+    def _store_retained(self, msg: Message) -> None:
+        """Retain msg for its topic, evicting the oldest over the limit."""
+        topic = msg.topic
+        self._retained[topic] = msg
+        self._retain_counter += 1
+        self._retained_seq[topic] = self._retain_counter
+        heapq.heappush(self._retained_heap, (self._retain_counter, topic))
+        
+        # Limit retained messages: pop until a live entry turns up
+        if len(self._retained) > self._max_retained:
+            while True:
+                seq, oldest_topic = heapq.heappop(self._retained_heap)
+                if self._retained_seq.get(oldest_topic) == seq:
+                    break
+            del self._retained[oldest_topic]
+            del self._retained_seq[oldest_topic]
+        elif len(self._retained_heap) > 2 * len(self._retained) + 64:
+            # Many replaced entries: rebuild from the live ones
+            self._retained_heap = [
+                (seq, t) for t, seq in self._retained_seq.items()]
+            heapq.heapify(self._retained_heap)
+    
+    def publish_batch(self, topic: str, payloads: Sequence, qos: int = 0) -> None:
+        """
+        Publish a block of readings to one topic as a single message.
+        
+        For high-rate sensor data: the topic is matched once and each
+        subscriber is called once with the whole block (e.g. a NumPy
+        array) as the payload, instead of one Message, timestamp and
+        callback per reading. Batches are never retained.
+        
+        Args:
+            topic: Exact topic (no wildcards)
+            payloads: Readings, oldest first
+            qos: Quality of Service (0, 1, or 2)
+        """
+        msg = Message(topic=topic, payload=payloads, qos=qos)
+        self._message_count += 1
+        for filter_pattern in self._matching_filters(topic):
+            for callback in self._subscriptions[filter_pattern]:
+                callback(msg)
     
     @property
     def stats(self) -> Dict[str, int]:
@@ -195,9 +450,9 @@ class SensorType(Enum):
     ACCELEROMETER = auto()  # g, range: -16 to 16
 
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class SensorConfig:
-    """Configuration for sensor simulation."""
+    """Configuration for sensor simulation (immutable, hashable)."""
     sensor_type: SensorType
     base_value: float
     noise_stddev: float
@@ -220,31 +475,46 @@ class SensorSimulator:
     The formula mirrors the C implementation:
       value = base + drift × time + N(0, σ) + anomaly
     
+    As in C, time advances per reading rather than by the clock:
+    reading i is taken at i × sample_interval seconds.
+    
     Python advantage: Generators provide infinite streams naturally.
     """
     
     def __init__(self, config: SensorConfig, seed: Optional[int] = None):
         self.config = config
         self._rng = random.Random(seed)
-        self._start_time = time.time()
+        # Separate NumPy stream for batch(); read() keeps the Box-Muller path
+        self._np_rng = np.random.default_rng(seed) if HAVE_NUMPY else None
         self._reading_count = 0
+        self._spare_normal: Optional[float] = None
     
-    def _box_muller(self) -> float:
+    def _sample_normal(self) -> float:
         """
-        Generate standard normal using Box-Muller transform.
+        Generate standard normal using the Marsaglia polar method.
         
-        Equivalent to C implementation (no numpy).
+        Polar form of the Box-Muller transform used by the C version:
+        a point drawn uniformly in the unit disc (about 21% of draws are
+        rejected) gives two independent normals with one log and one
+        sqrt and no cos/sin. The second one is kept for the next call.
         Could use random.gauss() but this shows the algorithm.
         """
-        u1 = self._rng.random()
-        u2 = self._rng.random()
+        spare = self._spare_normal
+        if spare is not None:
+            self._spare_normal = None
+            return spare
         
-        # Avoid log(0)
-        while u1 < 1e-10:
-            u1 = self._rng.random()
+        rand = self._rng.random
+        while True:
+            u = 2.0 * rand() - 1.0
+            v = 2.0 * rand() - 1.0
+            s = u * u + v * v
+            if 0.0 < s < 1.0:
+                break
         
-        z = math.sqrt(-2.0 * math.log(u1)) * math.cos(2.0 * math.pi * u2)
-        return z
+        f = math.sqrt(-2.0 * math.log(s) / s)
+        self._spare_normal = v * f
+        return u * f
     
     def read(self) -> float:
         """
@@ -252,14 +522,15 @@ class SensorSimulator:
         
         Time Complexity: O(1)
         """
-        elapsed = time.time() - self._start_time
+        # Virtual time from the reading counter (no clock call)
+        elapsed = self._reading_count * self.config.sample_interval
         self._reading_count += 1
         
         # Base value with drift
         value = self.config.base_value + self.config.drift_rate * elapsed
         
         # Add Gaussian noise
-        value += self._box_muller() * self.config.noise_stddev
+        value += self._sample_normal() * self.config.noise_stddev
         
         # Random anomaly
         if self._rng.random() < self.config.anomaly_probability:
@@ -288,15 +559,37 @@ class SensorSimulator:
             time.sleep(self.config.sample_interval)
     
     def batch(self, count: int) -> List[float]:
-        """Generate a batch of readings without delay (for testing)."""
-        return [self.read() for _ in range(count)]
+        """
+        Generate a batch of readings without delay (for testing).
+        
+        Same model as read(), but with NumPy all noise, anomaly draws
+        and signs come from three vectorised calls instead of a Python
+        Box-Muller step per reading. Without NumPy this falls back to
+        calling read() count times.
+        """
+        if self._np_rng is None:
+            return [self.read() for _ in range(count)]
+        
+        cfg = self.config
+        elapsed = (self._reading_count + np.arange(count)) * cfg.sample_interval
+        self._reading_count += count
+        
+        values = self._np_rng.standard_normal(count)
+        values *= cfg.noise_stddev
+        values += cfg.base_value + cfg.drift_rate * elapsed
+        
+        # Random anomalies with random sign
+        spikes = self._np_rng.random(count) < cfg.anomaly_probability
+        signs = np.where(self._np_rng.random(count) > 0.5, 1.0, -1.0)
+        values += spikes * signs * (cfg.anomaly_magnitude * cfg.noise_stddev)
+        return values.tolist()
 
 
 # =============================================================================
 # PART 3: COMPLETE PIPELINE
 # =============================================================================
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class PipelineStats:
     """Statistics from pipeline processing."""
     readings_processed: int = 0
@@ -306,6 +599,83 @@ class PipelineStats:
     current_stddev: float = 0.0
 
 
+@njit(cache=True)
+def _pipeline_kernel(values, ring, head, filled, ring_sum, count, mean, m2,
+                     ema, has_ema, alpha, window_size, threshold):
+    """
+    Numeric core of StreamPipeline.process over a whole array.
+    
+    Same steps, in the same order, as process(): ring buffer + rolling
+    sum for the SMA, Welford update, EMA, then the z-score test once
+    window_size readings have been seen. ring, head, filled and ring_sum
+    are the pipeline's ring buffer state; ring is updated in place. z is
+    NaN where process() would report None.
+    
+    The z-score test only reads the per-reading mean and stddev, so it
+    runs as a second, branch-free loop over those arrays instead of
+    inside the sequential recurrence, where it can be vectorised.
+    
+    Returns the per-reading arrays (ema, sma, z, anomaly, mean, stddev)
+    followed by the final head, filled, rolling sum, count, mean, M2
+    and EMA.
+    """
+    n = values.shape[0]
+    ema_out = np.empty(n)
+    sma_out = np.empty(n)
+    z_out = np.empty(n)
+    anomaly = np.zeros(n, dtype=np.bool_)
+    mean_out = np.empty(n)
+    std_out = np.empty(n)
+    
+    # Readings before this index fall inside the baseline window
+    start = min(n, max(0, window_size - count - 1))
+    
+    for i in range(n):
+        value = values[i]
+        
+        # Circular buffer with running sum
+        if filled == window_size:
+            ring_sum += value - ring[head]
+        else:
+            ring_sum += value
+            filled += 1
+        ring[head] = value
+        head += 1
+        if head == window_size:
+            head = 0
+        sma_out[i] = ring_sum / filled
+        
+        # Welford (delta uses the old mean, delta2 the new one)
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        m2 += delta * (value - mean)
+        stddev = np.sqrt(m2 / (count - 1)) if count >= 2 else 0.0
+        mean_out[i] = mean
+        std_out[i] = stddev
+        
+        # EMA
+        if has_ema:
+            ema += alpha * (value - ema)
+        else:
+            ema = value
+            has_ema = True
+        ema_out[i] = ema
+    
+    # Anomaly detection once the baseline window is full: selects rather
+    # than branches, dividing by 1.0 where the stddev is degenerate
+    z_out[:start] = np.nan
+    for i in range(start, n):
+        stddev = std_out[i]
+        valid = stddev > 1e-10
+        z = abs(values[i] - mean_out[i]) / (stddev if valid else 1.0)
+        z_out[i] = z if valid else np.nan
+        anomaly[i] = valid and z > threshold
+    
+    return (ema_out, sma_out, z_out, anomaly, mean_out, std_out,
+            head, filled, ring_sum, count, mean, m2, ema)
+
+
 class StreamPipeline:
     """
     Complete IoT stream processing pipeline.
@@ -334,8 +704,15 @@ class StreamPipeline:
         self.broker = broker or MessageBroker()
         self.topic_prefix = topic_prefix
         
-        # Circular buffer using deque (automatic size management)
-        self._buffer: deque = deque(maxlen=window_size)
+        # Circular buffer as in C: fixed slots, wrapping write position
+        # and a running sum, so the SMA costs O(1) per reading instead
+        # of summing the whole window. array('d') stores raw doubles
+        # (8 bytes per slot, no float objects) and exposes them through
+        # the buffer protocol, so the compiled kernel works on it in place
+        self._ring = array.array('d', bytes(8 * window_size))
+        self._ring_head = 0      # Next slot to write (oldest once full)
+        self._ring_filled = 0
+        self._rolling_sum = 0.0
         
         # Welford state
         self._count = 0
@@ -348,18 +725,6 @@ class StreamPipeline:
         # Statistics
         self.stats = PipelineStats()
     
-    def _welford_update(self, value: float) -> None:
-        """
-        Update Welford running statistics.
-        
-        Critical: delta uses OLD mean, delta2 uses NEW mean.
-        """
-        self._count += 1
-        delta = value - self._mean
-        self._mean += delta / self._count
-        delta2 = value - self._mean  # Uses NEW mean
-        self._M2 += delta * delta2
-    
     @property
     def variance(self) -> float:
         """Sample variance from Welford state."""
@@ -372,77 +737,121 @@ class StreamPipeline:
         """Standard deviation."""
         return math.sqrt(self.variance)
     
-    def process(self, value: float, sensor_id: str = "sensor1") -> Dict[str, Any]:
+    def _step(self, value: float) -> Tuple[float, float, Optional[float], bool]:
         """
-        Process a single sensor reading through the pipeline.
+        Advance all pipeline state by one reading.
         
-        Returns dictionary with processing results:
-          - value: Original reading
-          - ema: Exponential moving average
-          - sma: Simple moving average (window)
-          - is_anomaly: Whether anomaly detected
-          - z_score: Z-score if computed
-          - published_topics: Topics where data was published
+        Ring buffer, Welford, EMA and the z-score test in one pass with
+        the state held in locals, so process() pays for one method call
+        and no intermediate dicts.
+        
+        Returns:
+            (ema, sma, z_score, is_anomaly); z_score is None until the
+            baseline window is full
         """
-        self.stats.readings_processed += 1
-        published = []
+        stats = self.stats
+        stats.readings_processed += 1
+        window_size = self.window_size
         
-        # 1. Add to circular buffer
-        self._buffer.append(value)
+        # 1. Add to circular buffer, replacing the oldest value once full
+        head = self._ring_head
+        filled = self._ring_filled
+        if filled == window_size:
+            rolling_sum = self._rolling_sum + (value - self._ring[head])
+        else:
+            rolling_sum = self._rolling_sum + value
+            filled += 1
+            self._ring_filled = filled
+        self._ring[head] = value
+        self._ring_head = (head + 1) % window_size
+        self._rolling_sum = rolling_sum
         
-        # 2. Update Welford statistics
-        self._welford_update(value)
+        # 2. Welford update. Critical: delta uses OLD mean, delta2 uses NEW mean
+        count = self._count + 1
+        delta = value - self._mean
+        mean = self._mean + delta / count
+        self._M2 += delta * (value - mean)
+        self._count = count
+        self._mean = mean
         
-        # 3. Calculate SMA from buffer
-        sma = sum(self._buffer) / len(self._buffer)
+        # 3. SMA from the running sum
+        sma = rolling_sum / filled
         
-        # 4. Update EMA
-        if self._ema is None:
-            self._ema = value
-        else:
-            self._ema = self.ema_alpha * value + (1 - self.ema_alpha) * self._ema
+        # 4. EMA: alpha * value + (1 - alpha) * ema, with a single multiply
+        ema = self._ema
+        ema = value if ema is None else ema + self.ema_alpha * (value - ema)
+        self._ema = ema
         
         # 5. Anomaly detection (need baseline first)
-        is_anomaly = False
-        z_score = None
+        if count < window_size:
+            return ema, sma, None, False
         
-        if self._count >= self.window_size:
-            self.stats.current_mean = self._mean
-            self.stats.current_stddev = self.stddev
-            
-            if self.stddev > 1e-10:
-                z_score = abs(value - self._mean) / self.stddev
-                is_anomaly = z_score > self.anomaly_threshold
-                
-                if is_anomaly:
-                    self.stats.anomalies_detected += 1
-        
-        # 6. Publish to broker
-        base_topic = f"{self.topic_prefix}/{sensor_id}"
+        stddev = math.sqrt(self._M2 / (count - 1)) if count >= 2 else 0.0
+        stats.current_mean = mean
+        stats.current_stddev = stddev
+        if stddev <= 1e-10:
+            return ema, sma, None, False
+        
+        z_score = abs(value - mean) / stddev
+        is_anomaly = z_score > self.anomaly_threshold
+        if is_anomaly:
+            stats.anomalies_detected += 1
+        return ema, sma, z_score, is_anomaly
+    
+    def _process_core(self, value: float,
+                      base_topic: str) -> Tuple[float, float, Optional[float], bool]:
+        """
+        Run one reading through the pipeline and publish the results.
         
-        # Always publish value
-        self.broker.publish(f"{base_topic}/value", value)
-        published.append(f"{base_topic}/value")
+        Everything process() does except building its result dict and
+        topic list, for callers that discard them.
         
-        # Publish smoothed value
-        self.broker.publish(f"{base_topic}/ema", self._ema)
-        published.append(f"{base_topic}/ema")
+        Returns:
+            (ema, sma, z_score, is_anomaly) as from _step()
+        """
+        ema, sma, z_score, is_anomaly = self._step(value)
+        
+        # 6. Publish to broker: always value and smoothed value
+        publish = self.broker.publish
+        publish(base_topic + "/value", value)
+        publish(base_topic + "/ema", ema)
         
         # Publish anomaly if detected
         if is_anomaly:
-            self.broker.publish(f"{base_topic}/anomaly", {
+            publish(base_topic + "/anomaly", {
                 'value': value,
                 'z_score': z_score,
                 'mean': self._mean,
                 'stddev': self.stddev
             }, retain=True)
-            published.append(f"{base_topic}/anomaly")
+            self.stats.messages_published += 3
+        else:
+            self.stats.messages_published += 2
+        
+        return ema, sma, z_score, is_anomaly
+    
+    def process(self, value: float, sensor_id: str = "sensor1") -> Dict[str, Any]:
+        """
+        Process a single sensor reading through the pipeline.
         
-        self.stats.messages_published += len(published)
+        Returns dictionary with processing results:
+          - value: Original reading
+          - ema: Exponential moving average
+          - sma: Simple moving average (window)
+          - is_anomaly: Whether anomaly detected
+          - z_score: Z-score if computed
+          - published_topics: Topics where data was published
+        """
+        base_topic = f"{self.topic_prefix}/{sensor_id}"
+        ema, sma, z_score, is_anomaly = self._process_core(value, base_topic)
+        
+        published = [f"{base_topic}/value", f"{base_topic}/ema"]
+        if is_anomaly:
+            published.append(f"{base_topic}/anomaly")
         
         return {
             'value': value,
-            'ema': self._ema,
+            'ema': ema,
             'sma': sma,
             'is_anomaly': is_anomaly,
             'z_score': z_score,
@@ -450,9 +859,293 @@ class StreamPipeline:
         }
     
     def process_batch(self, values: List[float], 
-                      sensor_id: str = "sensor1") -> List[Dict[str, Any]]:
-        """Process multiple readings."""
-        return [self.process(v, sensor_id) for v in values]
+                      sensor_id: str = "sensor1",
+                      return_details: bool = True) -> Optional[List[Dict[str, Any]]]:
+        """
+        Process multiple readings.
+        
+        With return_details=False the readings are only processed and
+        published, and None is returned: no result dict or topic list
+        is built per reading.
+        """
+        if return_details:
+            return [self.process(v, sensor_id) for v in values]
+        
+        base_topic = f"{self.topic_prefix}/{sensor_id}"
+        core = self._process_core
+        for v in values:
+            core(v, base_topic)
+        return None
+    
+    def process_batch_fast(self, values, sensor_id: str = "sensor1",
+                           publish: bool = True,
+                           batched: bool = False) -> Dict[str, Any]:
+        """
+        Process a recorded batch of readings with a compiled kernel.
+        
+        Gives the same results and leaves the pipeline in the same state
+        as process_batch, but the arithmetic (SMA, Welford, EMA, z-score)
+        runs in one Numba loop over a NumPy array instead of a Python
+        call and dict per reading. Messages are then published in a
+        second pass, in the same order as process() would, unless
+        publish is False.
+        
+        With batched=True the value and EMA streams are instead sent as
+        one publish_batch() message each, carrying the whole arrays;
+        anomalies are still published (and retained) one by one.
+        
+        Args:
+            values: Sensor readings
+            sensor_id: Sensor name used in the topics
+            publish: Whether to publish to the broker
+            batched: Publish value/EMA arrays in one message per topic
+        
+        Returns:
+            Dictionary of per-reading arrays: value, ema, sma,
+            is_anomaly and z_score (NaN where not computed)
+        
+        Raises:
+            ImportError: If numpy is not installed
+        """
+        if not HAVE_NUMPY:
+            raise ImportError("process_batch_fast requires numpy")
+        
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        ring = np.frombuffer(self._ring, dtype=np.float64)   # Zero-copy view
+        
+        (ema, sma, z, anomaly, means, stddevs,
+         self._ring_head, self._ring_filled, self._rolling_sum,
+         self._count, self._mean, self._M2, last_ema) = _pipeline_kernel(
+            values, ring, self._ring_head, self._ring_filled,
+            self._rolling_sum, self._count, self._mean, self._M2,
+            0.0 if self._ema is None else self._ema, self._ema is not None,
+            self.ema_alpha, self.window_size, self.anomaly_threshold)
+        
+        if values.size:
+            self._ema = float(last_ema)
+        
+        self.stats.readings_processed += values.size
+        self.stats.anomalies_detected += int(anomaly.sum())
+        if self._count >= self.window_size:
+            self.stats.current_mean = self._mean
+            self.stats.current_stddev = self.stddev
+        
+        if publish and batched:
+            base_topic = f"{self.topic_prefix}/{sensor_id}"
+            self.broker.publish_batch(f"{base_topic}/value", values)
+            self.broker.publish_batch(f"{base_topic}/ema", ema)
+            for i in np.flatnonzero(anomaly):
+                self.broker.publish(f"{base_topic}/anomaly", {
+                    'value': float(values[i]),
+                    'z_score': float(z[i]),
+                    'mean': float(means[i]),
+                    'stddev': float(stddevs[i])
+                }, retain=True)
+            self.stats.messages_published += 2 + int(anomaly.sum())
+        elif publish:
+            # Publish the readings in runs between flagged indices, one
+            # publish_many() per run, so only the anomalies themselves
+            # are looked up and published on their own
+            base_topic = f"{self.topic_prefix}/{sensor_id}"
+            value_topic = f"{base_topic}/value"
+            ema_topic = f"{base_topic}/ema"
+            value_list = values.tolist()
+            ema_list = ema.tolist()
+            flagged = np.flatnonzero(anomaly).tolist()
+            start = 0
+            for stop in flagged + [values.size]:
+                end = min(stop + 1, values.size)
+                self.broker.publish_many([
+                    pair
+                    for i in range(start, end)
+                    for pair in ((value_topic, value_list[i]),
+                                 (ema_topic, ema_list[i]))])
+                if stop < values.size:
+                    self.broker.publish(f"{base_topic}/anomaly", {
+                        'value': value_list[stop],
+                        'z_score': float(z[stop]),
+                        'mean': float(means[stop]),
+                        'stddev': float(stddevs[stop])
+                    }, retain=True)
+                start = stop + 1
+            self.stats.messages_published += 2 * values.size + len(flagged)
+        
+        return {
+            'value': values,
+            'ema': ema,
+            'sma': sma,
+            'is_anomaly': anomaly,
+            'z_score': z
+        }
+
+
+@njit(parallel=True, cache=True)
+def _multi_pipeline_kernel(readings, alpha, window_size, threshold):
+    """Run _pipeline_kernel on every row of readings, rows in parallel."""
+    n_streams, n_readings = readings.shape
+    ema = np.empty((n_streams, n_readings))
+    sma = np.empty((n_streams, n_readings))
+    z = np.empty((n_streams, n_readings))
+    anomaly = np.empty((n_streams, n_readings), dtype=np.bool_)
+    
+    for s in prange(n_streams):
+        # Fresh pipeline state per stream
+        ring = np.zeros(window_size)
+        result = _pipeline_kernel(readings[s], ring, 0, 0, 0.0, 0, 0.0, 0.0,
+                                  0.0, False, alpha, window_size, threshold)
+        ema[s] = result[0]
+        sma[s] = result[1]
+        z[s] = result[2]
+        anomaly[s] = result[3]
+    
+    return ema, sma, z, anomaly
+
+
+def process_many_streams(readings, window_size: int = 20,
+                         ema_alpha: float = 0.1,
+                         anomaly_threshold: float = 3.0) -> Dict[str, Any]:
+    """
+    Run many independent sensor streams through the pipeline arithmetic.
+    
+    readings[s, t] is reading t of sensor s. Each row gets the same
+    results as a fresh StreamPipeline fed that row with
+    process_batch_fast(publish=False), but no pipeline objects are
+    created and, with Numba, the sensors are spread across cores.
+    
+    Args:
+        readings: 2-D array (sensors × readings)
+        window_size: SMA window and baseline length
+        ema_alpha: EMA smoothing factor
+        anomaly_threshold: Z-score above which a reading is anomalous
+    
+    Returns:
+        Dictionary of 2-D arrays: ema, sma, is_anomaly and z_score
+        (NaN where not computed)
+    
+    Raises:
+        ImportError: If numpy is not installed
+    """
+    if not HAVE_NUMPY:
+        raise ImportError("process_many_streams requires numpy")
+    
+    readings = np.ascontiguousarray(readings, dtype=np.float64)
+    ema, sma, z, anomaly = _multi_pipeline_kernel(
+        readings, ema_alpha, window_size, anomaly_threshold)
+    return {'ema': ema, 'sma': sma, 'is_anomaly': anomaly, 'z_score': z}
+
+
+class MultiSensorPipeline:
+    """
+    StreamPipeline arithmetic for many live sensors, one reading each per step.
+    
+    The streaming counterpart of process_many_streams: per-sensor state
+    (ring buffer, running sum, Welford count/mean/M2, EMA) is held as
+    parallel NumPy arrays with one row per sensor, so feeding the latest
+    reading of every sensor is one vectorised step() instead of one
+    process() call and object per sensor. Each row gets the same results
+    as a StreamPipeline fed that sensor's readings. Nothing is published.
+    
+    Raises:
+        ImportError: If numpy is not installed
+    """
+    
+    def __init__(self,
+                 window_size: int = 20,
+                 ema_alpha: float = 0.1,
+                 anomaly_threshold: float = 3.0):
+        if not HAVE_NUMPY:
+            raise ImportError("MultiSensorPipeline requires numpy")
+        
+        self.window_size = window_size
+        self.ema_alpha = ema_alpha
+        self.anomaly_threshold = anomaly_threshold
+        self.index: Dict[str, int] = {}    # sensor_id -> row
+        
+        # All rows write the same ring column each step, so one head
+        # serves every sensor; rows that joined late are just less full
+        self._ring = np.zeros((0, window_size))
+        self._ring_head = 0
+        self._ring_filled = np.zeros(0, dtype=np.int64)
+        self._rolling_sum = np.zeros(0)
+        self._count = np.zeros(0, dtype=np.int64)
+        self._mean = np.zeros(0)
+        self._M2 = np.zeros(0)
+        self._ema = np.zeros(0)
+        self._has_ema = np.zeros(0, dtype=np.bool_)
+    
+    def register(self, sensor_id: str) -> int:
+        """
+        Add a sensor (if new) and return its row in the state arrays.
+        
+        Args:
+            sensor_id: Sensor name
+        
+        Returns:
+            Row index; step() takes readings in this order
+        """
+        row = self.index.get(sensor_id)
+        if row is not None:
+            return row
+        
+        row = self.index[sensor_id] = len(self.index)
+        self._ring = np.vstack([self._ring, np.zeros((1, self.window_size))])
+        self._ring_filled = np.append(self._ring_filled, 0)
+        self._rolling_sum = np.append(self._rolling_sum, 0.0)
+        self._count = np.append(self._count, 0)
+        self._mean = np.append(self._mean, 0.0)
+        self._M2 = np.append(self._M2, 0.0)
+        self._ema = np.append(self._ema, 0.0)
+        self._has_ema = np.append(self._has_ema, False)
+        return row
+    
+    def step(self, values) -> Dict[str, Any]:
+        """
+        Advance every sensor by one reading.
+        
+        Args:
+            values: values[i] is the latest reading of the sensor in row i
+        
+        Returns:
+            Dictionary of per-sensor arrays: ema, sma, is_anomaly and
+            z_score (NaN where not computed)
+        
+        Raises:
+            ValueError: If there is not one reading per registered sensor
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape != (len(self.index),):
+            raise ValueError(f"expected {len(self.index)} readings, got shape {values.shape}")
+        
+        # 1. Circular buffer with running sum
+        head = self._ring_head
+        full = self._ring_filled == self.window_size
+        self._rolling_sum += np.where(full, values - self._ring[:, head], values)
+        self._ring_filled += ~full
+        self._ring[:, head] = values
+        self._ring_head = (head + 1) % self.window_size
+        sma = self._rolling_sum / self._ring_filled
+        
+        # 2. Welford update. delta uses OLD mean, delta2 uses NEW mean
+        self._count += 1
+        delta = values - self._mean
+        self._mean += delta / self._count
+        self._M2 += delta * (values - self._mean)
+        
+        # 3. EMA, seeded with the first reading
+        self._ema = np.where(self._has_ema,
+                             self._ema + self.ema_alpha * (values - self._ema),
+                             values)
+        self._has_ema[:] = True
+        
+        # 4. Anomaly detection once a sensor has a full baseline
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stddev = np.sqrt(self._M2 / (self._count - 1))
+            valid = (self._count >= self.window_size) & (stddev > 1e-10)
+            z = np.where(valid, np.abs(values - self._mean) / stddev, np.nan)
+        anomaly = valid & (z > self.anomaly_threshold)
+        
+        return {'ema': self._ema.copy(), 'sma': sma,
+                'is_anomaly': anomaly, 'z_score': z}
 
 
 # =============================================================================
@@ -494,11 +1187,17 @@ def demo_pandas_pipeline():
         'timestamp': pd.date_range('2024-01-01', periods=n, freq='s')
     })
     
-    # Calculate rolling statistics (vectorised, very fast)
+    # Calculate rolling statistics (vectorised, very fast). bottleneck's
+    # moving-window kernels give the same columns in one C pass each
     window = 20
-    df['sma'] = df['value'].rolling(window=window).mean()
+    if HAVE_BOTTLENECK:
+        values = df['value'].to_numpy()
+        df['sma'] = bn.move_mean(values, window)
+        df['rolling_std'] = bn.move_std(values, window, ddof=1)
+    else:
+        df['sma'] = df['value'].rolling(window=window).mean()
+        df['rolling_std'] = df['value'].rolling(window=window).std()
     df['ema'] = df['value'].ewm(alpha=0.1, adjust=False).mean()
-    df['rolling_std'] = df['value'].rolling(window=window).std()
     
     # Z-score anomaly detection
     df['z_score'] = (df['value'] - df['sma']) / df['rolling_std']
@@ -640,13 +1339,23 @@ def demo_sensor_simulation():
     print("    Reading  Value   Status")
     print("    " + "─" * 30)
     
-    mean = sum(readings) / len(readings)
-    stddev = (sum((x - mean) ** 2 for x in readings) / (len(readings) - 1)) ** 0.5
-    
-    for i, val in enumerate(readings):
-        z = abs(val - mean) / stddev if stddev > 0 else 0
+    if HAVE_NUMPY:
+        # One vectorised pass each for the stats and the z-scores
+        arr = np.asarray(readings, dtype=np.float64)
+        mean = float(arr.mean())
+        stddev = float(arr.std(ddof=1))
+        z_scores = (np.abs(arr - mean) / stddev).tolist() if stddev > 0 else [0.0] * arr.size
+    else:
+        mean = sum(readings) / len(readings)
+        stddev = (sum((x - mean) ** 2 for x in readings) / (len(readings) - 1)) ** 0.5
+        z_scores = [abs(x - mean) / stddev if stddev > 0 else 0 for x in readings]
+    
+    # Build the table and write it with one print call
+    rows = []
+    for i, (val, z) in enumerate(zip(readings, z_scores)):
         status = "ANOMALY!" if z > 3.0 else ""
-        print(f"    {i+1:3d}      {val:6.2f}  {status}")
+        rows.append(f"    {i+1:3d}      {val:6.2f}  {status}")
+    print("\n".join(rows))
     
     print(f"\n  Statistics: mean={mean:.2f}°C, stddev={stddev:.2f}°C")
 
@@ -668,10 +1377,14 @@ def demo_complete_pipeline():
         topic_prefix="factory"
     )
     
+    # Output lines, printed in one go after the loop; alerts land
+    # before the table row of the reading that raised them
+    rows = []
+    
     # Subscribe to anomalies
     def on_anomaly(msg: Message):
         data = msg.payload
-        print(f"    🚨 ANOMALY on {msg.topic}: value={data['value']:.2f}, z={data['z_score']:.2f}")
+        rows.append(f"    🚨 ANOMALY on {msg.topic}: value={data['value']:.2f}, z={data['z_score']:.2f}")
     
     broker.subscribe("factory/+/anomaly", on_anomaly)
     
@@ -699,8 +1412,9 @@ def demo_complete_pipeline():
         z_str = f"{result['z_score']:.2f}" if result['z_score'] else "N/A"
         status = "ANOMALY" if result['is_anomaly'] else ""
         
-        print(f"    {i+1:2d}  {value:6.2f}  {result['ema']:6.2f}  "
-              f"{result['sma']:6.2f}  {z_str:>7}  {status}")
+        rows.append(f"    {i+1:2d}  {value:6.2f}  {result['ema']:6.2f}  "
+                    f"{result['sma']:6.2f}  {z_str:>7}  {status}")
+    print("\n".join(rows))
     
     print(f"\n  Pipeline Statistics:")
     print(f"    Readings processed: {pipeline.stats.readings_processed}")
@@ -708,6 +1422,13 @@ def demo_complete_pipeline():
     print(f"    Messages published: {pipeline.stats.messages_published}")
     print(f"    Final mean: {pipeline.stats.current_mean:.2f}")
     print(f"    Final stddev: {pipeline.stats.current_stddev:.2f}")
+    
+    if HAVE_NUMPY:
+        # Same readings through the compiled batch path (no publishing)
+        fast = StreamPipeline(window_size=10, ema_alpha=0.2, anomaly_threshold=2.5)
+        result = fast.process_batch_fast(readings, "temp1", publish=False)
+        print(f"\n  process_batch_fast: {int(result['is_anomaly'].sum())} anomalies, "
+              f"final EMA {result['ema'][-1]:.2f}")
 
 
 def demo_python_alternatives():
@@ -14,8 +14,31 @@ Author: ATP Course - ASE-CSIE Bucharest
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Sequence, Dict
 import math
+import sys
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAVE_NUMPY = False
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAVE_NUMBA = False
+    
+    def njit(*args, **kwargs):
+        """Fallback decorator: run the kernel as plain Python."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Slotted dataclasses (no per-instance __dict__) where supported;
+# Python < 3.10 keeps plain ones
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
 # =============================================================================
 # PART 1: WELFORD'S ONLINE ALGORITHM
@@ -45,6 +68,10 @@ class WelfordState:
                corrected sums of squares and products"
     """
     
+    # Fixed attribute layout: no per-instance __dict__ when one state is
+    # kept per sensor or topic
+    __slots__ = ('count', 'mean', 'M2')
+    
     def __init__(self):
         """Initialise Welford state."""
         self.count: int = 0
@@ -73,6 +100,43 @@ class WelfordState:
         delta2 = value - self.mean  # Note: uses updated mean!
         self.M2 += delta * delta2
     
+    def batch_update(self, values: Sequence[float]) -> None:
+        """
+        Update running statistics with a whole block of values.
+        
+        The block's count, mean and M2 are computed with NumPy in two
+        vectorised passes and merged into the running state with Chan's
+        parallel formula (as in welford_combine), instead of calling
+        update() once per value. Falls back to update() without NumPy.
+        
+        Args:
+            values: New observations (list or array)
+        """
+        if not HAVE_NUMPY:
+            for value in values:
+                self.update(value)
+            return
+        
+        block = np.asarray(values, dtype=np.float64)
+        n2 = block.size
+        if n2 == 0:
+            return
+        mean2 = float(block.mean())
+        dev = block - mean2
+        M2_2 = float(np.dot(dev, dev))
+        
+        if self.count == 0:
+            self.count, self.mean, self.M2 = n2, mean2, M2_2
+            return
+        
+        # Chan's parallel algorithm
+        n1 = self.count
+        delta = mean2 - self.mean
+        combined_count = n1 + n2
+        self.mean += delta * (n2 / combined_count)
+        self.M2 += M2_2 + delta * delta * (n1 * n2 / combined_count)
+        self.count = combined_count
+    
     @property
     def variance(self) -> float:
         """
@@ -140,12 +204,13 @@ def welford_combine(states: List[WelfordState]) -> WelfordState:
             combined.mean = state.mean
             combined.M2 = state.M2
         else:
-            # Chan's parallel algorithm
+            # Chan's parallel algorithm. The mean moves by a fraction of
+            # delta rather than being rebuilt from count * mean products,
+            # which lose precision when counts and means are large
             delta = state.mean - combined.mean
             combined_count = combined.count + state.count
             
-            combined.mean = (combined.count * combined.mean + 
-                           state.count * state.mean) / combined_count
+            combined.mean += delta * (state.count / combined_count)
             
             combined.M2 += state.M2 + delta * delta * (
                 combined.count * state.count / combined_count)
@@ -166,7 +231,13 @@ class AnomalySeverity(Enum):
     CRITICAL = 2
 
 
-@dataclass
+# Module-level aliases: plain global loads on the per-reading path
+_NORMAL = AnomalySeverity.NORMAL
+_WARNING = AnomalySeverity.WARNING
+_CRITICAL = AnomalySeverity.CRITICAL
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class AnomalyResult:
     """Result of anomaly detection."""
     is_anomaly: bool = False
@@ -199,24 +270,72 @@ def detect_anomaly(value: float, mean: float, stddev: float,
     Returns:
         AnomalyResult with detection details
     """
-    result = AnomalyResult(value=value, threshold_used=threshold)
-    
     # Guard against division by zero
     if stddev < 1e-10:
-        return result
+        return AnomalyResult(value=value, threshold_used=threshold)
     
-    result.z_score = (value - mean) / stddev
-    abs_z = abs(result.z_score)
+    z_score = (value - mean) / stddev
+    abs_z = abs(z_score)
     
-    if abs_z > threshold:
-        result.is_anomaly = True
-        # Determine severity based on how far beyond threshold
-        if abs_z > threshold + 1.0:
-            result.severity = AnomalySeverity.CRITICAL
-        else:
-            result.severity = AnomalySeverity.WARNING
+    # Results are built once, with positional fields (is_anomaly,
+    # z_score, severity, value, threshold_used), rather than patched
+    # after construction
+    if not abs_z > threshold:
+        return AnomalyResult(False, z_score, _NORMAL, value, threshold)
     
-    return result
+    # Determine severity based on how far beyond threshold
+    severity = _CRITICAL if abs_z > threshold + 1.0 else _WARNING
+    return AnomalyResult(True, z_score, severity, value, threshold)
+
+
+@njit(cache=True)
+def _adaptive_scan_kernel(values, count, mean, m2, ready, baseline_count,
+                          threshold):
+    """
+    AnomalyDetector.process_and_update over a whole array.
+    
+    Same arithmetic, in the same order, as WelfordState.update and
+    detect_anomaly, so the results are bit-identical to the Python
+    path. z_out is 0.0 where detect_anomaly would not compute a score.
+    
+    Returns (z_out, anomaly, count, mean, m2, ready).
+    """
+    n = values.shape[0]
+    z_out = np.zeros(n)
+    anomaly = np.zeros(n, dtype=np.bool_)
+    
+    for i in range(n):
+        value = values[i]
+        
+        if not ready:
+            # Baseline reading: process() ingests it and checks the
+            # baseline, then process_and_update() ingests it again
+            count += 1
+            delta = value - mean
+            mean += delta / count
+            m2 += delta * (value - mean)
+            ready = count >= baseline_count
+            count += 1
+            delta = value - mean
+            mean += delta / count
+            m2 += delta * (value - mean)
+            continue
+        
+        stddev = np.sqrt(m2 / (count - 1)) if count >= 2 else 0.0
+        if stddev >= 1e-10:
+            z = (value - mean) / stddev
+            z_out[i] = z
+            if abs(z) > threshold:
+                anomaly[i] = True
+                continue
+        
+        # Adapt the baseline with the non-anomalous reading
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        m2 += delta * (value - mean)
+    
+    return z_out, anomaly, count, mean, m2, ready
 
 
 class AnomalyDetector:
@@ -270,6 +389,61 @@ class AnomalyDetector:
         return detect_anomaly(value, self.stats.mean, 
                              self.stats.stddev, self.threshold)
     
+    def process_batch(self, values: Sequence[float]) -> Dict[str, 'np.ndarray']:
+        """
+        Process a block of readings; same results as calling process()
+        on each in turn, returned as columns instead of one
+        AnomalyResult per reading.
+        
+        Readings that still belong to the baseline are ingested with
+        one WelfordState.batch_update() call; the rest are checked
+        against the (then fixed) baseline mean and stddev in one
+        vectorised pass.
+        
+        Args:
+            values: Sensor readings (list or array)
+            
+        Returns:
+            Dictionary of per-reading arrays: value, z_score (0.0 where
+            not computed), is_anomaly and severity (AnomalySeverity
+            values as int8)
+            
+        Raises:
+            ImportError: If numpy is not installed
+        """
+        if not HAVE_NUMPY:
+            raise ImportError("process_batch requires numpy")
+        
+        values = np.asarray(values, dtype=np.float64)
+        start = 0
+        
+        if not self.baseline_ready and values.size:
+            start = min(values.size, max(1, self.baseline_count - self.stats.count))
+            self.stats.batch_update(values[:start])
+            if self.stats.count >= self.baseline_count:
+                self.baseline_ready = True
+        
+        # Baseline readings stay at the defaults (normal, z = 0)
+        z_scores = np.zeros(values.size)
+        is_anomaly = np.zeros(values.size, dtype=np.bool_)
+        severity = np.full(values.size, AnomalySeverity.NORMAL.value, dtype=np.int8)
+        
+        stddev = self.stats.stddev
+        if stddev >= 1e-10:
+            z = (values[start:] - self.stats.mean) / stddev
+            abs_z = np.abs(z)
+            z_scores[start:] = z
+            is_anomaly[start:] = abs_z > self.threshold
+            severity[start:][is_anomaly[start:]] = AnomalySeverity.WARNING.value
+            severity[start:][abs_z > self.threshold + 1.0] = AnomalySeverity.CRITICAL.value
+        
+        return {
+            'value': values,
+            'z_score': z_scores,
+            'is_anomaly': is_anomaly,
+            'severity': severity
+        }
+    
     def process_and_update(self, value: float) -> AnomalyResult:
         """
         Process reading and update statistics (for adaptive baseline).
@@ -291,6 +465,52 @@ class AnomalyDetector:
         
         return result
     
+    def scan_and_update(self, values: Sequence[float]
+                        ) -> List[Tuple[int, AnomalyResult]]:
+        """
+        Run a block of readings through process_and_update().
+        
+        The per-reading loop (Welford update, z-score, adaptive update)
+        runs in one compiled kernel, and AnomalyResult objects are only
+        built for the readings flagged as anomalies. The detector ends
+        in the same state as after calling process_and_update() on each
+        reading.
+        
+        Args:
+            values: Sensor readings (list or array)
+            
+        Returns:
+            (index, AnomalyResult) for each anomalous reading
+            
+        Raises:
+            ImportError: If numpy is not installed
+        """
+        if not HAVE_NUMPY:
+            raise ImportError("scan_and_update requires numpy")
+        
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        stats = self.stats
+        (z, anomaly, stats.count, stats.mean, stats.M2,
+         self.baseline_ready) = _adaptive_scan_kernel(
+            values, stats.count, stats.mean, stats.M2, self.baseline_ready,
+            self.baseline_count, self.threshold)
+        stats.count = int(stats.count)
+        stats.mean = float(stats.mean)
+        stats.M2 = float(stats.M2)
+        self.baseline_ready = bool(self.baseline_ready)
+        
+        found = []
+        for i in np.flatnonzero(anomaly).tolist():
+            z_score = float(z[i])
+            severity = (AnomalySeverity.CRITICAL
+                        if abs(z_score) > self.threshold + 1.0
+                        else AnomalySeverity.WARNING)
+            found.append((i, AnomalyResult(is_anomaly=True, z_score=z_score,
+                                           severity=severity,
+                                           value=float(values[i]),
+                                           threshold_used=self.threshold)))
+        return found
+    
     @property
     def mean(self) -> float:
         """Current mean."""
@@ -308,30 +528,43 @@ class AnomalyDetector:
 
 
 # =============================================================================
-# PART 3: SCIPY ALTERNATIVE
+# PART 3: BATCH ALTERNATIVE (NUMPY)
 # =============================================================================
 
-def scipy_zscore(data: List[float]) -> List[float]:
+def _zscore_arrays(data: Sequence[float]) -> Tuple['np.ndarray', 'np.ndarray']:
+    """Return (values, z-scores) as float64 arrays, one pass each."""
+    if not HAVE_NUMPY:
+        raise ImportError("batch z-scores require numpy")
+    arr = np.asarray(data, dtype=np.float64)
+    mean = arr.mean()
+    return arr, (arr - mean) / arr.std()
+
+
+def batch_zscore(data: List[float]) -> List[float]:
     """
-    Calculate z-scores using scipy (vectorised).
+    Calculate z-scores for a whole data set (vectorised).
     
     This is efficient for batch processing but requires all data
-    to be available upfront.
+    to be available upfront. Same formula and results as
+    scipy.stats.zscore (population stddev, ddof=0), without the
+    scipy dependency.
     
     Args:
         data: List of values
         
     Returns:
         List of z-scores
+        
+    Raises:
+        ImportError: If numpy is not installed
     """
-    from scipy import stats
-    return stats.zscore(data).tolist()
+    return _zscore_arrays(data)[1].tolist()
 
 
-def scipy_detect_outliers(data: List[float], threshold: float = 2.5
-                         ) -> List[Tuple[int, float, float]]:
+def detect_outliers_batch(data: List[float], threshold: float = 2.5
+                          ) -> List[Tuple[int, float, float]]:
     """
-    Detect outliers in batch using scipy.
+    Detect outliers in batch using z-scores over the whole data set.
     
     Args:
         data: List of values
@@ -339,16 +572,15 @@ def scipy_detect_outliers(data: List[float], threshold: float = 2.5
         
     Returns:
         List of (index, value, z_score) for outliers
+        
+    Raises:
+        ImportError: If numpy is not installed
     """
-    from scipy import stats
-    z_scores = stats.zscore(data)
+    arr, z_scores = _zscore_arrays(data)
     
-    outliers = []
-    for i, (val, z) in enumerate(zip(data, z_scores)):
-        if abs(z) > threshold:
-            outliers.append((i, val, z))
-    
-    return outliers
+    # Select the outliers in C; only those are converted to Python
+    idx = np.flatnonzero(np.abs(z_scores) > threshold)
+    return list(zip(idx.tolist(), arr[idx].tolist(), z_scores[idx].tolist()))
 
 
 # =============================================================================
@@ -364,10 +596,9 @@ def demo_welford():
     # Test data
     data = [2.0, 4.0, 4.0, 4.0, 5.0, 5.0, 7.0, 9.0]
     
-    # Welford's algorithm
+    # Welford's algorithm (one vectorised block merge)
     welford = WelfordState()
-    for val in data:
-        welford.update(val)
+    welford.batch_update(data)
     
     print(f"\nData: {data}")
     print(f"\nWelford's algorithm:")
@@ -376,11 +607,11 @@ def demo_welford():
     print(f"  Standard Deviation: {welford.stddev:.4f}")
     
     # Compare with numpy
-    import numpy as np
-    print(f"\nNumPy comparison:")
-    print(f"  Mean: {np.mean(data):.4f}")
-    print(f"  Sample Variance: {np.var(data, ddof=1):.4f}")
-    print(f"  Standard Deviation: {np.std(data, ddof=1):.4f}")
+    if HAVE_NUMPY:
+        print(f"\nNumPy comparison:")
+        print(f"  Mean: {np.mean(data):.4f}")
+        print(f"  Sample Variance: {np.var(data, ddof=1):.4f}")
+        print(f"  Standard Deviation: {np.std(data, ddof=1):.4f}")
     
     # Demonstrate numerical stability with large numbers
     print("\n" + "-" * 40)
@@ -394,7 +625,8 @@ def demo_welford():
         welford2.update(val)
     
     print(f"  Welford variance: {welford2.variance:.10f}")
-    print(f"  NumPy variance:   {np.var(large_data, ddof=1):.10f}")
+    if HAVE_NUMPY:
+        print(f"  NumPy variance:   {np.var(large_data, ddof=1):.10f}")
 
 
 def demo_anomaly_detection():
@@ -416,6 +648,7 @@ def demo_anomaly_detection():
     print(f"\n{'Index':>5} {'Value':>8} {'Status':>12} {'Z-Score':>10} {'Severity':>10}")
     print("-" * 50)
     
+    rows = []
     for i, val in enumerate(readings):
         result = detector.process(val)
         
@@ -428,33 +661,30 @@ def demo_anomaly_detection():
             z_str = f"{result.z_score:.2f}"
             sev_str = result.severity.name
         
-        print(f"{i:>5} {val:>8.1f} {status:>12} {z_str:>10} {sev_str:>10}")
+        rows.append(f"{i:>5} {val:>8.1f} {status:>12} {z_str:>10} {sev_str:>10}")
+    print("\n".join(rows))
     
     print(f"\nBaseline mean: {detector.mean:.2f}")
     print(f"Baseline stddev: {detector.stddev:.2f}")
 
 
-def demo_scipy_comparison():
-    """Show scipy batch processing alternative."""
+def demo_batch_comparison():
+    """Show the vectorised batch processing alternative."""
     print("\n" + "=" * 60)
-    print("SCIPY BATCH PROCESSING COMPARISON")
+    print("BATCH PROCESSING COMPARISON")
     print("=" * 60)
     
-    try:
-        data = [22.1, 22.3, 21.8, 22.0, 22.2, 21.9, 22.1, 45.0, 22.0, -5.0]
-        
-        outliers = scipy_detect_outliers(data, threshold=2.5)
-        
-        print(f"\nData: {data}")
-        print(f"\nOutliers detected (threshold=2.5):")
-        for idx, val, z in outliers:
-            print(f"  Index {idx}: value={val:.1f}, z-score={z:.2f}")
-        
-    except ImportError:
-        print("scipy not installed - skipping batch demo")
+    data = [22.1, 22.3, 21.8, 22.0, 22.2, 21.9, 22.1, 45.0, 22.0, -5.0]
+    
+    outliers = detect_outliers_batch(data, threshold=2.5)
+    
+    print(f"\nData: {data}")
+    print(f"\nOutliers detected (threshold=2.5):")
+    for idx, val, z in outliers:
+        print(f"  Index {idx}: value={val:.1f}, z-score={z:.2f}")
 
 
 if __name__ == "__main__":
     demo_welford()
     demo_anomaly_detection()
-    demo_scipy_comparison()
+    demo_batch_comparison()
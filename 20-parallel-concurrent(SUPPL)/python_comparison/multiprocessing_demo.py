@@ -30,14 +30,42 @@ NOTE: This file is for educational comparison only, not for execution
 =============================================================================
 """
 
+import atexit
 import multiprocessing as mp
-from multiprocessing import Pool, Process, Queue, Pipe, Value, Array, Manager
-from multiprocessing import Lock, Semaphore, Barrier, Event
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import Process, Pipe, RawArray
+from multiprocessing import Lock, BoundedSemaphore, Barrier, Event
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
 import time
 import random
 import os
-from typing import List, Tuple, Any
+import sys
+from collections import Counter
+from typing import Iterable, List, Tuple, Any
+
+try:
+    import numpy as np
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAVE_NUMBA = False
+    
+    def njit(*args, **kwargs):
+        """Fallback decorator: run the kernel as plain Python."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Scale factor for the simulated per-item work in the queue and pipe demos.
+# 0 (the default) skips the sleeps, so those demos measure only the
+# communication cost; DEMO_DELAY=1 restores the paced, readable output
+_DELAY = float(os.environ.get("DEMO_DELAY", "0"))
+
+
+def _pause(lo: float, hi: float) -> None:
+    """Sleep for a random time in [lo, hi] seconds, scaled by DEMO_DELAY."""
+    if _DELAY:
+        time.sleep(random.uniform(lo, hi) * _DELAY)
 
 # =============================================================================
 # BASIC PROCESS CREATION
@@ -92,6 +120,50 @@ def basic_process_example():
 # PROCESS POOL
 # =============================================================================
 
+_POOL = None
+
+
+def _pin_to_cpu(index: int) -> None:
+    """
+    Pin the calling process to one of its allowed CPUs, round-robin by index.
+    
+    A process the scheduler migrates to another core starts there with a
+    cold L1/L2 cache. C equivalent: sched_setaffinity() with a one-CPU
+    mask. A no-op where it is unavailable (macOS, Windows).
+    """
+    if hasattr(os, 'sched_setaffinity'):
+        cpus = sorted(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, {cpus[index % len(cpus)]})
+
+
+def _pin_pool_worker(next_index) -> None:
+    """Pool initialiser: take the next worker index and pin to its CPU."""
+    with next_index.get_lock():
+        index = next_index.value
+        next_index.value += 1
+    _pin_to_cpu(index)
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """
+    Return the module's process pool, creating it on first use.
+    
+    Starting a worker process costs a fork (or a fresh interpreter and
+    imports under spawn), so the demos share one pool instead of each
+    paying that again. Each worker is pinned to its own CPU. It is shut
+    down at interpreter exit.
+    """
+    global _POOL
+    if _POOL is None:
+        ctx = (mp.get_context('fork') if 'fork' in mp.get_all_start_methods()
+               else mp.get_context())
+        _POOL = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=ctx,
+                                    initializer=_pin_pool_worker,
+                                    initargs=(ctx.Value('i', 0),))
+        atexit.register(_POOL.shutdown)
+    return _POOL
+
+
 def compute_intensive_task(n: int) -> Tuple[int, int]:
     """CPU-intensive task that benefits from multiprocessing."""
     # Compute sum of squares (simulating heavy computation)
@@ -112,11 +184,10 @@ def process_pool_example():
     
     numbers = [10000000, 20000000, 15000000, 25000000]
     
-    print("Using Pool.map() for parallel computation...")
+    print("Using the shared pool's map() for parallel computation...")
     start = time.time()
     
-    with Pool(processes=4) as pool:
-        results = pool.map(compute_intensive_task, numbers)
+    results = list(get_pool().map(compute_intensive_task, numbers))
     
     elapsed = time.time() - start
     
@@ -137,47 +208,98 @@ def process_pool_example():
 # INTER-PROCESS COMMUNICATION: QUEUE
 # =============================================================================
 
-def producer_with_queue(queue: Queue, num_items: int):
-    """Producer process that puts items in a queue."""
+LOG_FLUSH_LINES = 16
+
+
+def _log(buf: List[str], line: str) -> None:
+    """Queue a log line; write the buffer out once it holds enough lines."""
+    buf.append(line)
+    if len(buf) >= LOG_FLUSH_LINES:
+        _flush_log(buf)
+
+
+def _flush_log(buf: List[str]) -> None:
+    """
+    Write all buffered log lines with a single write() and flush.
+    
+    print() per line takes the stdout lock and, on a terminal, issues a
+    write() system call each time; between sends and receives that
+    means an extra kernel round trip per item.
+    """
+    if buf:
+        sys.stdout.write("\n".join(buf) + "\n")
+        sys.stdout.flush()
+        buf.clear()
+
+
+def producer_with_queue(conn, num_items: int, batch_size: int = 64):
+    """
+    Producer process that sends items through a one-way pipe in batches.
+    
+    One send() per batch instead of one put() per item: each send is a
+    single pickle and write() on the pipe.
+    """
     pid = os.getpid()
+    log = []
+    batch = []
     for i in range(num_items):
         item = f"Item-{i} from PID {pid}"
-        queue.put(item)
-        print(f"  Producer ({pid}): sent {item}")
-        time.sleep(random.uniform(0.1, 0.3))
-    queue.put(None)  # Poison pill
-
-
-def consumer_with_queue(queue: Queue):
-    """Consumer process that gets items from a queue."""
+        batch.append(item)
+        _log(log, f"  Producer ({pid}): queued {item}")
+        if len(batch) == batch_size:
+            conn.send(batch)
+            batch = []
+        _pause(0.1, 0.3)
+    if batch:
+        conn.send(batch)
+    conn.close()  # End of stream: the consumer's recv() raises EOFError
+    _flush_log(log)
+
+
+def consumer_with_queue(conn):
+    """Consumer process that receives batches of items until EOF."""
     pid = os.getpid()
+    log = []
     while True:
-        item = queue.get()
-        if item is None:
-            print(f"  Consumer ({pid}): received shutdown signal")
+        try:
+            batch = conn.recv()
+        except EOFError:
+            _log(log, f"  Consumer ({pid}): producer closed the pipe")
             break
-        print(f"  Consumer ({pid}): received {item}")
-        time.sleep(random.uniform(0.1, 0.2))
+        for item in batch:
+            _log(log, f"  Consumer ({pid}): received {item}")
+            _pause(0.1, 0.2)
+    conn.close()
+    _flush_log(log)
 
 
 def queue_example():
     """
-    Inter-process communication using Queue.
+    Single-producer/single-consumer queue over a one-way Pipe.
     
-    Similar to message passing between processes.
-    The Queue handles synchronisation automatically.
+    Similar to message passing between processes. multiprocessing.Queue
+    would also work, but it adds a feeder thread and a lock to every
+    put(), which only pays off with several producers or consumers.
+    With exactly one of each, a Pipe(duplex=False) carrying batches of
+    items is the same FIFO with far fewer system calls.
     """
     print("\n" + "="*60)
     print("INTER-PROCESS QUEUE COMMUNICATION")
     print("="*60 + "\n")
     
-    queue = Queue()
+    recv_conn, send_conn = Pipe(duplex=False)
     
-    producer = Process(target=producer_with_queue, args=(queue, 5))
-    consumer = Process(target=consumer_with_queue, args=(queue,))
+    producer = Process(target=producer_with_queue, args=(send_conn, 5))
+    consumer = Process(target=consumer_with_queue, args=(recv_conn,))
     
+    # No sentinel message: the consumer sees EOF once every write end is
+    # closed. So the parent drops its copy of the write end before the
+    # consumer is forked (otherwise the consumer would inherit one and
+    # never see EOF) - the same fd hygiene as pipe() + fork() in C
     producer.start()
+    send_conn.close()
     consumer.start()
+    recv_conn.close()
     
     producer.join()
     consumer.join()
@@ -190,21 +312,25 @@ def queue_example():
 def sender_with_pipe(conn):
     """Process that sends data through a pipe."""
     messages = ["Hello", "World", "From", "Pipe", "END"]
+    log = []
     for msg in messages:
         conn.send(msg)
-        print(f"  Sender: sent '{msg}'")
-        time.sleep(0.2)
+        _log(log, f"  Sender: sent '{msg}'")
+        _pause(0.2, 0.2)
     conn.close()
+    _flush_log(log)
 
 
 def receiver_with_pipe(conn):
     """Process that receives data from a pipe."""
+    log = []
     while True:
         msg = conn.recv()
-        print(f"  Receiver: got '{msg}'")
+        _log(log, f"  Receiver: got '{msg}'")
         if msg == "END":
             break
     conn.close()
+    _flush_log(log)
 
 
 def pipe_example():
@@ -236,11 +362,20 @@ def pipe_example():
 # SHARED MEMORY
 # =============================================================================
 
-def increment_shared_value(shared_val, lock, iterations: int):
-    """Increment a shared value safely using a lock."""
+def count_into_slot(slots, index: int, iterations: int):
+    """
+    Lock-free counting: each worker owns one slot of a shared array.
+    
+    No two processes ever write the same slot, so no lock or atomic
+    instruction is needed; the reader sums the slots once the workers
+    are done (a "statistical counter"). A single shared counter would
+    instead serialise every worker on one lock and one cache line.
+    """
+    _pin_to_cpu(index)
+    local = 0
     for _ in range(iterations):
-        with lock:
-            shared_val.value += 1
+        local += 1
+    slots[index] = local
 
 
 def shared_memory_example():
@@ -249,26 +384,29 @@ def shared_memory_example():
     
     C equivalent:
         // Using mmap or shmget/shmat
-        int *shared = mmap(NULL, sizeof(int), PROT_READ | PROT_WRITE,
+        int *shared = mmap(NULL, 4 * sizeof(int64_t), PROT_READ | PROT_WRITE,
                            MAP_SHARED | MAP_ANONYMOUS, -1, 0);
         
     Python's Value and Array provide typed shared memory with
-    synchronisation built in.
+    synchronisation built in. RawValue/RawArray are the same memory
+    without the internal lock, for when no two processes write the same
+    element - as with the per-worker counters below.
     """
     print("\n" + "="*60)
     print("SHARED MEMORY EXAMPLE")
     print("="*60 + "\n")
     
-    # Shared value with type 'i' (int)
-    shared_counter = Value('i', 0)
-    lock = Lock()
+    # One counter slot per worker, summed after join(): partition the
+    # data first, so there is nothing left to synchronise
+    num_workers = 4
     iterations = 10000
+    slots = RawArray('q', num_workers)    # 'q' = int64
     
     processes = []
-    for _ in range(4):
+    for i in range(num_workers):
         p = Process(
-            target=increment_shared_value,
-            args=(shared_counter, lock, iterations)
+            target=count_into_slot,
+            args=(slots, i, iterations)
         )
         processes.append(p)
         p.start()
@@ -276,12 +414,14 @@ def shared_memory_example():
     for p in processes:
         p.join()
     
-    print(f"  Final counter value: {shared_counter.value}")
-    print(f"  Expected value: {iterations * 4}")
+    print(f"  Final counter value: {sum(slots)}")
+    print(f"  Expected value: {iterations * num_workers}")
     
     # Shared array example
     print("\n  Shared array example:")
-    shared_array = Array('d', [0.0, 0.0, 0.0, 0.0])  # 'd' = double
+    # Raw: each process writes only its own index, so Array's lock would
+    # be taken on every write for nothing. RawArray is zero-initialised
+    shared_array = RawArray('d', 4)  # 'd' = double
     
     def modify_array(arr, idx):
         arr[idx] = os.getpid()
@@ -299,39 +439,42 @@ def shared_memory_example():
 
 
 # =============================================================================
-# MANAGER FOR COMPLEX SHARED STATE
+# SHARED KEY/VALUE STATE
 # =============================================================================
 
-def update_dict(shared_dict, key: str, value: int):
-    """Update a shared dictionary."""
-    shared_dict[key] = value
-    print(f"  Process {os.getpid()}: set {key} = {value}")
+def update_slot(keys, values, index: int, value: int):
+    """Write one value into the slot this process owns."""
+    values[index] = value
+    print(f"  Process {os.getpid()}: set {keys[index]} = {value}")
 
 
-def manager_example():
+def shareable_list_example():
     """
-    Manager for sharing complex objects between processes.
+    Fixed-size key/value state in shared memory.
     
-    Managers provide proxy objects that can be shared:
-    - dict, list, Namespace
-    - Queue, Event, Lock, etc.
+    A Manager().dict() would also work, but every item assignment on its
+    proxy is pickled and sent over a socket to the manager's server
+    process. When the keys are known up front, ShareableList keeps the
+    keys and values directly in shared memory, and since each process
+    owns exactly one index, no lock is needed either.
     
-    Higher overhead but more flexibility than Value/Array.
+    Use a Manager when the shape of the shared state is not fixed
+    (arbitrary dict/list growth, nested objects, Namespace).
     """
     print("\n" + "="*60)
-    print("MANAGER FOR COMPLEX SHARED STATE")
+    print("SHARED KEY/VALUE STATE")
     print("="*60 + "\n")
     
-    with Manager() as manager:
-        shared_dict = manager.dict()
-        shared_list = manager.list()
-        
-        # Multiple processes updating shared dict
+    keys = shared_memory.ShareableList([f"key_{i}" for i in range(4)])
+    values = shared_memory.ShareableList([0] * 4)
+    try:
+        # Multiple processes each writing their own slot (the lists are
+        # pickled by name and re-attached in the child)
         processes = []
         for i in range(4):
             p = Process(
-                target=update_dict,
-                args=(shared_dict, f"key_{i}", i * 100)
+                target=update_slot,
+                args=(keys, values, i, i * 100)
             )
             processes.append(p)
             p.start()
@@ -339,7 +482,11 @@ def manager_example():
         for p in processes:
             p.join()
         
-        print(f"\n  Final dictionary: {dict(shared_dict)}")
+        print(f"\n  Final dictionary: {dict(zip(keys, values))}")
+    finally:
+        for sl in (keys, values):
+            sl.shm.close()
+            sl.shm.unlink()
 
 
 # =============================================================================
@@ -347,10 +494,14 @@ def manager_example():
 # =============================================================================
 
 def heavy_computation(n: int) -> int:
-    """Simulate heavy computation."""
-    result = 0
-    for i in range(n):
-        result += i * i
+    """
+    Simulate heavy computation.
+    
+    The sum of i*i for i in [0, n) has the closed form
+    (n - 1) * n * (2n - 1) / 6, so it costs O(1) rather than n loop
+    iterations; the sleep stands in for the actual work.
+    """
+    result = (n - 1) * n * (2 * n - 1) // 6
     time.sleep(0.5)
     return result
 
@@ -361,6 +512,11 @@ def process_pool_executor_example():
     
     Similar to ThreadPoolExecutor but with true parallelism.
     This is the recommended approach for CPU-bound tasks.
+    
+    executor.map() with a chunksize pickles and dispatches a whole chunk
+    of inputs per work item, where a submit() per input costs one each.
+    Use submit() + as_completed() when results must be handled in the
+    order they finish rather than in input order.
     """
     print("\n" + "="*60)
     print("PROCESS POOL EXECUTOR WITH FUTURES")
@@ -368,46 +524,227 @@ def process_pool_executor_example():
     
     numbers = [1000000, 2000000, 1500000, 2500000, 3000000]
     
-    with ProcessPoolExecutor(max_workers=4) as executor:
-        # Submit all tasks
-        future_to_num = {
-            executor.submit(heavy_computation, n): n
-            for n in numbers
-        }
-        
-        # Collect results as they complete
-        for future in as_completed(future_to_num):
-            n = future_to_num[future]
-            try:
-                result = future.result()
-                print(f"  computation({n}) = {result}")
-            except Exception as exc:
-                print(f"  computation({n}) raised {exc}")
+    executor = get_pool()
+    chunksize = max(1, len(numbers) // (os.cpu_count() or 1))
+    
+    # Results come back in input order
+    try:
+        results = executor.map(heavy_computation, numbers, chunksize=chunksize)
+        for n, result in zip(numbers, results):
+            print(f"  computation({n}) = {result}")
+    except Exception as exc:
+        print(f"  computation raised {exc}")
 
 
 # =============================================================================
 # MAP-REDUCE PATTERN
 # =============================================================================
 
-def map_function(chunk: str) -> dict:
-    """Map function: count words in a chunk."""
-    word_counts = {}
-    for word in chunk.lower().split():
-        word = ''.join(c for c in word if c.isalpha())
+def _clean_counts(raw: Counter) -> Counter:
+    """
+    Reduce raw token counts to counts of alphabetic-only words.
+    
+    Each distinct token is cleaned once, keeping its isalpha()
+    characters; tokens left empty are dropped, and the counts of tokens
+    that clean to the same word ("dog", "dog.") are added together.
+    """
+    result = Counter()
+    for token, count in raw.items():
+        word = ''.join(filter(str.isalpha, token))
         if word:
-            word_counts[word] = word_counts.get(word, 0) + 1
-    return word_counts
+            result[word] += count
+    return result
 
 
-def reduce_function(counts: List[dict]) -> dict:
-    """Reduce function: merge word counts."""
-    result = {}
+def map_function(chunk: str) -> dict:
+    """
+    Map function: count words in a chunk.
+    
+    lower(), split() and Counter() count the raw tokens in C; the
+    per-character clean-up then runs once per distinct token rather
+    than once per word.
+    """
+    return _clean_counts(Counter(chunk.lower().split()))
+
+
+def reduce_function(counts: Iterable[dict]) -> dict:
+    """
+    Reduce function: merge word counts.
+    
+    Accepts any iterable, so it can consume partial counts one at a time
+    as the workers produce them.
+    """
+    result = Counter()
     for count_dict in counts:
-        for word, count in count_dict.items():
-            result[word] = result.get(word, 0) + count
+        result.update(count_dict)
     return result
 
 
+_FNV_OFFSET = 0xcbf29ce484222325
+_FNV_PRIME = 0x100000001b3
+
+if HAVE_NUMBA:
+    # Bytes that str.split() treats as whitespace. Bytes >= 0x80 are never
+    # split on, so a token never ends inside a UTF-8 sequence
+    _IS_SPACE = np.array([chr(b).isspace() for b in range(128)] + [False] * 128,
+                         dtype=np.bool_)
+    _FNV_OFFSET = np.uint64(_FNV_OFFSET)
+    _FNV_PRIME = np.uint64(_FNV_PRIME)
+
+
+@njit(cache=True)
+def _insert_tokens(buf, is_space, i, hashes, starts, ends, counts, used):
+    """
+    Count tokens from byte i on until the end or the table is half full.
+    
+    Tokens are hashed with FNV-1a into an open-addressing table (linear
+    probing); equal hashes are confirmed by comparing bytes, so collisions
+    never merge two tokens.
+    
+    Returns:
+        (i, used): where the scan stopped and the number of used slots
+    """
+    mask = hashes.size - 1
+    n = buf.size
+    while i < n and 2 * used <= hashes.size:
+        while i < n and is_space[buf[i]]:
+            i += 1
+        if i == n:
+            break
+        lo = i
+        h = _FNV_OFFSET
+        while i < n and not is_space[buf[i]]:
+            h = (h ^ np.uint64(buf[i])) * _FNV_PRIME
+            i += 1
+        length = i - lo
+        
+        slot = np.int64(h & np.uint64(mask))
+        while counts[slot] != 0:
+            if hashes[slot] == h and ends[slot] - starts[slot] == length:
+                other = starts[slot]
+                k = 0
+                while k < length and buf[other + k] == buf[lo + k]:
+                    k += 1
+                if k == length:
+                    break
+            slot = (slot + 1) & mask
+        if counts[slot] == 0:
+            hashes[slot] = h
+            starts[slot] = lo
+            ends[slot] = i
+            used += 1
+        counts[slot] += 1
+    return i, used
+
+
+@njit(cache=True)
+def _count_tokens_kernel(buf, is_space):
+    """
+    Count the distinct whitespace-separated tokens of a byte buffer.
+    
+    The table starts small and doubles whenever it is half full; the
+    growth is kept out of _insert_tokens() so that its hot loop works on
+    arrays that never change.
+    
+    Returns:
+        (starts, ends, counts): byte range of one occurrence of each
+        distinct token and how often it occurs
+    """
+    cap = 1024
+    hashes = np.zeros(cap, dtype=np.uint64)
+    starts = np.zeros(cap, dtype=np.int64)
+    ends = np.zeros(cap, dtype=np.int64)
+    counts = np.zeros(cap, dtype=np.int64)    # 0 marks an empty slot
+    used = 0
+    i = 0
+    while True:
+        i, used = _insert_tokens(buf, is_space, i,
+                                 hashes, starts, ends, counts, used)
+        if 2 * used <= cap:
+            break
+        
+        cap *= 2
+        new_hashes = np.zeros(cap, dtype=np.uint64)
+        new_starts = np.zeros(cap, dtype=np.int64)
+        new_ends = np.zeros(cap, dtype=np.int64)
+        new_counts = np.zeros(cap, dtype=np.int64)
+        for j in range(counts.size):
+            if counts[j] != 0:
+                slot = np.int64(hashes[j] & np.uint64(cap - 1))
+                while new_counts[slot] != 0:
+                    slot = (slot + 1) & (cap - 1)
+                new_hashes[slot] = hashes[j]
+                new_starts[slot] = starts[j]
+                new_ends[slot] = ends[j]
+                new_counts[slot] = counts[j]
+        hashes, starts, ends, counts = (
+            new_hashes, new_starts, new_ends, new_counts)
+    
+    keep = counts != 0
+    return starts[keep], ends[keep], counts[keep]
+
+
+def map_bytes(chunk) -> dict:
+    """
+    Map function over UTF-8 bytes: same counts as map_function().
+    
+    The compiled kernel finds and counts the raw tokens; only one
+    occurrence of each distinct token ("The", "the", "dog." ...) is then
+    decoded and normalised like map_function() does, and the counts of
+    tokens that normalise to the same word are added together.
+    """
+    buf = np.frombuffer(chunk, dtype=np.uint8)
+    starts, ends, counts = _count_tokens_kernel(buf, _IS_SPACE)
+    raw = Counter()
+    for lo, hi, count in zip(starts.tolist(), ends.tolist(), counts.tolist()):
+        token = bytes(chunk[lo:hi]).decode('utf-8')
+        for word in token.lower().split():
+            raw[word] += count
+    return _clean_counts(raw)
+
+
+# The encoded text the map workers read from. Under fork it is set in the
+# parent before the pool starts and inherited copy-on-write; otherwise
+# _attach_text() points it at a shared memory block, once per worker
+_shared_text = None
+_shared_block = None
+
+
+def _attach_text(shm_name: str) -> None:
+    """Pool initialiser: attach to the shared text block by name."""
+    global _shared_text, _shared_block
+    _shared_block = shared_memory.SharedMemory(name=shm_name)
+    _shared_text = _shared_block.buf
+
+
+def map_shared_slice(span: Tuple[int, int]) -> dict:
+    """Map function over bytes [lo, hi) of the shared text."""
+    lo, hi = span
+    if HAVE_NUMBA:
+        return map_bytes(_shared_text[lo:hi])
+    return map_function(bytes(_shared_text[lo:hi]).decode('utf-8'))
+
+
+def split_on_whitespace(data: bytes, parts: int) -> List[Tuple[int, int]]:
+    """
+    Split data into at most `parts` balanced (lo, hi) byte ranges.
+    
+    Each cut is moved forward to the next whitespace byte, so no word
+    (and no multi-byte UTF-8 character) straddles two ranges.
+    """
+    n = len(data)
+    spans = []
+    lo = 0
+    for k in range(1, parts + 1):
+        hi = n if k == parts else max(lo, k * n // parts)
+        while hi < n and not data[hi:hi + 1].isspace():
+            hi += 1
+        if hi > lo:
+            spans.append((lo, hi))
+        lo = hi
+    return spans
+
+
 def mapreduce_example():
     """
     Simple Map-Reduce implementation using multiprocessing.
@@ -427,31 +764,56 @@ def mapreduce_example():
     The early bird catches the worm.
     """ * 100
     
-    # Split into chunks
-    words = text.split()
-    chunk_size = len(words) // 4
-    chunks = [
-        ' '.join(words[i:i + chunk_size])
-        for i in range(0, len(words), chunk_size)
-    ]
-    
-    print(f"  Processing {len(words)} words in {len(chunks)} chunks")
-    
-    # Map phase (parallel)
-    print("\n  Map phase...")
-    with Pool(processes=4) as pool:
-        mapped_results = pool.map(map_function, chunks)
-    
-    # Reduce phase
-    print("  Reduce phase...")
-    final_counts = reduce_function(mapped_results)
-    
-    # Display top 10
+    # Encode once and hand the workers byte offsets: only small (lo, hi)
+    # tuples are pickled, never the chunk text itself
+    global _shared_text
+    data = text.encode('utf-8')
+    num_workers = 4
+    chunks = split_on_whitespace(data, num_workers)
+    
+    # A dedicated pool rather than get_pool(): its workers must be forked
+    # after the input exists for them to inherit it
+    if 'fork' in mp.get_all_start_methods():
+        # C equivalent: fork() after building the input - the children
+        # share the parent's pages until someone writes to them
+        ctx = mp.get_context('fork')
+        _shared_text = data
+        shm = None
+        pool_args = {}
+    else:
+        # spawn only: copy the text into a named block the workers attach
+        # to. C equivalent: shm_open() + mmap()
+        ctx = mp.get_context()
+        shm = shared_memory.SharedMemory(create=True, size=len(data))
+        shm.buf[:len(data)] = data
+        pool_args = {'initializer': _attach_text, 'initargs': (shm.name,)}
+    
+    print(f"  Processing {len(text.split())} words in {len(chunks)} chunks")
+    
+    # Map phase (parallel), reduced as results arrive: imap_unordered
+    # yields each partial count as soon as any worker finishes it, so
+    # reducing overlaps with mapping and the partials are never all held
+    # at once, unlike pool.map()
+    print("\n  Map and reduce phases (streamed)...")
+    chunksize = max(1, len(chunks) // (num_workers * 4))
+    try:
+        with ctx.Pool(processes=num_workers, **pool_args) as pool:
+            final_counts = reduce_function(
+                pool.imap_unordered(map_shared_slice, chunks,
+                                    chunksize=chunksize)
+            )
+    finally:
+        _shared_text = None
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+    
+    # Display top 10 (ties broken alphabetically: partial counts arrive in
+    # completion order, so insertion order is not reproducible)
     print("\n  Top 10 words:")
     sorted_counts = sorted(
         final_counts.items(),
-        key=lambda x: x[1],
-        reverse=True
+        key=lambda x: (-x[1], x[0])
     )[:10]
     
     for word, count in sorted_counts:
@@ -491,12 +853,16 @@ def sync_primitives_example():
     for p in procs:
         p.join()
     
-    # Semaphore
+    # Semaphore (bounded: a release() without a matching acquire() raises
+    # instead of silently letting a third process in)
     print("\n  2. Semaphore example:")
-    sem = Semaphore(2)
+    sem = BoundedSemaphore(2)
     
     def with_semaphore(name: str, sem):
-        sem.acquire()
+        # Give up rather than block forever if a holder never releases
+        if not sem.acquire(timeout=5.0):
+            print(f"     {name} timed out waiting for semaphore")
+            return
         print(f"     {name} acquired semaphore")
         time.sleep(0.3)
         print(f"     {name} releasing semaphore")
@@ -511,23 +877,27 @@ def sync_primitives_example():
     for p in procs:
         p.join()
     
-    # Event
+    # Event (with a Barrier instead of a sleep: main sets the event once
+    # every child is known to be waiting, not after a guessed delay)
     print("\n  3. Event example:")
     event = Event()
+    num_waiters = 3
+    ready = Barrier(num_waiters + 1)    # the children plus main
     
-    def wait_for_event(name: str, event):
+    def wait_for_event(name: str, event, ready):
         print(f"     {name} waiting for event...")
+        ready.wait()
         event.wait()
         print(f"     {name} event received!")
     
     procs = [
-        Process(target=wait_for_event, args=(f"P{i}", event))
-        for i in range(3)
+        Process(target=wait_for_event, args=(f"P{i}", event, ready))
+        for i in range(num_waiters)
     ]
     for p in procs:
         p.start()
     
-    time.sleep(1)
+    ready.wait()
     print("     Main: setting event")
     event.set()
     
@@ -594,7 +964,7 @@ def main():
     queue_example()
     pipe_example()
     shared_memory_example()
-    manager_example()
+    shareable_list_example()
     process_pool_executor_example()
     mapreduce_example()
     sync_primitives_example()
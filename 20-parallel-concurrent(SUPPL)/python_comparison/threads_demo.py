@@ -32,13 +32,123 @@ NOTE: This file is for educational comparison only, not for execution
 =============================================================================
 """
 
+import atexit
+import sys
+import os
 import threading
 import queue
 import time
+import multiprocessing
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Callable, Any
+from functools import partial
+from typing import Iterable, List, Callable, Any, Optional
+import itertools
+import math
 import random
 
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAVE_NUMBA = False
+    
+    def njit(*args, **kwargs):
+        """Fallback decorator: run the kernel as plain Python."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# All output goes through one queue drained by a single writer thread.
+# Demo threads only enqueue a finished line (one C-level put, no stdout
+# lock or system call), lines from concurrent threads cannot tear, and
+# the writer emits whatever has accumulated with one write()
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_LOG_STOP = object()
+
+
+def _drain_log() -> None:
+    """Writer thread: copy queued text to stdout until _LOG_STOP."""
+    while True:
+        parts = [_log_queue.get()]
+        while True:
+            try:
+                parts.append(_log_queue.get_nowait())
+            except queue.Empty:
+                break
+        stop = False
+        text = []
+        for part in parts:
+            if part is _LOG_STOP:
+                stop = True
+            elif isinstance(part, threading.Event):
+                # A flush marker: everything queued before it is in text
+                sys.stdout.write("".join(text))
+                sys.stdout.flush()
+                text = []
+                part.set()
+            else:
+                text.append(part)
+        sys.stdout.write("".join(text))
+        sys.stdout.flush()
+        if stop:
+            return
+
+
+# Set by main(quiet=True): drop all demo output (for timing runs)
+_quiet = False
+
+# Banner rules, built once rather than in every demo
+_RULE = "=" * 60
+_RULE_ABOVE = "\n" + _RULE
+_RULE_BELOW = _RULE + "\n"
+
+
+def _write(text: str) -> None:
+    """Queue text for the writer thread."""
+    if not _quiet:
+        _log_queue.put(text)
+
+
+def _print(*args, sep: str = " ", end: str = "\n") -> None:
+    """print() through the writer thread."""
+    if not _quiet:
+        _log_queue.put(sep.join(map(str, args)) + end)
+
+
+def _flush_log() -> None:
+    """Block until everything queued so far has been written."""
+    done = threading.Event()
+    _log_queue.put(done)
+    done.wait()
+
+
+def _stop_log() -> None:
+    """Flush the queue and stop the writer thread (at interpreter exit)."""
+    _log_queue.put(_LOG_STOP)
+    _log_thread.join()
+
+
+_log_thread = threading.Thread(target=_drain_log, name="log-writer",
+                               daemon=True)
+_log_thread.start()
+atexit.register(_stop_log)
+
+
+# Worker threads shared by the demos: created on first use and reused
+# afterwards, instead of a new OS thread per task in every demo. Large
+# enough for every blocking task to have its own thread (the barrier
+# demo deadlocks otherwise), even with all demos running at once
+_POOL = ThreadPoolExecutor(max_workers=32)
+atexit.register(_POOL.shutdown, wait=True)
+
+
+def _run_on_pool(*calls) -> None:
+    """Run each (fn, *args) call on the shared pool and wait for all."""
+    futures = [_POOL.submit(*call) for call in calls]
+    for future in futures:
+        future.result()
+
+
 # =============================================================================
 # BASIC THREADING
 # =============================================================================
@@ -52,14 +162,14 @@ def basic_thread_example():
         pthread_create(&thread, NULL, worker, &arg);
         pthread_join(thread, NULL);
     """
-    print("\n" + "="*60)
-    print("BASIC THREADING")
-    print("="*60 + "\n")
+    _print(_RULE_ABOVE)
+    _print("BASIC THREADING")
+    _print(_RULE_BELOW)
     
     def worker(name: str, duration: float) -> None:
-        print(f"  Thread {name} starting (will run {duration:.1f}s)")
+        _print(f"  Thread {name} starting (will run {duration:.1f}s)")
         time.sleep(duration)
-        print(f"  Thread {name} completed")
+        _print(f"  Thread {name} completed")
     
     # Create threads
     threads = []
@@ -75,7 +185,7 @@ def basic_thread_example():
     for t in threads:
         t.join()
     
-    print("\nAll threads completed")
+    _print("\nAll threads completed")
 
 
 # =============================================================================
@@ -92,9 +202,9 @@ def mutex_example():
         // critical section
         pthread_mutex_unlock(&mutex);
     """
-    print("\n" + "="*60)
-    print("MUTEX (LOCK) EXAMPLE")
-    print("="*60 + "\n")
+    _print(_RULE_ABOVE)
+    _print("MUTEX (LOCK) EXAMPLE")
+    _print(_RULE_BELOW)
     
     counter = 0
     counter_lock = threading.Lock()
@@ -107,31 +217,36 @@ def mutex_example():
             counter += 1  # NOT atomic!
     
     def increment_safe(n: int) -> None:
-        """Safe increment using lock."""
+        """Safe increment: count locally, then commit once under the lock."""
         nonlocal counter
+        local = 0
         for _ in range(n):
-            with counter_lock:  # Equivalent to lock/unlock
-                counter += 1
+            local += 1
+        with counter_lock:  # Equivalent to lock/unlock
+            counter += local
+    
+    def increment_count(ticks, n: int) -> None:
+        """Lock-free increment: next() on itertools.count is one C call."""
+        for _ in range(n):
+            next(ticks)
     
     # Test unsafe version
     counter = 0
-    threads = [threading.Thread(target=increment_unsafe, args=(iterations,)) 
-               for _ in range(4)]
-    for t in threads:
-        t.start()
-    for t in threads:
-        t.join()
-    print(f"  Unsafe result: {counter} (expected {iterations * 4})")
+    _run_on_pool(*[(increment_unsafe, iterations)] * 4)
+    _print(f"  Unsafe result: {counter} (expected {iterations * 4})")
     
     # Test safe version
     counter = 0
-    threads = [threading.Thread(target=increment_safe, args=(iterations,)) 
-               for _ in range(4)]
-    for t in threads:
-        t.start()
-    for t in threads:
-        t.join()
-    print(f"  Safe result:   {counter} (expected {iterations * 4})")
+    _run_on_pool(*[(increment_safe, iterations)] * 4)
+    _print(f"  Safe result:   {counter} (expected {iterations * 4})")
+    
+    # Same count without a lock. Under the GIL a call into C code such as
+    # count.__next__ cannot be interrupted midway, so the read-increment-
+    # write that races above happens as one step - the Python analogue of
+    # atomic_fetch_add() in C11
+    ticks = itertools.count()
+    _run_on_pool(*[(increment_count, ticks, iterations)] * 4)
+    _print(f"  Counter result: {next(ticks)} (expected {iterations * 4})")
 
 
 # =============================================================================
@@ -148,29 +263,22 @@ def semaphore_example():
         sem_wait(&sem);        // Decrement (block if 0)
         sem_post(&sem);        // Increment
     """
-    print("\n" + "="*60)
-    print("SEMAPHORE EXAMPLE")
-    print("="*60 + "\n")
+    _print(_RULE_ABOVE)
+    _print("SEMAPHORE EXAMPLE")
+    _print(_RULE_BELOW)
     
-    # Limit concurrent access to 3
-    semaphore = threading.Semaphore(3)
+    # Limit concurrent access to 3. Bounded: a release() without a
+    # matching acquire() raises instead of silently raising the limit
+    semaphore = threading.BoundedSemaphore(3)
     
     def limited_resource(name: str) -> None:
-        print(f"  {name} waiting for resource...")
+        _print(f"  {name} waiting for resource...")
         with semaphore:
-            print(f"  {name} acquired resource")
+            _print(f"  {name} acquired resource")
             time.sleep(1)
-            print(f"  {name} releasing resource")
-    
-    threads = [
-        threading.Thread(target=limited_resource, args=(f"Thread-{i}",))
-        for i in range(6)
-    ]
+            _print(f"  {name} releasing resource")
     
-    for t in threads:
-        t.start()
-    for t in threads:
-        t.join()
+    _run_on_pool(*[(limited_resource, f"Thread-{i}") for i in range(6)])
 
 
 # =============================================================================
@@ -197,10 +305,15 @@ def condition_variable_example():
         condition = true;
         pthread_cond_signal(&cond);
         pthread_mutex_unlock(&mutex);
+    
+    A condition variable is the general tool: it guards arbitrary shared
+    state and predicates. For a one-shot "it happened" signal like the
+    one below, threading.Event (see event_example) does the same with
+    no lock to manage in the caller.
     """
-    print("\n" + "="*60)
-    print("CONDITION VARIABLE EXAMPLE")
-    print("="*60 + "\n")
+    _print(_RULE_ABOVE)
+    _print("CONDITION VARIABLE EXAMPLE")
+    _print(_RULE_BELOW)
     
     condition = threading.Condition()
     data_ready = False
@@ -208,23 +321,25 @@ def condition_variable_example():
     
     def producer():
         nonlocal data_ready, data
-        print("  Producer: preparing data...")
+        _print("  Producer: preparing data...")
         time.sleep(2)
         
+        message = "Hello from producer!"
         with condition:
-            data = "Hello from producer!"
+            data = message
             data_ready = True
-            print("  Producer: data ready, notifying consumer")
             condition.notify()
+        _print("  Producer: data ready, notifying consumer")
     
     def consumer():
         nonlocal data_ready, data
-        print("  Consumer: waiting for data...")
+        _print("  Consumer: waiting for data...")
         
         with condition:
             while not data_ready:
                 condition.wait()
-            print(f"  Consumer: received '{data}'")
+            received = data
+        _print(f"  Consumer: received '{received}'")
     
     consumer_thread = threading.Thread(target=consumer)
     producer_thread = threading.Thread(target=producer)
@@ -241,26 +356,48 @@ def condition_variable_example():
 # PRODUCER-CONSUMER WITH QUEUE
 # =============================================================================
 
-def producer_consumer_example():
+def producer_consumer_example(bounded: bool = False, preload: bool = False):
     """
-    Bounded buffer producer-consumer using thread-safe Queue.
+    Producer-consumer using a thread-safe queue.
     
-    Python's queue.Queue is thread-safe and handles all
+    Python's queues are thread-safe and handle all
     synchronisation internally, unlike C where we must
     implement it manually with mutex and condition variables.
+    
+    queue.SimpleQueue is a C implementation with one lock and no
+    task_done()/join() bookkeeping, which this demo does not use.
+    It is unbounded, so pass bounded=True for the bounded buffer
+    (queue.Queue(maxsize=5)) whose put() blocks while it is full -
+    the version to use when the producer must be throttled.
+    
+    By default producer and consumer stream concurrently. When all the
+    input is available up front, preload=True fills the queue before the
+    consumer starts, so the consumer never blocks on an empty queue and
+    is never woken per item while it warms up.
+    
+    Args:
+        bounded: Use a bounded queue.Queue instead of a SimpleQueue
+        preload: Enqueue every item before starting the consumer
+    
+    Raises:
+        ValueError: If both bounded and preload are set (the producer
+                    would block forever on the full queue)
     """
-    print("\n" + "="*60)
-    print("PRODUCER-CONSUMER PATTERN")
-    print("="*60 + "\n")
+    if bounded and preload:
+        raise ValueError("a bounded queue cannot be preloaded")
     
-    buffer: queue.Queue = queue.Queue(maxsize=5)
+    _print(_RULE_ABOVE)
+    _print("PRODUCER-CONSUMER PATTERN")
+    _print(_RULE_BELOW)
+    
+    buffer = queue.Queue(maxsize=5) if bounded else queue.SimpleQueue()
     num_items = 10
     
     def producer(name: str):
         for i in range(num_items):
             item = f"Item-{i}"
-            buffer.put(item)  # Blocks if full
-            print(f"  {name} produced: {item}")
+            buffer.put(item)  # Blocks if full (bounded only)
+            _print(f"  {name} produced: {item}")
             time.sleep(random.uniform(0.1, 0.3))
         buffer.put(None)  # Poison pill
     
@@ -268,14 +405,21 @@ def producer_consumer_example():
         while True:
             item = buffer.get()  # Blocks if empty
             if item is None:
-                print(f"  {name} received poison pill, exiting")
+                _print(f"  {name} received poison pill, exiting")
                 break
-            print(f"  {name} consumed: {item}")
+            _print(f"  {name} consumed: {item}")
             time.sleep(random.uniform(0.2, 0.4))
     
-    producer_thread = threading.Thread(target=producer, args=("Producer",))
     consumer_thread = threading.Thread(target=consumer, args=("Consumer",))
     
+    if preload:
+        producer("Producer")    # runs to completion on this thread
+        consumer_thread.start()
+        consumer_thread.join()
+        return
+    
+    producer_thread = threading.Thread(target=producer, args=("Producer",))
+    
     producer_thread.start()
     consumer_thread.start()
     
@@ -287,30 +431,70 @@ def producer_consumer_example():
 # THREAD POOL EXECUTOR
 # =============================================================================
 
-def thread_pool_example():
+def compute_factorial(n: int) -> int:
+    """Factorial of n, plus a sleep to simulate work."""
+    result = math.factorial(n)  # C loop (binary splitting), not bytecode
+    time.sleep(0.5)  # Simulate work
+    return result
+
+
+def _run_parallel(fn: Callable[[Any], Any], iterable: Iterable[Any],
+                  procs: int = None) -> List[Any]:
+    """
+    Map a CPU-bound function over a process pool, bypassing the GIL.
+    
+    Threads only overlap while they wait (I/O, sleep); pure-Python
+    computation in threads runs one bytecode at a time. fn must be a
+    module-level function so that it can be pickled.
+    
+    The pool uses spawn rather than fork: fork() in a multi-threaded
+    process copies only the calling thread, so a lock held by any other
+    thread at that moment stays locked forever in the child.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(procs or os.cpu_count()) as pool:
+        return pool.map(fn, iterable)
+
+
+def thread_pool_example(use_processes: bool = False):
     """
     High-level thread pool with futures.
     
     This is similar to our C homework implementation but with
     a much simpler API provided by concurrent.futures.
-    """
-    print("\n" + "="*60)
-    print("THREAD POOL EXECUTOR")
-    print("="*60 + "\n")
     
-    def compute_factorial(n: int) -> int:
-        result = 1
-        for i in range(2, n + 1):
-            result *= i
-        time.sleep(0.5)  # Simulate work
-        return result
+    Args:
+        use_processes: Compute the factorials in a process pool via
+                       _run_parallel() instead of threads
+    """
+    _print(_RULE_ABOVE)
+    _print("THREAD POOL EXECUTOR")
+    _print(_RULE_BELOW)
     
     numbers = [5, 10, 15, 20, 25]
     
-    with ThreadPoolExecutor(max_workers=4) as executor:
+    if use_processes:
+        for n, result in zip(numbers, _run_parallel(compute_factorial, numbers)):
+            _print(f"  factorial({n}) = {result}")
+        return
+    
+    num_workers = 4
+    # Backpressure: the executor's work queue is unbounded, so a large
+    # input would be queued in full up front. At most 2 * num_workers
+    # tasks may be outstanding; submit() blocks until one finishes.
+    # Larger bounds keep the workers busier, smaller ones use less memory
+    outstanding = threading.BoundedSemaphore(2 * num_workers)
+    
+    def submit(executor, fn, *args):
+        outstanding.acquire()
+        future = executor.submit(fn, *args)
+        future.add_done_callback(lambda _: outstanding.release())
+        return future
+    
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
         # Submit all tasks
         future_to_num = {
-            executor.submit(compute_factorial, n): n 
+            submit(executor, compute_factorial, n): n
             for n in numbers
         }
         
@@ -319,9 +503,69 @@ def thread_pool_example():
             n = future_to_num[future]
             try:
                 result = future.result()
-                print(f"  factorial({n}) = {result}")
+                _print(f"  factorial({n}) = {result}")
             except Exception as exc:
-                print(f"  factorial({n}) raised {exc}")
+                _print(f"  factorial({n}) raised {exc}")
+
+
+# =============================================================================
+# RELEASING THE GIL
+# =============================================================================
+
+@njit(nogil=True, cache=True)
+def _collatz_steps_kernel(lo: int, hi: int) -> int:
+    """
+    Total Collatz steps to reach 1 over all starting values in [lo, hi).
+    
+    Data-dependent loops with no closed form, so the compiler cannot
+    shortcut the work. Compiled with nogil=True to release the GIL.
+    """
+    total = 0
+    for start in range(max(lo, 1), hi):
+        x = start
+        while x != 1:
+            x = x // 2 if x % 2 == 0 else 3 * x + 1
+            total += 1
+    return total
+
+
+def gil_release_example():
+    """
+    CPU-bound work in threads.
+    
+    Pure Python computation in threads runs one bytecode at a time under
+    the GIL, so splitting it across threads does not make it faster.
+    Compiled code that releases the GIL (Numba's nogil=True, or a C
+    extension dropping it with Py_BEGIN_ALLOW_THREADS) runs in parallel
+    like a C pthread would.
+    """
+    _print(_RULE_ABOVE)
+    _print("RELEASING THE GIL")
+    _print(_RULE_BELOW)
+    
+    n = 50_000
+    num_threads = 4
+    step = n // num_threads
+    bounds = [(i * step, n if i == num_threads - 1 else (i + 1) * step)
+              for i in range(num_threads)]
+    
+    _collatz_steps_kernel(0, 2)    # compile outside the timings
+    
+    start = time.perf_counter()
+    total = _collatz_steps_kernel(0, n)
+    single = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    futures = [_POOL.submit(_collatz_steps_kernel, lo, hi) for lo, hi in bounds]
+    threaded_total = sum(f.result() for f in futures)
+    threaded = time.perf_counter() - start
+    
+    _print(f"  Collatz steps for 1..{n - 1}: {total} (threads: {threaded_total})")
+    _print(f"  1 thread:  {single * 1000:.2f} ms")
+    _print(f"  {num_threads} threads: {threaded * 1000:.2f} ms")
+    if not HAVE_NUMBA:
+        _print("  (Numba not installed: the kernel runs as Python, holds the")
+        _print("   GIL, and the threads cannot overlap)")
 
 
 # =============================================================================
@@ -335,9 +579,9 @@ def readers_writers_example():
     Python provides RLock (reentrant lock) but not a built-in
     readers-writers lock. We can implement one or use threading.RLock.
     """
-    print("\n" + "="*60)
-    print("READERS-WRITERS PATTERN")
-    print("="*60 + "\n")
+    _print(_RULE_ABOVE)
+    _print("READERS-WRITERS PATTERN")
+    _print(_RULE_BELOW)
     
     class ReadersWritersLock:
         """Simple readers-writers lock implementation."""
@@ -370,13 +614,13 @@ def readers_writers_example():
     
     def reader(name: str):
         rw_lock.acquire_read()
-        print(f"  {name} reading: {data['value']}")
+        _print(f"  {name} reading: {data['value']}")
         time.sleep(0.2)
         rw_lock.release_read()
     
     def writer(name: str, value: int):
         rw_lock.acquire_write()
-        print(f"  {name} writing: {value}")
+        _print(f"  {name} writing: {value}")
         data["value"] = value
         time.sleep(0.3)
         rw_lock.release_write()
@@ -409,36 +653,36 @@ def barrier_example():
         pthread_barrier_init(&barrier, NULL, NUM_THREADS);
         pthread_barrier_wait(&barrier);
     """
-    print("\n" + "="*60)
-    print("BARRIER SYNCHRONISATION")
-    print("="*60 + "\n")
+    _print(_RULE_ABOVE)
+    _print("BARRIER SYNCHRONISATION")
+    _print(_RULE_BELOW)
     
     num_threads = 4
-    barrier = threading.Barrier(num_threads)
+    
+    def on_all_arrived():
+        # Run exactly once per cycle, by the last thread to arrive, before
+        # any thread is released - no extra lock or "am I last?" check.
+        # C equivalent: the one thread that gets
+        # PTHREAD_BARRIER_SERIAL_THREAD from pthread_barrier_wait()
+        _print("  -- all threads arrived, releasing barrier --")
+    
+    barrier = threading.Barrier(num_threads, action=on_all_arrived)
     
     def worker(name: str, work_time: float):
-        print(f"  {name} doing phase 1 work...")
+        _print(f"  {name} doing phase 1 work...")
         time.sleep(work_time)
-        print(f"  {name} waiting at barrier")
+        _print(f"  {name} waiting at barrier")
         
         barrier.wait()  # Wait for all threads
         
-        print(f"  {name} continuing to phase 2")
+        _print(f"  {name} continuing to phase 2")
         time.sleep(0.2)
-        print(f"  {name} completed")
+        _print(f"  {name} completed")
     
-    threads = [
-        threading.Thread(
-            target=worker,
-            args=(f"Thread-{i}", random.uniform(0.5, 2.0))
-        )
+    _run_on_pool(*[
+        (worker, f"Thread-{i}", random.uniform(0.5, 2.0))
         for i in range(num_threads)
-    ]
-    
-    for t in threads:
-        t.start()
-    for t in threads:
-        t.join()
+    ])
 
 
 # =============================================================================
@@ -452,34 +696,29 @@ def event_example():
     Events are simpler than condition variables when you just
     need to signal that something happened.
     """
-    print("\n" + "="*60)
-    print("EVENT SIGNALLING")
-    print("="*60 + "\n")
+    _print(_RULE_ABOVE)
+    _print("EVENT SIGNALLING")
+    _print(_RULE_BELOW)
     
     startup_complete = threading.Event()
     
     def server():
-        print("  Server: initialising...")
+        _print("  Server: initialising...")
         time.sleep(2)
-        print("  Server: ready!")
+        _print("  Server: ready!")
         startup_complete.set()
-        print("  Server: running...")
+        _print("  Server: running...")
     
     def client(name: str):
-        print(f"  {name}: waiting for server...")
+        _print(f"  {name}: waiting for server...")
         startup_complete.wait()
-        print(f"  {name}: server is ready, proceeding")
-    
-    threads = [
-        threading.Thread(target=server),
-        threading.Thread(target=client, args=("Client-1",)),
-        threading.Thread(target=client, args=("Client-2",)),
-    ]
+        _print(f"  {name}: server is ready, proceeding")
     
-    for t in threads:
-        t.start()
-    for t in threads:
-        t.join()
+    _run_on_pool(
+        (server,),
+        (client, "Client-1"),
+        (client, "Client-2"),
+    )
 
 
 # =============================================================================
@@ -496,9 +735,9 @@ def thread_local_example():
         pthread_setspecific(key, value);
         pthread_getspecific(key);
     """
-    print("\n" + "="*60)
-    print("THREAD-LOCAL STORAGE")
-    print("="*60 + "\n")
+    _print(_RULE_ABOVE)
+    _print("THREAD-LOCAL STORAGE")
+    _print(_RULE_BELOW)
     
     local_data = threading.local()
     
@@ -509,30 +748,19 @@ def thread_local_example():
         
         time.sleep(random.uniform(0.1, 0.3))
         
-        print(f"  Thread {local_data.name} has value {local_data.value}")
+        _print(f"  Thread {local_data.name} has value {local_data.value}")
     
-    threads = [
-        threading.Thread(target=worker, args=(f"Thread-{i}", i * 100))
-        for i in range(4)
-    ]
-    
-    for t in threads:
-        t.start()
-    for t in threads:
-        t.join()
+    _run_on_pool(*[(worker, f"Thread-{i}", i * 100) for i in range(4)])
 
 
 # =============================================================================
 # COMPARISON TABLE
 # =============================================================================
 
-def print_comparison_table():
-    """Print comparison between C pthreads and Python threading."""
-    print("\n" + "="*60)
-    print("C PTHREADS vs PYTHON THREADING COMPARISON")
-    print("="*60 + "\n")
-    
-    table = """
+_COMPARISON_TABLE = (
+    _RULE_ABOVE + "\n"
+    "C PTHREADS vs PYTHON THREADING COMPARISON\n"
+    + _RULE_BELOW + "\n" + """
 ┌─────────────────────────┬─────────────────────────┬─────────────────────────┐
 │ Concept                 │ C (pthreads)            │ Python (threading)      │
 ├─────────────────────────┼─────────────────────────┼─────────────────────────┤
@@ -549,37 +777,99 @@ def print_comparison_table():
 │ Thread-safe queue       │ Manual implementation   │ queue.Queue()           │
 │ Thread pool             │ Manual implementation   │ ThreadPoolExecutor      │
 └─────────────────────────┴─────────────────────────┴─────────────────────────┘
+
 """
-    print(table)
+)
+
+
+def print_comparison_table():
+    """Print comparison between C pthreads and Python threading."""
+    # Built once at import; one queued write instead of a print() per line
+    _write(_COMPARISON_TABLE)
 
 
 # =============================================================================
 # MAIN
 # =============================================================================
 
-def main():
-    """Run all demonstrations."""
-    print("\n" + "="*60)
-    print("PYTHON THREADING COMPARISON")
-    print("Week 20: Parallel and Concurrent Programming")
-    print("="*60)
+_MAIN_HEADER = (
+    _RULE_ABOVE + "\n"
+    "PYTHON THREADING COMPARISON\n"
+    "Week 20: Parallel and Concurrent Programming\n"
+    + _RULE_BELOW
+)
+_MAIN_FOOTER = _RULE_ABOVE + "\nALL DEMONSTRATIONS COMPLETE\n" + _RULE_BELOW + "\n"
+
+
+DEMOS: List[Callable[[], None]] = [
+    basic_thread_example,
+    mutex_example,
+    semaphore_example,
+    condition_variable_example,
+    producer_consumer_example,
+    thread_pool_example,
+    gil_release_example,
+    readers_writers_example,
+    barrier_example,
+    event_example,
+    thread_local_example,
+]
+
+
+def main(parallel: bool = False, mode: str = "threads",
+         pin: Optional[int] = None, quiet: bool = False):
+    """
+    Run all demonstrations.
+    
+    Args:
+        parallel: Run the demos concurrently, one thread each. They spend
+                  nearly all their time in sleep() (which releases the
+                  GIL), so the total wall time drops from the sum of the
+                  demos to roughly the longest one - at the cost of their
+                  output being interleaved.
+        mode: "threads", or "processes" to run the CPU-bound work of the
+              thread pool demo in a process pool instead. The other
+              demos illustrate threading primitives and always use
+              threads.
+        pin: Restrict the whole process to this CPU. GIL-bound threads
+             never run Python code at the same time anyway, and on one
+             core they stop handing the GIL and its cache lines between
+             cores. Only for the GIL-bound demos: the nogil demo and
+             the processes mode (whose children inherit the affinity)
+             then lose all their parallelism. Ignored where
+             sched_setaffinity is unavailable (macOS, Windows).
+        quiet: Discard all output, so that timing runs measure the demos
+               rather than string formatting and stdout.
+    """
+    global _quiet
+    _quiet = quiet
+    
+    if pin is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {pin})
+    
+    _write(_MAIN_HEADER)
+    
+    demos = list(DEMOS)
+    if mode == "processes":
+        demos[demos.index(thread_pool_example)] = partial(
+            thread_pool_example, use_processes=True)
     
     print_comparison_table()
-    basic_thread_example()
-    mutex_example()
-    semaphore_example()
-    condition_variable_example()
-    producer_consumer_example()
-    thread_pool_example()
-    readers_writers_example()
-    barrier_example()
-    event_example()
-    thread_local_example()
-    
-    print("\n" + "="*60)
-    print("ALL DEMONSTRATIONS COMPLETE")
-    print("="*60 + "\n")
+    if parallel:
+        with ThreadPoolExecutor(max_workers=len(demos)) as executor:
+            for future in [executor.submit(demo) for demo in demos]:
+                future.result()
+    else:
+        for demo in demos:
+            demo()
+    
+    _write(_MAIN_FOOTER)
+    _flush_log()
 
 
 if __name__ == "__main__":
-    main()
+    args = sys.argv[1:]
+    main(parallel="--parallel" in args,
+         mode="processes" if "--mode=processes" in args else "threads",
+         pin=int(args[args.index("--pin") + 1]) if "--pin" in args else None,
+         quiet="--quiet" in args)